@@ -1,29 +1,279 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+import atexit
+import hmac
+import json
 import pickle
 import os
 import sys
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from ml_model.predictor import JobPredictor
+from ml_model.metrics import metrics
+from ml_model.online import OnlineUpdater, rollback
+from ml_model.versions import activate_version
+from backend.near_duplicates import NearDuplicateIndex
+from backend.prediction_cache import PredictionCache
+from backend.model_manager import ModelManager, ModelReloadError
 
 # Initialize Flask app
 app = Flask(__name__)
 
+# Origins allowed to call the API from a browser
+CORS_ORIGINS = ["http://localhost:8000", "http://localhost:5000", "http://127.0.0.1:8000", "http://127.0.0.1:5000"]
+
 # Configure CORS with proper settings
 CORS(app, resources={
     r"/api/*": {
-        "origins": ["http://localhost:8000", "http://localhost:5000", "http://127.0.0.1:8000", "http://127.0.0.1:5000"],
+        "origins": CORS_ORIGINS,
         "methods": ["GET", "POST", "OPTIONS"],
         "allow_headers": ["Content-Type"],
         "supports_credentials": True
     }
 })
 
-# Initialize predictor
-predictor = JobPredictor()
+# Maximum number of postings accepted by /api/predict/batch
+MAX_BATCH_SIZE = 1000
+
+# /api/predict/stream scores this many postings at a time, or fewer once
+# their text reaches STREAM_CHUNK_BYTES, so memory stays bounded however
+# long the upload is
+STREAM_CHUNK_SIZE = int(os.environ.get('JOBVISION_STREAM_CHUNK_SIZE', '256'))
+STREAM_CHUNK_BYTES = int(os.environ.get('JOBVISION_STREAM_CHUNK_BYTES', str(4 * 1024 * 1024)))
+# Longest line accepted by /api/predict/stream, in bytes
+MAX_STREAM_LINE_BYTES = 1024 * 1024
+
+# Most terms an explanation may list per direction (the "top_k" of explain requests)
+MAX_EXPLAIN_TERMS = 50
+DEFAULT_EXPLAIN_TERMS = 5
+
+# Cache of results for repeated postings, dropped whenever the model is reloaded
+prediction_cache = PredictionCache(max_size=10000, ttl=3600)
+
+# Reposts whose shingles overlap a scored posting at least this much (estimated
+# Jaccard similarity) get its verdict without running the model; 0 disables
+NEAR_DUP_THRESHOLD = float(os.environ.get('JOBVISION_NEAR_DUP_THRESHOLD', '0.8'))
+NEAR_DUP_MAX_ENTRIES = int(os.environ.get('JOBVISION_NEAR_DUP_MAX_ENTRIES', '10000'))
+# The index is saved here every JOBVISION_NEAR_DUP_SAVE_SECONDS and on exit
+NEAR_DUP_PATH = os.environ.get(
+    'JOBVISION_NEAR_DUP_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'data', 'near_duplicates.npz'))
+NEAR_DUP_SAVE_SECONDS = float(os.environ.get('JOBVISION_NEAR_DUP_SAVE_SECONDS', '60'))
+
+near_duplicate_index = None
+if NEAR_DUP_THRESHOLD > 0:
+    near_duplicate_index = NearDuplicateIndex(threshold=NEAR_DUP_THRESHOLD,
+                                              max_entries=NEAR_DUP_MAX_ENTRIES)
+    try:
+        near_duplicate_index.load(NEAR_DUP_PATH)
+    except Exception as e:
+        # A damaged or foreign file must not keep the API from starting
+        print(f"Could not load near-duplicate index {NEAR_DUP_PATH}, starting empty: {e}")
+        metrics.inc('errors_total', source='near_duplicate_load')
+        near_duplicate_index.clear()
+    near_duplicate_index.start_autosave(NEAR_DUP_PATH, NEAR_DUP_SAVE_SECONDS)
+
+def save_near_duplicates():
+    """Persist the near-duplicate index if it changed since the last save."""
+    if near_duplicate_index is not None and near_duplicate_index.dirty:
+        near_duplicate_index.save(NEAR_DUP_PATH)
+
+atexit.register(save_near_duplicates)
+
+# Concurrent /api/predict calls arriving within this many milliseconds of each
+# other are scored in one batch; 0 scores every request on its own
+BATCH_WINDOW_MS = float(os.environ.get('JOBVISION_BATCH_WINDOW_MS', '5'))
+BATCH_MAX_SIZE = int(os.environ.get('JOBVISION_BATCH_MAX_SIZE', '32'))
+# Longest a request waits for its micro-batch before it gets a 503
+BATCH_TIMEOUT_SECONDS = float(os.environ.get('JOBVISION_BATCH_TIMEOUT_SECONDS', '30'))
+
+# Models root: a flat model directory or versioned one (see ml_model.versions)
+MODELS_DIR = os.environ.get(
+    'JOBVISION_MODELS_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models'))
+# Seconds between checks for a newly published model; 0 disables the watcher
+MODEL_POLL_SECONDS = float(os.environ.get('JOBVISION_MODEL_POLL_SECONDS', '10'))
+# Admin routes (reload, rollback) and POST /api/feedback require this value in
+# the X-Admin-Token header; without it they only answer callers on this host
+ADMIN_TOKEN = os.environ.get('JOBVISION_ADMIN_TOKEN')
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+ADMIN_REFUSED = ('Invalid admin token' if ADMIN_TOKEN else
+                 'Set JOBVISION_ADMIN_TOKEN to use this endpoint from another host')
+
+# Moderator labels from POST /api/feedback (see ml_model.online)
+FEEDBACK_PATH = os.environ.get(
+    'JOBVISION_FEEDBACK_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'data', 'feedback', 'feedback.jsonl'))
+# Training data whose holdout rows every online update is checked against
+FEEDBACK_REFERENCE_CSV = os.environ.get(
+    'JOBVISION_FEEDBACK_REFERENCE_CSV',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 'data', 'fake_job_postings.csv'))
+# Seconds between online updates from new feedback; 0 disables the updater
+FEEDBACK_UPDATE_SECONDS = float(os.environ.get('JOBVISION_FEEDBACK_UPDATE_SECONDS', '300'))
+FEEDBACK_MIN_RECORDS = int(os.environ.get('JOBVISION_FEEDBACK_MIN_RECORDS', '10'))
+
+# Initialize the active model; reloads swap it without a restart
+model_manager = ModelManager(MODELS_DIR, batch_window_ms=BATCH_WINDOW_MS,
+                             batch_max_size=BATCH_MAX_SIZE)
+model_manager.start_watcher(MODEL_POLL_SECONDS)
+
+# Published updates are swapped in here at once; other workers see them through the watcher
+feedback_updater = OnlineUpdater(MODELS_DIR, FEEDBACK_PATH, FEEDBACK_REFERENCE_CSV,
+                                 min_records=FEEDBACK_MIN_RECORDS,
+                                 on_publish=lambda version: model_manager.reload())
+feedback_updater.start(FEEDBACK_UPDATE_SECONDS)
+
+def admin_authorized():
+    """
+    True if the request may use admin routes: it carries the admin token,
+    or no token is configured and it comes from the loopback interface.
+    """
+    if ADMIN_TOKEN:
+        return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), ADMIN_TOKEN)
+    return request.remote_addr in LOOPBACK_ADDRESSES
+
+@app.before_request
+def start_request_timer():
+    g.request_start = metrics.clock()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count API requests and time them per endpoint."""
+    start = g.get('request_start')
+    if start and request.path.startswith('/api/') and request.method != 'OPTIONS':
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('request_seconds', metrics.clock() - start, endpoint=endpoint)
+        metrics.inc('requests_total', endpoint=endpoint, status=response.status_code)
+    return response
+
+def explain_terms(data):
+    """
+    Return the number of terms to explain per direction for a request body,
+    0 when no explanation was asked for.
+    
+    Raises:
+        ValueError: if "top_k" is not an integer from 1 to MAX_EXPLAIN_TERMS
+    """
+    if data.get('explain') is not True:
+        return 0
+    
+    top_k = data.get('top_k', DEFAULT_EXPLAIN_TERMS)
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or not 1 <= top_k <= MAX_EXPLAIN_TERMS:
+        raise ValueError(f'top_k must be an integer from 1 to {MAX_EXPLAIN_TERMS}')
+    return top_k
+
+def format_explanation(explanation):
+    """Explanation of JobPredictor.explain_batch for a response, with a reason when missing."""
+    if explanation is None:
+        return {'available': False, 'reason': 'posting was not scored by the ML model'}
+    return {'available': True, **explanation}
+
+def find_near_duplicate(active, text):
+    """
+    Look up a posting in the near-duplicate index.
+    
+    Only "fake" verdicts are reused, and only if the posting has no indicator
+    that the matched one lacks, so a copy of a legitimate posting with a scam
+    phrase added is scored by the model instead of inheriting its verdict.
+    
+    Returns:
+        tuple: (signature, near_duplicate, result); the signature is None if
+            the index is disabled or the text has no words, near_duplicate
+            and result are None unless the match is reused, and result has
+            the indicators found in this posting
+    """
+    if near_duplicate_index is None:
+        return None, None, None
+    signature = near_duplicate_index.signature(active.predictor.clean_text(text))
+    match = signature is not None and near_duplicate_index.lookup(signature, active.version)
+    if not match:
+        return signature, None, None
+    
+    match_id, similarity, (prediction, confidence, matched) = match
+    indicators = active.predictor.extract_indicators(text)
+    known = {(ind['type'], ind['text']) for ind in matched}
+    if prediction != 'fake' or any((ind['type'], ind['text']) not in known
+                                   for ind in indicators):
+        near_duplicate_index.reject()
+        return signature, None, None
+    return (signature, {'match_id': match_id, 'similarity': similarity},
+            (prediction, confidence, indicators))
+
+def index_near_duplicate(active, signature, result):
+    """Index a posting scored by the model, if it is one find_near_duplicate may reuse."""
+    if signature is not None and result[0] == 'fake':
+        prediction, confidence, indicators = result
+        near_duplicate_index.add(signature, active.version,
+                                 (prediction, confidence, indicators or []))
+
+def predict_posting(job_description, explain_top_k=0):
+    """
+    Score one non-empty, stripped posting through the prediction cache.
+    
+    With explain_top_k, the posting is always scored by the model, which
+    returns its top contributing terms along with the prediction.
+    
+    Returns:
+        tuple: (response body dict, HTTP status code) for /api/predict
+    """
+    # The whole request uses one model, even if a reload swaps it meanwhile
+    active = model_manager.active
+    
+    # Get prediction, reusing the result for a repeated posting
+    cache_key = PredictionCache.make_key(job_description)
+    cached = None if explain_top_k else prediction_cache.get(cache_key, active.version)
+    
+    # Reposts of a scam with small edits get the result of the posting they copy
+    signature = None
+    near_duplicate = None
+    explanation = None
+    if cached is None and not explain_top_k:
+        signature, near_duplicate, result = find_near_duplicate(active, job_description)
+    
+    if cached is not None:
+        prediction, confidence, indicators = cached
+    elif near_duplicate is not None:
+        prediction, confidence, indicators = result
+    elif explain_top_k:
+        (prediction, confidence, indicators), explanation = \
+            active.predictor.explain_batch([job_description], explain_top_k)[0]
+    elif active.batcher is not None:
+        try:
+            prediction, confidence, indicators = active.batcher.predict(
+                job_description, timeout=BATCH_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            metrics.inc('errors_total', source='micro_batch_timeout')
+            return {'error': 'Prediction timed out'}, 503
+    else:
+        prediction, confidence, indicators = active.predictor.predict(job_description)
+    
+    # Ensure we have valid output
+    if prediction is None or confidence is None:
+        return {'error': 'Failed to generate prediction'}, 500
+    
+    if cached is None:
+        prediction_cache.put(cache_key, active.version,
+                             (prediction, confidence, indicators or []))
+    if near_duplicate is None:
+        index_near_duplicate(active, signature, (prediction, confidence, indicators))
+    
+    body = {
+        'prediction': prediction,
+        'confidence': float(confidence),
+        'indicators': indicators if indicators else [],
+        'cached': cached is not None,
+        'near_duplicate': near_duplicate,
+        'model_version': active.version
+    }
+    if explain_top_k:
+        body['explanation'] = format_explanation(explanation)
+    return body, 200
 
 @app.route('/api/predict', methods=['POST', 'OPTIONS'])
 def predict():
@@ -32,7 +282,9 @@ def predict():
     
     Request JSON:
     {
-        "job_description": "string"
+        "job_description": "string",
+        "explain": true to add the terms the model weighted most (optional),
+        "top_k": terms to list per direction, 1 to 50 (optional, default 5)
     }
     
     Response JSON:
@@ -44,8 +296,22 @@ def predict():
                 "type": "fake" or "real",
                 "text": "indicator text"
             }
-        ]
+        ],
+        "cached": true if the result came from the prediction cache,
+        "near_duplicate": null, or {"match_id": "...", "similarity": 0.0 to 1.0}
+            when the verdict is that of a previously scored near-identical posting
+            flagged as fake (see find_near_duplicate),
+        "model_version": "version that scored the posting",
+        "explanation": only with "explain": {
+            "available": false when the rule-based fallback scored the posting,
+            "positive": [{"term": "...", "contribution": log-odds towards fake}, ...],
+            "negative": [{"term": "...", "contribution": log-odds towards real}, ...],
+            "intercept": log-odds of a posting without known terms
+        }
     }
+    
+    Explained requests bypass the prediction cache and the near-duplicate
+    index, since the terms come from scoring the posting itself.
     """
     # Handle CORS preflight requests
     if request.method == 'OPTIONS':
@@ -55,37 +321,460 @@ def predict():
         data = request.get_json()
         if not data:
             return jsonify({'error': 'Request body cannot be empty'}), 400
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
             
         job_description = data.get('job_description', '').strip()
 
         if not job_description:
             return jsonify({'error': 'Job description cannot be empty'}), 400
 
-        # Get prediction
-        prediction, confidence, indicators = predictor.predict(job_description)
-        
-        # Ensure we have valid output
-        if prediction is None or confidence is None:
-            return jsonify({'error': 'Failed to generate prediction'}), 500
+        try:
+            explain_top_k = explain_terms(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
 
-        return jsonify({
-            'prediction': prediction,
-            'confidence': float(confidence),
-            'indicators': indicators if indicators else []
-        }), 200
+        body, status = predict_posting(job_description, explain_top_k)
+        return jsonify(body), status
 
     except Exception as e:
         print(f"Error in predict endpoint: {str(e)}")
+        metrics.inc('errors_total', source='api_predict')
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
+
+@app.route('/api/predict/batch', methods=['POST', 'OPTIONS'])
+def predict_batch():
+    """
+    Predict a batch of job postings in one call.
+    
+    Request JSON:
+    {
+        "job_descriptions": ["string", ...],
+        "explain": true to explain each result as in /api/predict (optional),
+        "top_k": terms to list per direction (optional, default 5)
+    }
+    
+    Response JSON:
+    {
+        "results": [
+            {
+                "prediction": "fake" or "real",
+                "confidence": 0.0 to 1.0,
+                "indicators": [...],
+                "cached": true or false,
+                "near_duplicate": null or {...} as in /api/predict,
+                "explanation": {...} (only with "explain")
+            }
+        ],
+        "model_version": "version that scored the postings"
+    }
+    
+    Results are returned in input order. Empty or non-string items get the
+    same neutral fallback as JobPredictor.predict.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Request body cannot be empty'}), 400
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        job_descriptions = data.get('job_descriptions')
+        
+        if not isinstance(job_descriptions, list) or not job_descriptions:
+            return jsonify({'error': 'job_descriptions must be a non-empty list'}), 400
+        
+        if len(job_descriptions) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Batch size cannot exceed {MAX_BATCH_SIZE}'}), 400
+        
+        try:
+            explain_top_k = explain_terms(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        job_descriptions = [text.strip() if isinstance(text, str) else text
+                            for text in job_descriptions]
+        
+        # Look up repeated postings, then score the rest in one batch
+        active = model_manager.active
+        generation = active.version
+        results = [None] * len(job_descriptions)
+        cached = [False] * len(job_descriptions)
+        near_duplicates = [None] * len(job_descriptions)
+        cache_keys = {}
+        signatures = {}
+        
+        explanations = None
+        
+        for i, text in enumerate(job_descriptions):
+            if text and isinstance(text, str):
+                cache_keys[i] = PredictionCache.make_key(text)
+                if not explain_top_k:
+                    results[i] = prediction_cache.get(cache_keys[i], generation)
+                    cached[i] = results[i] is not None
+                    if results[i] is None:
+                        signatures[i], near_duplicates[i], results[i] = \
+                            find_near_duplicate(active, text)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if explain_top_k:
+            # Every posting is scored, the terms come with the predictions
+            explained = active.predictor.explain_batch(job_descriptions, explain_top_k)
+            scored = [result for result, _ in explained]
+            explanations = [format_explanation(explanation) for _, explanation in explained]
+        elif missing:
+            scored = active.predictor.predict_batch([job_descriptions[i] for i in missing])
+        else:
+            scored = []
+        for i, result in zip(missing, scored):
+            results[i] = result
+            if i in cache_keys:
+                prediction_cache.put(cache_keys[i], generation, result)
+            index_near_duplicate(active, signatures.get(i), result)
+        
+        response_results = [
+            {
+                'prediction': prediction,
+                'confidence': float(confidence),
+                'indicators': indicators if indicators else [],
+                'cached': from_cache,
+                'near_duplicate': near_duplicate
+            }
+            for (prediction, confidence, indicators), from_cache, near_duplicate
+            in zip(results, cached, near_duplicates)
+        ]
+        if explanations is not None:
+            for item, explanation in zip(response_results, explanations):
+                item['explanation'] = explanation
+        
+        return jsonify({
+            'results': response_results,
+            'model_version': active.version
+        }), 200
+    
+    except Exception as e:
+        print(f"Error in batch predict endpoint: {str(e)}")
+        metrics.inc('errors_total', source='api_predict_batch')
         import traceback
         traceback.print_exc()
         return jsonify({'error': 'Internal server error', 'details': str(e)}), 500
 
+def read_ndjson_postings(stream, max_line_bytes=MAX_STREAM_LINE_BYTES):
+    """
+    Parse postings from an NDJSON body, reading one line at a time.
+    
+    Each line is a JSON object with "job_description" and an optional "id"
+    echoed back with its result, or just the posting as a JSON string.
+    
+    Yields:
+        tuple: (line number, id, stripped posting, error message) for every
+            non-blank line; the posting is None when the line has an error
+    """
+    line_number = 0
+    while True:
+        line = stream.readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+        
+        if len(line) > max_line_bytes and not line.endswith(b'\n'):
+            # Skip the rest of the line without holding it in memory
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_line_bytes)
+            yield line_number, None, None, f'Line exceeds {max_line_bytes} bytes'
+            continue
+        if not line.strip():
+            continue
+        
+        try:
+            item = json.loads(line.decode('utf-8'))
+        except ValueError as e:
+            yield line_number, None, None, f'Invalid JSON: {e}'
+            continue
+        
+        if isinstance(item, str):
+            posting_id, text = None, item
+        elif isinstance(item, dict):
+            posting_id, text = item.get('id'), item.get('job_description')
+        else:
+            yield line_number, None, None, 'Line must be a JSON object or string'
+            continue
+        
+        if not isinstance(text, str) or not text.strip():
+            yield line_number, posting_id, None, 'Job description cannot be empty'
+            continue
+        yield line_number, posting_id, text.strip(), None
+
+def score_stream_chunk(active, chunk):
+    """
+    Score parsed stream lines through the prediction cache and the
+    near-duplicate index, with one predict_batch call for the rest.
+    
+    Returns:
+        list: one result dict per line, in order
+    """
+    items = []
+    missing = []
+    for line_number, posting_id, text, error in chunk:
+        item = {'line': line_number}
+        if posting_id is not None:
+            item['id'] = posting_id
+        if error is not None:
+            item['error'] = error
+        else:
+            key = PredictionCache.make_key(text)
+            result = prediction_cache.get(key, active.version)
+            item['cached'] = result is not None
+            signature = near_duplicate = None
+            if result is None:
+                signature, near_duplicate, result = find_near_duplicate(active, text)
+            item['near_duplicate'] = near_duplicate
+            if result is None:
+                missing.append((item, key, signature, text))
+            else:
+                item['result'] = result
+        items.append(item)
+    
+    if missing:
+        try:
+            scored = active.predictor.predict_batch([text for *_, text in missing])
+        except Exception as e:
+            # Only this chunk fails; the stream goes on with the next one
+            print(f"Error scoring stream chunk: {str(e)}")
+            metrics.inc('errors_total', source='api_predict_stream')
+            scored = None
+            for item, *_ in missing:
+                item['error'] = f'Prediction failed: {e}'
+        
+        for (item, key, signature, _), result in zip(missing, scored or []):
+            prediction_cache.put(key, active.version, result)
+            index_near_duplicate(active, signature, result)
+            item['result'] = result
+    
+    for item in items:
+        result = item.pop('result', None)
+        if result is not None:
+            prediction, confidence, indicators = result
+            item.update(prediction=prediction, confidence=float(confidence),
+                        indicators=indicators if indicators else [])
+        else:
+            item.pop('cached', None)
+            item.pop('near_duplicate', None)
+    return items
+
+@app.route('/api/predict/stream', methods=['POST', 'OPTIONS'])
+def predict_stream():
+    """
+    Score newline-delimited JSON postings and stream the results back.
+    
+    Request body (Content-Type: application/x-ndjson), one posting per line:
+        {"id": "optional, echoed back", "job_description": "string"}
+        "or just the posting as a JSON string"
+    
+    Response body (application/x-ndjson), one line per non-blank input
+    line, in input order, written as each chunk of up to STREAM_CHUNK_SIZE
+    postings and STREAM_CHUNK_BYTES of text is scored:
+        {"line": 1, "id": ..., "prediction": "fake", "confidence": 0.91,
+         "indicators": [...], "cached": false, "near_duplicate": null}
+        {"line": 2, "error": "Invalid JSON: ..."}
+    and a final summary:
+        {"done": true, "lines": 2, "scored": 1, "errors": 1, "model_version": "...",
+         "seconds": 0.01}
+    
+    Only one chunk of postings and results is held in memory at a time. A
+    bad line gets an error result of its own and the stream goes on. The
+    client must read the response while it uploads: results are written
+    before the whole body has been read.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    
+    # The whole stream uses one model, even if a reload swaps it meanwhile
+    active = model_manager.active
+    stream = request.stream
+    
+    def generate():
+        start = time.perf_counter()
+        counts = {'lines': 0, 'scored': 0, 'errors': 0}
+        chunk = []
+        chunk_bytes = 0
+        
+        def flush():
+            lines = []
+            for item in score_stream_chunk(active, chunk):
+                counts['lines'] += 1
+                counts['errors' if 'error' in item else 'scored'] += 1
+                lines.append(json.dumps(item) + '\n')
+            chunk.clear()
+            return ''.join(lines)
+        
+        postings = read_ndjson_postings(stream, MAX_STREAM_LINE_BYTES)
+        while True:
+            try:
+                parsed = next(postings, None)
+            except Exception as e:
+                # The body cannot be read further (e.g. the client went away)
+                print(f"Error reading prediction stream: {str(e)}")
+                metrics.inc('errors_total', source='api_predict_stream')
+                counts['read_error'] = str(e)
+                parsed = None
+            if parsed is None:
+                break
+            chunk.append(parsed)
+            text = parsed[2]
+            chunk_bytes += len(text.encode('utf-8')) if text is not None else 0
+            if len(chunk) >= STREAM_CHUNK_SIZE or chunk_bytes >= STREAM_CHUNK_BYTES:
+                chunk_bytes = 0
+                yield flush()
+        if chunk:
+            yield flush()
+        
+        metrics.inc('stream_postings_total', counts['scored'], status='scored')
+        metrics.inc('stream_postings_total', counts['errors'], status='error')
+        yield json.dumps({'done': True, **counts, 'model_version': active.version,
+                          'seconds': time.perf_counter() - start}) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
 @app.route('/api/health', methods=['GET', 'OPTIONS'])
 def health():
     """Health check endpoint."""
     if request.method == 'OPTIONS':
         return jsonify({'status': 'ok'}), 200
-    return jsonify({'status': 'healthy', 'message': 'API is running and ready'}), 200
+    return jsonify({'status': 'healthy', 'message': 'API is running and ready',
+                    **model_manager.status()}), 200
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_model():
+    """
+    Load the active model version in the background and swap it in.
+    
+    Request JSON (optional):
+    {
+        "version": "name of a published version to activate first",
+        "force": true to reload even if the version did not change
+    }
+    
+    The current model keeps serving until the new one is validated; if
+    validation fails it stays active and the error is returned.
+    """
+    if not admin_authorized():
+        return jsonify({'error': ADMIN_REFUSED}), 403
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        if data.get('version'):
+            activate_version(model_manager.models_root, data['version'])
+        reloaded = model_manager.reload(force=bool(data.get('force')))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except ModelReloadError as e:
+        return jsonify({'error': str(e), **model_manager.status()}), 500
+    
+    return jsonify({'reloaded': reloaded, **model_manager.status()}), 200
+
+@app.route('/api/admin/rollback', methods=['POST'])
+def rollback_model():
+    """Re-activate the version the last online (feedback) update replaced."""
+    if not admin_authorized():
+        return jsonify({'error': ADMIN_REFUSED}), 403
+    
+    try:
+        rollback(model_manager.models_root)
+        reloaded = model_manager.reload()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 409
+    except ModelReloadError as e:
+        return jsonify({'error': str(e), **model_manager.status()}), 500
+    
+    return jsonify({'reloaded': reloaded, **model_manager.status()}), 200
+
+@app.route('/api/feedback', methods=['POST', 'OPTIONS'])
+def feedback():
+    """
+    Record a moderator's label for a posting.
+    
+    Request JSON:
+    {
+        "job_description": "string",
+        "label": "fake" or "real",
+        "predicted": "fake" or "real" (optional, what the API returned)
+    }
+    
+    Labels are applied to the live model by the background updater, so this
+    is an admin route: it requires the X-Admin-Token header when
+    JOBVISION_ADMIN_TOKEN is set, and answers only local callers otherwise.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    
+    if not admin_authorized():
+        return jsonify({'error': ADMIN_REFUSED}), 403
+    
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({'error': 'Request body cannot be empty'}), 400
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    job_description = data.get('job_description')
+    if not isinstance(job_description, str) or not job_description.strip():
+        return jsonify({'error': 'Job description cannot be empty'}), 400
+    
+    label = data.get('label')
+    try:
+        feedback_updater.feedback.append(job_description.strip(), label,
+                                         data.get('predicted'), model_manager.active.version)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    metrics.inc('feedback_total', label='fake' if label in ('fake', 1) else 'real')
+    return jsonify({'status': 'recorded'}), 201
+
+@app.route('/api/feedback/stats', methods=['GET', 'OPTIONS'])
+def feedback_stats():
+    """Applied/pending feedback counts and the result of the last online update."""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    return jsonify(feedback_updater.status()), 200
+
+@app.route('/api/cache/stats', methods=['GET', 'OPTIONS'])
+def cache_stats():
+    """Prediction cache hit/miss counters."""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    return jsonify(prediction_cache.stats()), 200
+
+@app.route('/api/near-duplicates/stats', methods=['GET', 'OPTIONS'])
+def near_duplicate_stats():
+    """Near-duplicate index size and hit/miss counters."""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    if near_duplicate_index is None:
+        return jsonify({'enabled': False}), 200
+    return jsonify({'enabled': True, **near_duplicate_index.stats()}), 200
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Stage latency histograms and counters in the Prometheus text format."""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/batching/stats', methods=['GET', 'OPTIONS'])
+def batching_stats():
+    """Micro-batching settings and counters for /api/predict."""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+    batcher = model_manager.active.batcher
+    if batcher is None:
+        return jsonify({'enabled': False, 'window_ms': 0, 'max_batch_size': BATCH_MAX_SIZE}), 200
+    return jsonify({'enabled': True, **batcher.stats()}), 200
 
 @app.route('/', methods=['GET'])
 def home():
@@ -96,6 +785,16 @@ def home():
         'description': 'Fake Job Detector using ML',
         'endpoints': {
             'predict': 'POST /api/predict',
+            'predict_batch': 'POST /api/predict/batch',
+            'predict_stream': 'POST /api/predict/stream',
+            'cache_stats': 'GET /api/cache/stats',
+            'near_duplicate_stats': 'GET /api/near-duplicates/stats',
+            'batching_stats': 'GET /api/batching/stats',
+            'metrics': 'GET /api/metrics',
+            'reload_model': 'POST /api/admin/reload',
+            'rollback_model': 'POST /api/admin/rollback',
+            'feedback': 'POST /api/feedback',
+            'feedback_stats': 'GET /api/feedback/stats',
             'health': 'GET /api/health'
         }
     }), 200
@@ -108,6 +807,8 @@ if __name__ == '__main__':
     print("📡 API endpoints available:")
     print("   - GET  http://localhost:5000/api/health")
     print("   - POST http://localhost:5000/api/predict")
+    print("   - POST http://localhost:5000/api/predict/batch")
+    print("   - POST http://localhost:5000/api/predict/stream")
     print("=" * 60)
     print("⚠️  Make sure the ML model is trained (models/model.pkl exists)")
     print("=" * 60)
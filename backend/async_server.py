@@ -0,0 +1,237 @@
+"""
+Asyncio serving entry point for the JobVision API.
+
+Serves the same /api/predict and /api/health contract as backend/app.py
+using only the standard library. Predictions run in a bounded thread or
+process pool so the event loop never blocks on CPU work, and the number of
+requests waiting for a worker is capped: once the queue is full, new
+prediction requests get an immediate 503 instead of queueing without limit.
+
+Usage: python backend/async_server.py [--port 5000] [--workers 4] [--max-queue 64]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import CORS_ORIGINS, model_manager, predict_posting
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+class RequestError(Exception):
+    """A request that cannot be served; answered with status and the connection closed."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class AsyncPredictionServer:
+    """Minimal HTTP/1.1 server that hands prediction to a bounded executor."""
+
+    def __init__(self, workers=4, max_queue=64, executor='thread'):
+        self.workers = workers
+        self.max_queue = max_queue
+        if executor == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        # Requests submitted to the executor and not finished yet
+        self.in_flight = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self):
+        """Requests that may be running or waiting for a worker at once."""
+        return self.workers + self.max_queue
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one keep-alive connection."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except RequestError as e:
+                    # The rest of the stream cannot be parsed, so answer and close
+                    self._write_response(writer, e.status, {'error': str(e)}, None, {}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                status, payload, extra_headers = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                self._write_response(writer, status, payload, headers.get('origin'),
+                                     extra_headers, keep_alive)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Parse one request, or return None when the client is done.
+
+        Raises:
+            RequestError: 400 for a malformed request line, header or
+                Content-Length, 413 for a body over MAX_BODY_SIZE
+        """
+        try:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                return None
+
+            parts = request_line.decode('latin-1').split()
+            if len(parts) != 3:
+                raise RequestError(400, 'Malformed request line')
+            method, path, _ = parts
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+        except ValueError:
+            # StreamReader.readline raises ValueError for lines over its limit
+            raise RequestError(400, 'Request line or header too long') from None
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            raise RequestError(400, 'Invalid Content-Length') from None
+        if length < 0:
+            raise RequestError(400, 'Invalid Content-Length')
+        if length > MAX_BODY_SIZE:
+            raise RequestError(413, f'Request body cannot exceed {MAX_BODY_SIZE} bytes')
+        body = await reader.readexactly(length) if length else b''
+
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    async def _dispatch(self, method, path, body):
+        """Route a request; returns (status, payload, extra headers)."""
+        if method == 'OPTIONS' and path.startswith('/api/'):
+            return 200, {'status': 'ok'}, {}
+
+        if path == '/api/health' and method == 'GET':
+            return 200, {
+                'status': 'healthy',
+                'message': 'API is running and ready',
+                **model_manager.status(),
+                'workers': self.workers,
+                'in_flight': self.in_flight,
+                'max_queue': self.max_queue,
+                'rejected': self.rejected,
+            }, {}
+
+        if path == '/api/predict' and method == 'POST':
+            return await self._predict(body)
+
+        return 404, {'error': 'Not found'}, {}
+
+    async def _predict(self, body):
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return 400, {'error': 'Invalid JSON body'}, {}
+
+        if not data:
+            return 400, {'error': 'Request body cannot be empty'}, {}
+        if not isinstance(data, dict):
+            return 400, {'error': 'Request body must be a JSON object'}, {}
+
+        job_description = data.get('job_description', '')
+        if not isinstance(job_description, str) or not job_description.strip():
+            return 400, {'error': 'Job description cannot be empty'}, {}
+
+        # Backpressure: answer right away instead of growing the queue
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            return 503, {'error': 'Server is busy, please retry'}, {'Retry-After': '1'}
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            payload, status = await loop.run_in_executor(self.executor, predict_posting,
+                                                         job_description.strip())
+            return status, payload, {}
+        except Exception as e:
+            print(f"Error in predict endpoint: {str(e)}")
+            return 500, {'error': 'Internal server error', 'details': str(e)}, {}
+        finally:
+            self.in_flight -= 1
+
+    def _write_response(self, writer, status, payload, origin, extra_headers, keep_alive):
+        body = json.dumps(payload).encode('utf-8')
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+        if origin in CORS_ORIGINS:
+            headers.update({
+                'Access-Control-Allow-Origin': origin,
+                'Access-Control-Allow-Credentials': 'true',
+                'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+                'Access-Control-Allow-Headers': 'Content-Type',
+                'Vary': 'Origin',
+            })
+        headers.update(extra_headers)
+
+        lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def serve(self, host, port, sock=None):
+        """Run the server until cancelled."""
+        if sock is not None:
+            server = await asyncio.start_server(self.handle_connection, sock=sock)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+
+        async with server:
+            await server.serve_forever()
+
+def _warm_worker():
+    """Process pool initializer: load the model before the first request."""
+    # Straight to the predictor, so the warm-up text is not cached or indexed
+    model_manager.active.predictor.predict_batch(['warm up'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Asyncio server for the JobVision API.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=4,
+                        help='prediction threads or processes')
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help='requests allowed to wait for a worker before answering 503')
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    args = parser.parse_args()
+
+    # Load lazily initialized NLTK data before serving
+    model_manager.active.predictor.predict('warm up')
+
+    server = AsyncPredictionServer(args.workers, args.max_queue, args.executor)
+    print(f"🚀 JobVision async API on http://{args.host}:{args.port} "
+          f"({args.workers} {args.executor} workers, queue {args.max_queue})")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Recall/latency benchmark for the near-duplicate index.
+
+Indexes synthetic scam postings, then looks up reposts mutated the way
+campaigns edit them (changed amounts and phone numbers, a few words replaced,
+inserted or deleted) and unrelated postings. Reports, per mutation, the true
+Jaccard similarity of the shingles, the share of reposts matched to their
+original (recall, overall and among reposts whose true similarity reaches the
+threshold), false matches on unrelated postings, lookup latency
+(clean_text + signature + LSH lookup) against a full JobPredictor.predict,
+memory per entry, save/load time and behaviour under eviction.
+
+Usage: python backend/bench_near_duplicates.py [--postings 2000] [--model-path models/]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from backend.near_duplicates import NearDuplicateIndex
+
+WORDS = (
+    'work home earn money fast easy weekly payment online position assistant data entry '
+    'remote flexible hours apply today start immediately training provided no experience '
+    'required guaranteed income bonus package manager team customer service company '
+    'office training paid daily account details bank transfer processing fee contact '
+    'recruiter interview telegram whatsapp message urgent hiring limited spots opportunity '
+    'shipping parcel reshipping coordinator payroll clerk mystery shopper evaluate stores '
+    'commission sales representative benefits insurance vacation career growth mentor '
+    'skills communication computer internet access laptop smartphone schedule tasks'
+).split()
+
+def make_posting(rng, length):
+    words = [rng.choice(WORDS) for _ in range(length)]
+    return (' '.join(words) + f' Pay ${rng.randint(100, 999)} per day. '
+            f'Call +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}.')
+
+def mutate(rng, text, edits):
+    """Change the amount and phone number, then replace/insert/delete `edits` words."""
+    words = text.split()
+    words[-8] = f'${rng.randint(100, 999)}'
+    words[-2:] = [str(rng.randint(100, 999)), f'{rng.randint(1000, 9999)}.']
+    for _ in range(edits):
+        position = rng.randrange(len(words) - 8)
+        operation = rng.choice(('replace', 'insert', 'delete'))
+        if operation == 'replace':
+            words[position] = rng.choice(WORDS)
+        elif operation == 'insert':
+            words.insert(position, rng.choice(WORDS))
+        else:
+            del words[position]
+    return ' '.join(words)
+
+def shingles(cleaned, size=3):
+    words = cleaned.split()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postings', type=int, default=2000, help='originals to index')
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--model-path', help='model directory for the predict() comparison')
+    args = parser.parse_args()
+
+    from ml_model.predictor import JobPredictor
+    predictor = JobPredictor(model_path=args.model_path)
+
+    rng = random.Random(42)
+    originals = [make_posting(rng, rng.randint(60, 300)) for _ in range(args.postings)]
+    unrelated = [make_posting(rng, rng.randint(60, 300)) for _ in range(args.postings // 4)]
+    cleaned = [predictor.clean_text(text) for text in originals]
+
+    tracemalloc.start()
+    index = NearDuplicateIndex(threshold=args.threshold, max_entries=args.postings)
+    ids = [index.add(index.signature(text), 'bench', ('fake', 0.9, [])) for text in cleaned]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def query(text):
+        start = time.perf_counter()
+        signature = index.signature(predictor.clean_text(text))
+        match = index.lookup(signature, 'bench')
+        return match, time.perf_counter() - start
+
+    print("=" * 90)
+    print(f"{'Reposts':<26}{'Jaccard':>9}{'Recall':>9}{'J>=thr':>8}{'Recall':>9}"
+          f"{'p50 (us)':>10}{'p99 (us)':>10}{'max (us)':>9}")
+    print("=" * 90)
+
+    latencies = []
+    for name, edits in (('amount + phone changed', 0), ('+ 1 word edit', 1),
+                        ('+ 3 word edits', 3), ('+ 5 word edits', 5), ('+ 10 word edits', 10)):
+        matched, similarities, times = [], [], []
+        for i, original in enumerate(originals):
+            repost = mutate(rng, original, edits)
+            similarities.append(jaccard(shingles(cleaned[i]), shingles(predictor.clean_text(repost))))
+            match, elapsed = query(repost)
+            matched.append(bool(match) and match[0] == ids[i])
+            times.append(elapsed)
+        latencies.extend(times)
+
+        matched, similarities = np.array(matched), np.array(similarities)
+        above = similarities >= args.threshold
+        recall_above = f'{matched[above].mean():.1%}' if above.any() else 'n/a'
+        print(f"{name:<26}{similarities.mean():>9.3f}{matched.mean():>9.1%}{above.mean():>8.0%}"
+              f"{recall_above:>9}{percentile(times, 50):>10.1f}{percentile(times, 99):>10.1f}"
+              f"{max(times) * 1e6:>9.0f}")
+
+    false_matches, times = 0, []
+    for text in unrelated:
+        match, elapsed = query(text)
+        false_matches += bool(match)
+        times.append(elapsed)
+    print(f"{'unrelated (false match)':<26}{'':>9}{false_matches / len(unrelated):>9.1%}{'':>17}"
+          f"{percentile(times, 50):>10.1f}{percentile(times, 99):>10.1f}{max(times) * 1e6:>9.0f}")
+    print("=" * 90)
+    print("J>=thr: share of reposts whose true shingle similarity reaches the threshold; "
+          "the second Recall is among those")
+
+    sample = originals[:200]
+    start = time.perf_counter()
+    for text in sample:
+        predictor.predict(text)
+    predict_us = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"Lookup p50 {percentile(latencies, 50):.1f} us vs JobPredictor.predict "
+          f"{predict_us:.1f} us ({predict_us / percentile(latencies, 50):.0f}x)")
+    print(f"Memory: {memory / len(ids) / 1024:.2f} KiB per entry "
+          f"({memory / 2 ** 20:.1f} MiB for {len(ids)} entries)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'index.npz')
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+
+        restored = NearDuplicateIndex(threshold=args.threshold, max_entries=args.postings)
+        start = time.perf_counter()
+        restored.load(path)
+        loaded = time.perf_counter() - start
+        same = all(restored.lookup(index.signature(text), 'bench')[0] == entry_id
+                   for text, entry_id in zip(cleaned[:200], ids))
+        print(f"Persistence: save {saved * 1000:.1f} ms, load {loaded * 1000:.1f} ms, "
+              f"{os.path.getsize(path) / 1024:.0f} KiB, lookups identical after load: {same}")
+
+    small = NearDuplicateIndex(threshold=args.threshold, max_entries=args.postings // 2)
+    for text in cleaned:
+        small.add(small.signature(text), 'bench', ('fake', 0.9, []))
+    recent = sum(bool(small.lookup(small.signature(text), 'bench'))
+                 for text in cleaned[args.postings // 2:])
+    stats = small.stats()
+    print(f"Eviction: max_entries {stats['max_size']}, size {stats['size']}, "
+          f"{stats['evictions']} evicted, most recent half still found: "
+          f"{recent / (args.postings - args.postings // 2):.1%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Memory and startup comparison: pre-fork launcher vs independent processes.
+
+Starts N workers with backend/prefork.py, and separately N independent Flask
+servers (one per port), sends the same requests to each setup, then reports:
+
+  startup   seconds from launch until every worker answers /api/health
+  USS       per-worker unique memory (pages no other process shares)
+  PSS       proportional share, summed over all processes of the setup
+
+Memory figures come from /proc/<pid>/smaps_rollup, so this runs on Linux.
+
+Usage: python backend/bench_prefork.py [--workers 4] [--requests 400]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.bench_servers import FLASK_COMMAND, POSTING, free_port
+
+
+def memory_kb(pid):
+    """Return (USS, PSS, RSS) of a process in KiB."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    uss = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return uss, fields.get('Pss', 0), fields.get('Rss', 0)
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def healthy(port):
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+        conn.request('GET', '/api/health')
+        return conn.getresponse().status == 200
+    except OSError:
+        return False
+
+
+def send_requests(ports, total):
+    """Spread unique postings over the ports, one new connection per request."""
+    for n in range(total):
+        conn = http.client.HTTPConnection('127.0.0.1', ports[n % len(ports)], timeout=30)
+        conn.request('POST', '/api/predict', json.dumps({'job_description': POSTING.format(n=n)}),
+                     {'Content-Type': 'application/json'})
+        conn.getresponse().read()
+        conn.close()
+
+
+def wait_until(condition, timeout=180):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return
+        time.sleep(0.05)
+    raise RuntimeError("Servers did not start in time")
+
+
+def run_prefork(workers, requests):
+    port = free_port()
+    start = time.perf_counter()
+    parent = subprocess.Popen([sys.executable, os.path.join(ROOT, 'backend', 'prefork.py'),
+                               '--host', '127.0.0.1', '--port', str(port),
+                               '--workers', str(workers)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until(lambda: healthy(port) and len(children(parent.pid)) == workers)
+        startup = time.perf_counter() - start
+
+        send_requests([port], requests)
+        pids = children(parent.pid)
+        worker_memory = [memory_kb(pid) for pid in pids]
+        parent_memory = memory_kb(parent.pid)
+    finally:
+        parent.send_signal(signal.SIGTERM)
+        parent.wait()
+
+    return startup, worker_memory, parent_memory
+
+
+def run_independent(workers, requests):
+    ports = [free_port() for _ in range(workers)]
+    start = time.perf_counter()
+    processes = [subprocess.Popen([sys.executable, '-c', FLASK_COMMAND.format(root=ROOT, port=port)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                 for port in ports]
+    try:
+        wait_until(lambda: all(healthy(port) for port in ports))
+        startup = time.perf_counter() - start
+
+        send_requests(ports, requests)
+        worker_memory = [memory_kb(process.pid) for process in processes]
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    return startup, worker_memory, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=400,
+                        help='requests sent before memory is measured')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit("This benchmark reads /proc/<pid>/smaps_rollup and needs Linux 4.14+")
+
+    # Micro-batching adds a thread per worker but does not change memory much;
+    # disable the model watcher so both setups do the same work
+    os.environ['JOBVISION_MODEL_POLL_SECONDS'] = '0'
+
+    rows = []
+    for name, run in (('prefork', run_prefork), ('independent', run_independent)):
+        startup, worker_memory, parent_memory = run(args.workers, args.requests)
+        uss = [m[0] / 1024 for m in worker_memory]
+        pss_total = sum(m[1] for m in worker_memory) / 1024
+        rss = [m[2] / 1024 for m in worker_memory]
+        if parent_memory is not None:
+            pss_total += parent_memory[1] / 1024
+        rows.append((name, startup, sum(uss) / len(uss), sum(rss) / len(rss), pss_total))
+
+    print(f"\n{args.workers} workers, {args.requests} requests before measuring")
+    print("=" * 76)
+    print(f"{'Setup':<13}{'Startup (s)':>12}{'USS/worker MiB':>17}{'RSS/worker MiB':>17}{'Total PSS MiB':>16}")
+    print("=" * 76)
+    for name, startup, uss, rss, pss in rows:
+        print(f"{name:<13}{startup:>12.2f}{uss:>17.1f}{rss:>17.1f}{pss:>16.1f}")
+    print("=" * 76)
+    print("Total PSS includes the prefork parent, which holds the shared copy.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Throughput comparison: Flask development server vs the asyncio entry point.
+
+Starts each server as a subprocess on a free port, then drives
+/api/predict from concurrent keep-alive clients and reports requests/s,
+latency percentiles and how many requests were rejected with 503. Postings
+are made unique per request so the prediction cache does not hide the
+model cost.
+
+Usage: python backend/bench_servers.py [--requests 2000] [--concurrency 32]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FLASK_COMMAND = ("import sys; sys.path.insert(0, {root!r}); "
+                 "from backend.app import app; "
+                 "app.run(host='127.0.0.1', port={port}, threaded=True)")
+
+POSTING = ("Senior software engineer for a growing fintech company. Requirements: "
+           "five years of Python, experience with distributed systems and cloud "
+           "infrastructure. Competitive salary and benefits. Posting #{n}")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port, workers=4, max_queue=64, executor='thread'):
+    """Start the Flask or async server on port and wait until /api/health answers."""
+    if kind == 'flask':
+        command = [sys.executable, '-c', FLASK_COMMAND.format(root=ROOT, port=port)]
+    else:
+        command = [sys.executable, os.path.join(ROOT, 'backend', 'async_server.py'),
+                   '--host', '127.0.0.1', '--port', str(port),
+                   '--workers', str(workers), '--max-queue', str(max_queue),
+                   '--executor', executor]
+
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start on port {port}")
+
+
+def run_load(port, total, concurrency):
+    """Send total requests from concurrency threads; returns (latencies, statuses, seconds)."""
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                break
+
+            body = json.dumps({'job_description': POSTING.format(n=n)})
+            start = time.perf_counter()
+            try:
+                conn.request('POST', '/api/predict', body, {'Content-Type': 'application/json'})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                status = 'error'
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                latencies.append(elapsed)
+                statuses[status] = statuses.get(status, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sorted(latencies), statuses, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-queue', type=int, default=64)
+    parser.add_argument('--executor', choices=['thread', 'process'], default='thread')
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent clients, "
+          f"async: {args.workers} {args.executor} workers, queue {args.max_queue}\n")
+
+    rows = []
+    for kind in ('flask', 'async'):
+        port = free_port()
+        process = start_server(kind, port, args.workers, args.max_queue, args.executor)
+        try:
+            run_load(port, min(50, args.requests), 4)  # warm up
+            latencies, statuses, elapsed = run_load(port, args.requests, args.concurrency)
+        finally:
+            process.terminate()
+            process.wait()
+
+        ok = statuses.get(200, 0)
+        rows.append((kind, ok / elapsed, percentile(latencies, 0.5) * 1000,
+                     percentile(latencies, 0.99) * 1000, statuses.get(503, 0),
+                     args.requests - ok - statuses.get(503, 0)))
+
+    print("=" * 64)
+    print(f"{'Server':<8}{'OK req/s':>12}{'p50 (ms)':>11}{'p99 (ms)':>11}{'503s':>10}{'Errors':>10}")
+    print("=" * 64)
+    for kind, throughput, p50, p99, rejected, errors in rows:
+        print(f"{kind:<8}{throughput:>12.1f}{p50:>11.1f}{p99:>11.1f}{rejected:>10}{errors:>10}")
+    print("=" * 64)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Micro-batching of concurrent single-posting predictions.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Coalesces predictions requested by concurrent callers into batch calls.
+
+    Callers block in predict() while a background thread collects requests
+    that arrive within window_ms of the first one, up to max_batch_size, and
+    scores them with a single predict_batch call. If the batch call raises
+    or returns the wrong number of results, each posting is retried on its
+    own so one bad posting only fails its own caller. A caller is never left
+    waiting on a posting that was not scored: its future gets an exception.
+    """
+
+    def __init__(self, predict_batch, window_ms=5.0, max_batch_size=32):
+        if window_ms < 0:
+            raise ValueError("window_ms must be >= 0")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self.predict_batch = predict_batch
+        self.window_ms = window_ms
+        self.max_batch_size = max_batch_size
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+        self.requests = 0
+        self.batches = 0
+        self.full_batches = 0
+        self.largest_batch = 0
+        self.batch_failures = 0
+        self.errors = 0
+
+    def predict(self, job_description, timeout=None):
+        """
+        Score one posting as part of the next batch; returns its result tuple.
+
+        Raises:
+            concurrent.futures.TimeoutError: if the result is not ready
+                within timeout seconds (None waits indefinitely)
+        """
+        future = Future()
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._start_locked()
+                self._queue.put((job_description, future))
+
+        if closed:
+            # Requests that arrive after close() are scored on their own
+            return self.predict_batch([job_description])[0]
+        return future.result(timeout)
+
+    def close(self):
+        """
+        Stop the batching thread once everything already queued is scored.
+
+        Used when the batcher's model is replaced; callers still holding the
+        batcher keep working, without batching.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None:
+                self._queue.put(None)
+
+    def stats(self):
+        """Return batching settings and counters."""
+        with self._lock:
+            return {
+                'window_ms': self.window_ms,
+                'max_batch_size': self.max_batch_size,
+                'requests': self.requests,
+                'batches': self.batches,
+                'average_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+                'full_batches': self.full_batches,
+                'batch_failures': self.batch_failures,
+                'errors': self.errors,
+                'queued': self._queue.qsize(),
+            }
+
+    def _start_locked(self):
+        # Caller holds the lock
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='micro-batcher',
+                                            daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.window_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        # Window is over, but take whatever is already waiting
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                # close() queues None after the last request, so nothing follows it
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._score(batch)
+            if stopping:
+                return
+
+    def _score(self, batch):
+        texts = [text for text, _ in batch]
+        errors = 0
+
+        try:
+            try:
+                results = self.predict_batch(texts)
+                if len(results) != len(batch):
+                    raise ValueError(f"predict_batch returned {len(results)} results "
+                                     f"for {len(batch)} postings")
+                failed = False
+            except Exception as e:
+                print(f"Micro-batch prediction error: {e}")
+                failed = True
+
+            if failed:
+                # Isolate the failure: score every posting of the batch on its own
+                for text, future in batch:
+                    try:
+                        future.set_result(self.predict_batch([text])[0])
+                    except Exception as e:
+                        errors += 1
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+        finally:
+            # Whatever went wrong above, no caller may wait forever
+            for _, future in batch:
+                if not future.done():
+                    errors += 1
+                    future.set_exception(RuntimeError("Posting was not scored"))
+
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            if len(batch) == self.max_batch_size:
+                self.full_batches += 1
+            if failed:
+                self.batch_failures += 1
+            self.errors += errors
@@ -0,0 +1,146 @@
+"""
+Hot reloading of the served model.
+
+The active model is an immutable ActiveModel snapshot. A request reads
+`manager.active` once and uses that snapshot until it finishes, so a reload
+never changes the model under an in-flight request. A new model is loaded and
+validated off the request path, and only then does the snapshot get swapped,
+with a single attribute assignment.
+"""
+
+import datetime
+import threading
+from collections import namedtuple
+
+from ml_model.predictor import JobPredictor
+from ml_model.versions import resolve_model
+
+from backend.micro_batcher import MicroBatcher
+
+# batcher is None when micro-batching is disabled
+ActiveModel = namedtuple('ActiveModel', ['predictor', 'version', 'loaded_at', 'batcher'])
+
+# Postings every candidate model must score sensibly before it is swapped in
+VALIDATION_POSTINGS = [
+    'Senior software engineer with 5 years of experience. Salary range and benefits.',
+    'Work from home, no experience required! Get paid today, upfront fee of $99.',
+]
+
+class ModelReloadError(RuntimeError):
+    """Raised when a candidate model fails to load or validate."""
+
+class ModelManager:
+    """Owns the active model of the API and swaps in new versions."""
+
+    def __init__(self, models_root, tokenizer=None, scorer='auto',
+                 batch_window_ms=0, batch_max_size=32):
+        self.models_root = models_root
+        self.tokenizer = tokenizer
+        self.scorer = scorer
+        self.batch_window_ms = batch_window_ms
+        self.batch_max_size = batch_max_size
+
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self.last_error = None
+        # Version that last failed to load; not retried until CURRENT changes
+        self._failed_version = None
+
+        # The first model may be missing; the predictor then runs rule-based
+        self.active = self._load(*resolve_model(models_root), validate=False)
+
+    def _load(self, version, model_path, validate=True):
+        """Build (and optionally validate) a snapshot for one model directory."""
+        predictor = JobPredictor(model_path=model_path, tokenizer=self.tokenizer,
+                                 scorer=self.scorer)
+        predictor.model_version = version
+
+        if validate:
+            if not predictor.model_available:
+                raise ModelReloadError(f"Model version {version!r} could not be loaded")
+            for prediction, confidence, _ in predictor.predict_batch(VALIDATION_POSTINGS):
+                if prediction not in ('fake', 'real') or not 0 <= confidence <= 1:
+                    raise ModelReloadError(f"Model version {version!r} returned an invalid "
+                                           f"prediction: {prediction!r}, {confidence!r}")
+
+        batcher = None
+        if self.batch_window_ms > 0:
+            batcher = MicroBatcher(predictor.predict_batch, self.batch_window_ms,
+                                   self.batch_max_size)
+
+        loaded_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        return ActiveModel(predictor, version, loaded_at, batcher)
+
+    def reload(self, force=False):
+        """
+        Load the version CURRENT points at and swap it in if it validates.
+
+        Returns:
+            bool: True if a new model was swapped in, False if the active
+                version is already current
+        Raises:
+            ModelReloadError: the candidate failed; the old model stays active
+        """
+        with self._reload_lock:
+            try:
+                version, model_path = resolve_model(self.models_root)
+            except ValueError as e:
+                # CURRENT names something outside versions/; never load it
+                self.last_error = str(e)
+                raise ModelReloadError(str(e)) from e
+            if version in (self.active.version, self._failed_version) and not force:
+                return False
+
+            try:
+                candidate = self._load(version, model_path)
+            except Exception as e:
+                self.last_error = f"{version}: {e}"
+                self._failed_version = version
+                if isinstance(e, ModelReloadError):
+                    raise
+                raise ModelReloadError(f"Model version {version!r} failed to load: {e}") from e
+
+            previous, self.active = self.active, candidate
+            self.last_error = None
+            self._failed_version = None
+            print(f"Model version {candidate.version} is now active "
+                  f"(was {previous.version})")
+
+            # Requests still using the old batcher finish; new ones never see it
+            if previous.batcher is not None:
+                previous.batcher.close()
+            return True
+
+    def start_watcher(self, interval):
+        """Check for a newly published version every `interval` seconds."""
+        if self._watcher is not None or interval <= 0:
+            return
+
+        stop = threading.Event()
+
+        def watch():
+            while not stop.wait(interval):
+                try:
+                    self.reload()
+                except ModelReloadError as e:
+                    print(f"Model reload failed, keeping {self.active.version}: {e}")
+                except OSError as e:
+                    print(f"Model watcher error: {e}")
+
+        self._watcher = stop
+        threading.Thread(target=watch, name='model-watcher', daemon=True).start()
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.set()
+            self._watcher = None
+
+    def status(self):
+        """Active model details for /api/health."""
+        active = self.active
+        return {
+            'model_version': active.version,
+            'model_loaded_at': active.loaded_at,
+            'model_available': active.predictor.model_available,
+            'last_reload_error': self.last_error,
+        }
@@ -0,0 +1,305 @@
+"""
+Near-duplicate index of scored postings.
+
+Scam campaigns repost the same text with small edits. Each scored posting is
+indexed by a MinHash signature of the word shingles of its clean_text
+output (which already drops digits, URLs and e-mail addresses, so a changed
+amount or phone number does not count as an edit). A new posting whose
+estimated Jaccard similarity to an indexed one reaches the threshold gets
+that posting's result back without running the model.
+
+Candidates are found with LSH banding: the signature is cut into bands and
+each band is hashed into a bucket, so two postings are compared only if at
+least one band matches exactly. With the defaults (128 permutations, 16
+bands of 8 rows) postings with similarity 0.8 become candidates ~95% of the
+time and 0.9 ~100%, while unrelated postings almost never share a bucket.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Odd 64-bit constant that folds the word hashes of a shingle into one hash
+SHINGLE_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+class NearDuplicateIndex:
+    """
+    Bounded LRU index of MinHash signatures and the results they were scored with.
+
+    Like PredictionCache, the index is tied to a model generation: looking up
+    or adding entries for another generation drops everything indexed so far.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=16, shingle_size=3,
+                 max_entries=10000, seed=42):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        self.seed = seed
+
+        # Permutations x -> (a * x + b) mod 2**32; an odd a makes each one a bijection
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32) | np.uint32(1)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint32)
+
+        # Signatures live in one preallocated array, so memory is bounded and
+        # candidates are compared in a single vectorized step
+        self._signatures = np.zeros((max_entries, num_perm), dtype=np.uint32)
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        # entry id -> (slot, result); ordered from least to most recently used
+        self._entries = OrderedDict()
+        # One dict per band: bucket key -> list of entry ids (lists are much
+        # smaller than sets, and buckets rarely hold more than one entry)
+        self._buckets = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+        self._generation = None
+        self._saver = None
+        self.dirty = False
+        # Incremented on every change, so save() knows whether it wrote the latest state
+        self._changes = 0
+        self.hits = 0
+        self.misses = 0
+        self.rejections = 0
+        self.evictions = 0
+
+    def signature(self, cleaned_text):
+        """
+        MinHash signature of a clean_text output, or None if it has no words.
+
+        Words are hashed with CRC32, not hash(), so signatures are the same
+        in every process and after a restart.
+        """
+        words = cleaned_text.split()
+        if not words:
+            return None
+
+        # Shingle hashes are combined from word hashes, without building the shingles
+        word_hashes = np.array([zlib.crc32(word.encode('utf-8')) for word in words],
+                               dtype=np.uint64)
+        count = len(words) - min(self.shingle_size, len(words)) + 1
+        hashes = word_hashes[:count].copy()
+        for offset in range(1, min(self.shingle_size, len(words))):
+            hashes = hashes * SHINGLE_MIX + word_hashes[offset:offset + count]
+        # Fold to 32 bits: uint32 arithmetic is twice as fast as uint64
+        hashes = np.unique(((hashes >> np.uint64(32)) ^ hashes).astype(np.uint32))
+
+        permuted = np.multiply.outer(hashes, self._a)
+        permuted += self._b
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [hash(signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)]
+
+    def lookup(self, signature, generation):
+        """
+        Return (entry id, estimated similarity, result) of the most similar
+        indexed posting at or above the threshold, or None.
+        """
+        with self._lock:
+            self._check_generation(generation)
+
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best_id = None
+            if candidates:
+                candidates = list(candidates)
+                slots = [self._entries[entry_id][0] for entry_id in candidates]
+                similarities = (self._signatures[slots] == signature).mean(axis=1)
+                best = int(similarities.argmax())
+                if similarities[best] >= self.threshold:
+                    best_id, best_similarity = candidates[best], float(similarities[best])
+
+            if best_id is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            prediction, confidence, indicators = self._entries[best_id][1]
+
+        return best_id, best_similarity, (prediction, confidence, [dict(ind) for ind in indicators])
+
+    def reject(self):
+        """Count a lookup match the caller did not reuse as a rejection rather than a hit."""
+        with self._lock:
+            self.hits -= 1
+            self.rejections += 1
+
+    def add(self, signature, generation, result):
+        """Index a scored posting, evicting the least recently used one if full. Returns its id."""
+        prediction, confidence, indicators = result
+        value = (prediction, float(confidence), [dict(ind) for ind in indicators])
+        entry_id = hashlib.blake2b(signature.tobytes(), digest_size=8).hexdigest()
+
+        with self._lock:
+            if self._generation is not None and generation != self._generation:
+                # Scored by a model that has been replaced since; do not keep it
+                return entry_id
+            self._generation = generation
+
+            if entry_id in self._entries:
+                self._entries.move_to_end(entry_id)
+                return entry_id
+
+            if not self._free_slots:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._insert(entry_id, signature, value)
+            self._changes += 1
+            self.dirty = True
+        return entry_id
+
+    def _insert(self, entry_id, signature, value):
+        # Caller holds the lock and made sure a slot is free
+        slot = self._free_slots.pop()
+        self._signatures[slot] = signature
+        self._entries[entry_id] = (slot, value)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(entry_id)
+
+    def _remove(self, entry_id):
+        # Caller holds the lock
+        slot, _ = self._entries.pop(entry_id)
+        self._free_slots.append(slot)
+        for band, key in enumerate(self._band_keys(self._signatures[slot])):
+            bucket = self._buckets[band][key]
+            bucket.remove(entry_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def _reset(self):
+        # Caller holds the lock
+        self._entries.clear()
+        self._buckets = [{} for _ in range(self.bands)]
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def _check_generation(self, generation):
+        # Caller holds the lock
+        if generation != self._generation:
+            self._reset()
+            self._generation = generation
+
+    def clear(self):
+        """Drop all indexed postings."""
+        with self._lock:
+            self._reset()
+            self._changes += 1
+            self.dirty = True
+
+    def _settings(self):
+        return {'num_perm': self.num_perm, 'bands': self.bands,
+                'shingle_size': self.shingle_size, 'seed': self.seed}
+
+    def save(self, path):
+        """
+        Write the index to path (an .npz file), atomically.
+
+        The index stays dirty if the write fails, or if entries changed while
+        it was being written, so the next autosave retries.
+        """
+        with self._lock:
+            ids = list(self._entries)
+            signatures = self._signatures[[self._entries[i][0] for i in ids]]
+            results = [self._entries[i][1] for i in ids]
+            meta = {'generation': self._generation, 'settings': self._settings()}
+            changes = self._changes
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Per process: pre-fork workers may save the same file
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        try:
+            np.savez(tmp_path, ids=np.array(ids, dtype='U16'),
+                     signatures=signatures.reshape(len(ids), self.num_perm),
+                     results=np.array(json.dumps(results)), meta=np.array(json.dumps(meta)))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._changes == changes:
+                self.dirty = False
+
+    def load(self, path):
+        """
+        Restore entries saved by save(), oldest first, up to max_entries.
+
+        Returns:
+            int: entries loaded; 0 if the file is missing or was written
+                with other MinHash settings
+        """
+        if not os.path.exists(path):
+            return 0
+
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            if meta['settings'] != self._settings():
+                print(f"Ignoring near-duplicate index {path}: written with other settings")
+                return 0
+            ids = data['ids'].tolist()
+            signatures = data['signatures']
+            results = json.loads(str(data['results']))
+
+        with self._lock:
+            self._reset()
+            self._generation = meta['generation']
+            keep = max(len(ids) - self.max_entries, 0)
+            for entry_id, signature, result in zip(ids[keep:], signatures[keep:], results[keep:]):
+                self._insert(entry_id, signature, tuple(result))
+            self.dirty = False
+            return len(self._entries)
+
+    def start_autosave(self, path, interval):
+        """Save to path every `interval` seconds when something changed."""
+        if self._saver is not None or interval <= 0:
+            return
+
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                if self.dirty:
+                    try:
+                        self.save(path)
+                    except OSError as e:
+                        print(f"Could not save near-duplicate index: {e}")
+
+        self._saver = stop
+        threading.Thread(target=run, name='near-duplicate-saver', daemon=True).start()
+
+    def stop_autosave(self):
+        if self._saver is not None:
+            self._saver.set()
+            self._saver = None
+
+    def stats(self):
+        """Return index counters."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.rejections
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_entries,
+                'threshold': self.threshold,
+                'num_perm': self.num_perm,
+                'bands': self.bands,
+                'hits': self.hits,
+                'misses': self.misses,
+                'rejections': self.rejections,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
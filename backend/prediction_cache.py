@@ -0,0 +1,103 @@
+"""
+In-process cache of prediction results for repeated job postings.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of (prediction, confidence, indicators) results with a TTL.
+
+    Entries are keyed by a hash of the normalized posting text. The cache is
+    tied to a model generation, the version of the model that scored them
+    (ModelManager's active.version): looking up entries for a different
+    generation (i.e. after the model was reloaded) drops everything cached so far.
+    """
+
+    def __init__(self, max_size=10000, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(job_description):
+        """
+        Hash a posting for lookup.
+
+        Every prediction step lowercases the text first, so postings that only
+        differ in case or surrounding whitespace get the same result.
+        """
+        normalized = job_description.strip().lower()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def get(self, key, generation):
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            self._check_generation(generation)
+
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        prediction, confidence, indicators = entry[1]
+        return prediction, confidence, [dict(ind) for ind in indicators]
+
+    def put(self, key, generation, result):
+        """Store a prediction result, evicting the least recently used entry if full."""
+        prediction, confidence, indicators = result
+        value = (prediction, confidence, [dict(ind) for ind in indicators])
+
+        with self._lock:
+            if self._generation is not None and generation != self._generation:
+                # Scored by a model that has been replaced since; do not keep it
+                return
+
+            self._generation = generation
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return cache counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _check_generation(self, generation):
+        # Caller holds the lock
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
@@ -0,0 +1,208 @@
+"""
+Pre-fork multi-worker launcher for the JobVision API.
+
+The parent process imports backend.app, which loads NLTK data and the model,
+warms the predictor with a few predictions and binds the listening socket.
+It then forks N workers that inherit the already loaded model and accept
+connections on the shared socket. Memory pages of the model stay shared
+copy-on-write until a worker writes to them; gc.freeze() keeps the garbage
+collector from touching (and so copying) the objects loaded before the fork.
+
+The parent restarts workers that exit. SIGHUP replaces the workers one by one
+(each old worker finishes its in-flight requests first); SIGTERM or SIGINT
+stops them all gracefully.
+
+Usage: python backend/prefork.py [--workers 4] [--port 5000]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Seconds a worker may take to finish in-flight requests before it is killed
+GRACEFUL_TIMEOUT = 30
+
+# Postings used to warm the predictor before forking
+WARMUP_POSTINGS = [
+    'Senior software engineer with 5 years of experience. Salary range and benefits.',
+    'Work from home, no experience required! Get paid today, upfront fee of $99.',
+]
+
+# Intervals of the API's background threads, with the defaults of backend.app
+THREAD_INTERVALS = {
+    'JOBVISION_MODEL_POLL_SECONDS': '10',
+    'JOBVISION_FEEDBACK_UPDATE_SECONDS': '300',
+    'JOBVISION_NEAR_DUP_SAVE_SECONDS': '60',
+}
+
+def load_app():
+    """Import the API with everything the workers should share, and warm it up."""
+    # Threads do not survive fork, so the model watcher, the feedback updater
+    # and the near-duplicate saver are started per worker (the updater locks,
+    # so one runs at a time; each worker has its own near-duplicate index)
+    intervals = {name: os.environ.get(name, default) for name, default in THREAD_INTERVALS.items()}
+    os.environ.update({name: '0' for name in intervals})
+    from backend import app as api
+    os.environ.update(intervals)
+
+    # Call the predictor directly: the micro-batcher thread must start in the workers
+    predictor = api.model_manager.active.predictor
+    predictor.predict_batch(WARMUP_POSTINGS)
+    for text in WARMUP_POSTINGS:
+        predictor.predict(text)
+
+    return api, {name: float(value) for name, value in intervals.items()}
+
+def bind_socket(host, port, backlog=2048):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def run_worker(api, sock, host, port, intervals):
+    """Serve on the inherited socket until SIGTERM/SIGINT, then drain and exit."""
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, api.app, threaded=True, fd=sock.fileno())
+    # Let server_close() wait for in-flight request threads
+    server.daemon_threads = False
+    server.block_on_close = True
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever, so it cannot run in this thread
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+    api.model_manager.start_watcher(intervals['JOBVISION_MODEL_POLL_SECONDS'])
+    api.feedback_updater.start(intervals['JOBVISION_FEEDBACK_UPDATE_SECONDS'])
+    if api.near_duplicate_index is not None:
+        api.near_duplicate_index.start_autosave(api.NEAR_DUP_PATH,
+                                                intervals['JOBVISION_NEAR_DUP_SAVE_SECONDS'])
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    # os._exit skips atexit handlers
+    api.save_near_duplicates()
+    os._exit(0)
+
+class Arbiter:
+    """Forks workers, restarts the ones that exit and handles restart/stop signals."""
+
+    def __init__(self, api, sock, host, port, workers, intervals):
+        self.api = api
+        self.sock = sock
+        self.host = host
+        self.port = port
+        self.num_workers = workers
+        self.intervals = intervals
+        self.workers = set()
+        self.stopping = False
+        self.reload_requested = False
+
+    def spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(self.api, self.sock, self.host, self.port, self.intervals)
+            finally:
+                os._exit(1)
+        self.workers.add(pid)
+        return pid
+
+    def stop_worker(self, pid, timeout=GRACEFUL_TIMEOUT):
+        """Ask one worker to finish its requests and wait for it to exit."""
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if done:
+                break
+            time.sleep(0.05)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.discard(pid)
+
+    def rolling_restart(self):
+        """Replace every worker, one at a time, without closing the socket."""
+        for pid in list(self.workers):
+            self.spawn()
+            self.stop_worker(pid)
+        print(f"Restarted {self.num_workers} workers")
+
+    def run(self):
+        signal.signal(signal.SIGHUP, lambda signum, frame: setattr(self, 'reload_requested', True))
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, 'stopping', True))
+        signal.signal(signal.SIGINT, lambda signum, frame: setattr(self, 'stopping', True))
+
+        for _ in range(self.num_workers):
+            self.spawn()
+        print(f"✅ {self.num_workers} workers serving on http://{self.host}:{self.port} "
+              f"(parent pid {os.getpid()})", flush=True)
+
+        while not self.stopping:
+            if self.reload_requested:
+                self.reload_requested = False
+                self.rolling_restart()
+
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = 0, 0
+
+            if pid and pid in self.workers:
+                self.workers.discard(pid)
+                print(f"Worker {pid} exited with status {status}, starting a new one")
+                time.sleep(0.1)
+                self.spawn()
+            elif not pid:
+                time.sleep(0.2)
+
+        print("Stopping workers...")
+        for pid in list(self.workers):
+            os.kill(pid, signal.SIGTERM)
+        for pid in list(self.workers):
+            self.stop_worker(pid)
+
+def main():
+    parser = argparse.ArgumentParser(description='Pre-fork multi-worker launcher for the JobVision API.')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    api, intervals = load_app()
+    sock = bind_socket(args.host, args.port)
+    print(f"Model loaded and warmed in {time.perf_counter() - start:.2f}s")
+
+    # Move everything loaded so far out of the collector's reach, so workers
+    # do not copy those pages just by running a collection
+    gc.collect()
+    gc.freeze()
+
+    Arbiter(api, sock, args.host, args.port, args.workers, intervals).run()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+Shared test fixtures.
+
+Tests that need the ML path train a small model on data/fake_job_postings.csv
+instead of relying on the committed model files, so they run against the
+installed numpy/scikit-learn and never silently fall back to the rules.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'fake_job_postings.csv')
+
+def train_fixture_model(model_path):
+    """Train a model on the sample data and save it (pickles, artifact, holdout.json) to model_path."""
+    import pandas as pd
+    from ml_model.trainer import ModelTrainer
+    
+    trainer = ModelTrainer()
+    trainer.train(pd.read_csv(DATA_FILE))
+    trainer.save_model(str(model_path))
+    return trainer
+
+@pytest.fixture(scope='session')
+def model_dir(tmp_path_factory):
+    """Directory of a model trained once per test session."""
+    path = tmp_path_factory.mktemp('model')
+    train_fixture_model(path)
+    return str(path)
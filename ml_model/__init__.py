@@ -1,6 +1,13 @@
 """ML Model Package"""
 
 from .predictor import JobPredictor
-from .trainer import ModelTrainer, DataPreprocessor
+from .resources import MissingResourceError, prepare
 
-__all__ = ['JobPredictor', 'ModelTrainer', 'DataPreprocessor']
+__all__ = ['JobPredictor', 'ModelTrainer', 'DataPreprocessor', 'MissingResourceError', 'prepare']
+
+def __getattr__(name):
+    # The trainer pulls in pandas and sklearn, which serving does not need
+    if name in ('ModelTrainer', 'DataPreprocessor'):
+        from . import trainer
+        return getattr(trainer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
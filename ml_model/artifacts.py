@@ -0,0 +1,279 @@
+"""
+Versioned, memory-mappable artifact format for the TF-IDF + linear model.
+
+Instead of pickled sklearn objects, a model directory holds plain arrays:
+
+    artifact.json     format name/version, classes, estimator parameters and
+                      the tokenizer mode the training text was preprocessed with
+    coef.npy          classifier coefficients, shape (1, n_features)
+    intercept.npy     classifier intercept, shape (1,)
+    idf.npy           TF-IDF idf weights, shape (n_features,)
+    term_weights.npy  idf * coef per term, used by the fused scorer
+    vocabulary.txt    one term per line, line number = feature column
+
+Compressed models (ModelTrainer.compress) may store coef.npy, idf.npy and
+term_weights.npy as float32, or coef.npy and term_weights.npy as int8 with a
+scale per array in the manifest; quantized artifacts are format version 2.
+
+The .npy files are opened with mmap, so worker processes scoring with the
+fused scorer (ml_model.scorer) share the same physical pages, and the files
+do not depend on the sklearn version that trained the model. load_artifact
+shares the coefficients the same way, but sklearn copies idf into a sparse
+diagonal matrix of its own when it is assigned to the vectorizer.
+
+Convert existing pickles with:
+
+    python -m ml_model.artifacts models/
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+
+ARTIFACT_FORMAT = 'jobvision-linear'
+ARTIFACT_VERSION = 1
+# Written for int8-quantized weights, which version 1 readers would misread
+QUANTIZED_ARTIFACT_VERSION = 2
+SUPPORTED_VERSIONS = (ARTIFACT_VERSION, QUANTIZED_ARTIFACT_VERSION)
+
+# Storage types for the weight arrays
+WEIGHTS_DTYPES = ('float64', 'float32', 'int8')
+
+MANIFEST_FILE = 'artifact.json'
+COEF_FILE = 'coef.npy'
+INTERCEPT_FILE = 'intercept.npy'
+IDF_FILE = 'idf.npy'
+TERM_WEIGHTS_FILE = 'term_weights.npy'
+VOCABULARY_FILE = 'vocabulary.txt'
+
+class ArtifactError(ValueError):
+    """Raised when a model directory does not hold a usable array artifact."""
+
+def has_artifact(model_path):
+    """Return True if model_path contains an array artifact."""
+    return os.path.exists(os.path.join(model_path, MANIFEST_FILE))
+
+def remove_artifact(model_path):
+    """Delete the array artifact files in model_path, if any."""
+    # Manifest first, so a half-removed directory is never mistaken for an artifact
+    for name in (MANIFEST_FILE, COEF_FILE, INTERCEPT_FILE, IDF_FILE,
+                 TERM_WEIGHTS_FILE, VOCABULARY_FILE):
+        path = os.path.join(model_path, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+def _json_params(params, name):
+    """Keep estimator parameters that can round-trip through JSON."""
+    result = {}
+    for key, value in params.items():
+        if key == 'dtype':
+            result[key] = np.dtype(value).name
+        elif isinstance(value, tuple):
+            result[key] = list(value)
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            result[key] = value
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            result[key] = value
+        else:
+            raise ArtifactError(f"{name} parameter {key!r} cannot be exported: {value!r}")
+    return result
+
+def quantize(values):
+    """Symmetric int8 quantization; returns (int8 array, scale) with values ~= q * scale."""
+    values = np.asarray(values, dtype=np.float64)
+    peak = float(np.abs(values).max()) if values.size else 0.0
+    scale = peak / 127 if peak > 0 else 1.0
+    return np.clip(np.rint(values / scale), -127, 127).astype(np.int8), scale
+
+def save_artifact(model, vectorizer, model_path, weights_dtype='float64', tokenizer=None):
+    """
+    Write a fitted TfidfVectorizer + binary linear classifier as an array artifact.
+
+    weights_dtype is 'float64' (as fitted), 'float32' or 'int8' (coefficients
+    and term weights quantized, idf stored as float32). tokenizer is the
+    tokenizer mode the training text was preprocessed with, recorded so the
+    model is served with the same one (see resolve_tokenizer).
+    """
+    if model.coef_.shape[0] != 1:
+        raise ArtifactError("Only binary linear classifiers can be exported")
+    if weights_dtype not in WEIGHTS_DTYPES:
+        raise ArtifactError(f"Unsupported weights dtype: {weights_dtype!r}")
+
+    os.makedirs(model_path, exist_ok=True)
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+    if any('\n' in term for term in terms):
+        raise ArtifactError("Vocabulary terms cannot contain newlines")
+
+    vectorizer_params = dict(vectorizer.get_params())
+    vectorizer_params.pop('vocabulary', None)
+
+    coef = np.asarray(model.coef_)
+    idf = np.asarray(vectorizer.idf_)
+    term_weights = idf * coef[0]
+    quantization = None
+    if weights_dtype == 'float32':
+        coef, idf, term_weights = (a.astype(np.float32) for a in (coef, idf, term_weights))
+    elif weights_dtype == 'int8':
+        coef, coef_scale = quantize(coef)
+        term_weights, term_weights_scale = quantize(term_weights)
+        idf = idf.astype(np.float32)
+        quantization = {'coef_scale': coef_scale, 'term_weights_scale': term_weights_scale}
+
+    np.save(os.path.join(model_path, COEF_FILE), np.ascontiguousarray(coef))
+    np.save(os.path.join(model_path, INTERCEPT_FILE), np.ascontiguousarray(model.intercept_))
+    np.save(os.path.join(model_path, IDF_FILE), np.ascontiguousarray(idf))
+    np.save(os.path.join(model_path, TERM_WEIGHTS_FILE), np.ascontiguousarray(term_weights))
+
+    with open(os.path.join(model_path, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(terms))
+
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_VERSION,
+        'n_features': len(terms),
+        'classes': [value.item() if hasattr(value, 'item') else value
+                    for value in model.classes_],
+        'model_class': type(model).__name__,
+        'model_params': _json_params(model.get_params(), 'model'),
+        'vectorizer_params': _json_params(vectorizer_params, 'vectorizer'),
+    }
+    if tokenizer is not None:
+        manifest['tokenizer'] = tokenizer
+    if quantization is not None:
+        manifest['format_version'] = QUANTIZED_ARTIFACT_VERSION
+        manifest['quantization'] = quantization
+
+    # Manifest last, so a directory with a manifest always has complete arrays
+    with open(os.path.join(model_path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+def resolve_tokenizer(model_path, tokenizer=None):
+    """
+    Tokenizer mode to preprocess text for the model in model_path with.
+
+    Without an explicit tokenizer this is the mode recorded in the artifact
+    manifest, or 'nltk' for models that have none recorded (older artifacts,
+    pickles and hashing models). An explicit mode that differs from the
+    recorded one is used, with a warning.
+    """
+    recorded = None
+    if has_artifact(model_path):
+        try:
+            with open(os.path.join(model_path, MANIFEST_FILE)) as f:
+                recorded = json.load(f).get('tokenizer')
+        except (OSError, ValueError):
+            pass
+
+    if tokenizer is None:
+        return recorded or 'nltk'
+    if recorded is not None and tokenizer != recorded:
+        print(f"Warning: model in {model_path} was trained with the {recorded!r} tokenizer, "
+              f"preprocessing with {tokenizer!r}")
+    return tokenizer
+
+def load_arrays(model_path, mmap=True):
+    """
+    Load the raw artifact contents.
+
+    Returns:
+        dict with 'manifest', 'coef', 'intercept', 'idf', 'term_weights'
+        (None for artifacts written without them), 'vocabulary' (a
+        term -> column dict) and 'coef_scale' / 'term_weights_scale' (1.0
+        unless the arrays are int8). Arrays are read-only memory maps when
+        mmap=True.
+    """
+    with open(os.path.join(model_path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ArtifactError(f"Unknown artifact format: {manifest.get('format')!r}")
+    if manifest.get('format_version') not in SUPPORTED_VERSIONS:
+        raise ArtifactError(
+            f"Unsupported artifact version {manifest.get('format_version')!r} "
+            f"(this code reads versions {', '.join(map(str, SUPPORTED_VERSIONS))})"
+        )
+
+    mmap_mode = 'r' if mmap else None
+    coef = np.load(os.path.join(model_path, COEF_FILE), mmap_mode=mmap_mode)
+    intercept = np.load(os.path.join(model_path, INTERCEPT_FILE), mmap_mode=mmap_mode)
+    idf = np.load(os.path.join(model_path, IDF_FILE), mmap_mode=mmap_mode)
+
+    term_weights_file = os.path.join(model_path, TERM_WEIGHTS_FILE)
+    term_weights = None
+    if os.path.exists(term_weights_file):
+        term_weights = np.load(term_weights_file, mmap_mode=mmap_mode)
+
+    with open(os.path.join(model_path, VOCABULARY_FILE), encoding='utf-8') as f:
+        terms = f.read().split('\n')
+    vocabulary = {term: column for column, term in enumerate(terms)}
+
+    n_features = manifest['n_features']
+    if not (len(vocabulary) == idf.shape[0] == coef.shape[1] == n_features):
+        raise ArtifactError("Artifact arrays and vocabulary sizes do not match")
+
+    return {
+        'manifest': manifest,
+        'coef': coef,
+        'intercept': intercept,
+        'idf': idf,
+        'term_weights': term_weights,
+        'vocabulary': vocabulary,
+        'coef_scale': manifest.get('quantization', {}).get('coef_scale', 1.0),
+        'term_weights_scale': manifest.get('quantization', {}).get('term_weights_scale', 1.0),
+    }
+
+def load_artifact(model_path, mmap=True):
+    """
+    Rebuild (model, vectorizer) sklearn objects from an array artifact.
+
+    coef_ and intercept_ are the memory-mapped arrays (unless int8, which is
+    dequantized into a copy); the vectorizer keeps a private copy of idf.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    arrays = load_arrays(model_path, mmap=mmap)
+    manifest = arrays['manifest']
+
+    if manifest['model_class'] != 'LogisticRegression':
+        raise ArtifactError(f"Unsupported model class: {manifest['model_class']!r}")
+
+    vectorizer_params = dict(manifest['vectorizer_params'])
+    vectorizer_params['dtype'] = np.dtype(vectorizer_params['dtype']).type
+    vectorizer_params['ngram_range'] = tuple(vectorizer_params['ngram_range'])
+
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    vectorizer.vocabulary_ = arrays['vocabulary']
+    vectorizer.idf_ = arrays['idf']
+
+    model = LogisticRegression(**manifest['model_params'])
+    model.classes_ = np.array(manifest['classes'])
+    model.coef_ = arrays['coef']
+    if model.coef_.dtype == np.int8:
+        model.coef_ = model.coef_.astype(np.float32) * np.float32(arrays['coef_scale'])
+    model.intercept_ = arrays['intercept']
+    model.n_features_in_ = manifest['n_features']
+
+    return model, vectorizer
+
+def convert_pickles(model_path):
+    """Write an array artifact next to existing model.pkl / vectorizer.pkl files."""
+    with open(os.path.join(model_path, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+
+    with open(os.path.join(model_path, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+
+    save_artifact(model, vectorizer, model_path)
+
+if __name__ == '__main__':
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'models/'
+    convert_pickles(path)
+    print(f"Array artifact written to {path}")
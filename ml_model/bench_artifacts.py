@@ -0,0 +1,113 @@
+"""
+Load-time and memory benchmark: pickle vs memory-mapped array artifact.
+
+Starts N worker processes that each load the model from the same directory,
+keeps them alive together, and reports per-worker load time and memory. PSS
+(proportional set size) splits shared pages between the processes mapping
+them, so it shows how much the mmapped arrays are actually shared.
+
+The model directory must contain both model.pkl/vectorizer.pkl and an array
+artifact (run `python -m ml_model.artifacts <dir>` first).
+
+Usage: python ml_model/bench_artifacts.py [--model-path models/] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = '''
+import json, os, pickle, sys, time
+sys.path.insert(0, {root!r})
+
+def memory():
+    """Memory counters of this process in kB (Linux only)."""
+    values = {{}}
+    for name in ('/proc/self/status', '/proc/self/smaps_rollup'):
+        try:
+            with open(name) as f:
+                for line in f:
+                    key, _, rest = line.partition(':')
+                    if key in ('VmRSS', 'RssAnon', 'RssFile', 'Pss'):
+                        values[key] = int(rest.split()[0])
+        except OSError:
+            pass
+    return values
+
+import numpy, sklearn.linear_model, sklearn.feature_extraction.text
+from ml_model import artifacts
+
+before = memory()
+start = time.perf_counter()
+if {mode!r} == 'pickle':
+    with open(os.path.join({path!r}, 'model.pkl'), 'rb') as f:
+        model = pickle.load(f)
+    with open(os.path.join({path!r}, 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    # Touch the weights as a prediction would
+    model.coef_.sum(), vectorizer.idf_.sum()
+else:
+    model, vectorizer = artifacts.load_artifact({path!r})
+    model.coef_.sum(), vectorizer.idf_.sum()
+elapsed = time.perf_counter() - start
+
+print(json.dumps({{'load_seconds': elapsed}}), flush=True)
+sys.stdin.readline()
+after = memory()
+print(json.dumps({{key: after.get(key, 0) - before.get(key, 0) for key in after}}), flush=True)
+'''
+
+
+def run_workers(mode, model_path, workers):
+    """Start workers together, collect load times and memory while all are alive."""
+    code = WORKER.format(root=ROOT, mode=mode, path=os.path.abspath(model_path))
+    processes = [
+        subprocess.Popen([sys.executable, '-c', code], stdin=subprocess.PIPE,
+                         stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+
+    loads = [json.loads(process.stdout.readline())['load_seconds'] for process in processes]
+
+    memory = []
+    for process in processes:
+        process.stdin.write('measure\n')
+        process.stdin.flush()
+        memory.append(json.loads(process.stdout.readline()))
+
+    for process in processes:
+        process.wait()
+
+    return loads, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model-path', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"{'Format':<10}{'Load median (ms)':>18}{'RSS delta (kB)':>16}"
+          f"{'Anon delta (kB)':>16}{'PSS delta (kB)':>16}")
+    print("=" * 72)
+
+    for mode in ('pickle', 'artifact'):
+        loads, memory = run_workers(mode, args.model_path, args.workers)
+        rss = statistics.mean(item.get('VmRSS', 0) for item in memory)
+        anon = statistics.mean(item.get('RssAnon', 0) for item in memory)
+        pss = statistics.mean(item.get('Pss', 0) for item in memory)
+        print(f"{mode:<10}{statistics.median(loads) * 1000:>18.2f}{rss:>16.0f}"
+              f"{anon:>16.0f}{pss:>16.0f}")
+
+    print("=" * 72)
+    print(f"Per-worker averages over {args.workers} concurrent workers.")
+
+
+if __name__ == '__main__':
+    main()
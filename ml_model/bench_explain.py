@@ -0,0 +1,153 @@
+"""
+Cost benchmark: linear term contributions vs perturbation-based explainers.
+
+Explains the same postings three ways:
+
+- contributions: JobPredictor.explain_batch, which reads tf-idf x coefficient
+  off the row that is scored (exact for the linear model)
+- occlusion: every distinct term is removed in turn and the posting rescored
+- LIME-style: --samples random subsets of the terms are rescored and a
+  weighted linear model is fitted to the probabilities
+
+The perturbation explainers rescore preprocessed text through the same
+vectorizer/scorer, so they do not pay for preprocessing every sample, which
+favours them. Reports the time per posting, the overhead of explain=true over
+a plain predict_batch, and how often the explainers agree on the top terms.
+
+Usage: python ml_model/bench_explain.py [--model-path models/] [--postings 100] [--samples 1000]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from ml_model.predictor import JobPredictor
+
+DATA_FILE = os.path.join(ROOT, 'data', 'fake_job_postings.csv')
+
+
+def load_postings(count):
+    with open(DATA_FILE, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    texts = [' '.join(row[col] for col in ('title', 'description', 'requirements'))
+             for row in rows]
+    return [text for text in texts if text.strip()][:count]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def fake_probability(predictor, processed_texts):
+    return predictor._predict_proba(processed_texts)[:, 1]
+
+
+def occlusion(predictor, processed, top_k):
+    """Top terms by the drop in fake probability when each one is removed."""
+    words = processed.split()
+    terms = sorted(set(words))
+    variants = [' '.join(word for word in words if word != term) for term in terms]
+    probs = fake_probability(predictor, [processed] + variants)
+    effects = probs[0] - probs[1:]
+    return {terms[j] for j in np.argsort(-np.abs(effects))[:top_k]}
+
+
+def lime(predictor, processed, top_k, samples, rng):
+    """Top terms by the weight of a locally fitted, proximity-weighted linear model."""
+    words = processed.split()
+    terms = sorted(set(words))
+    index = {term: j for j, term in enumerate(terms)}
+    positions = np.array([index[word] for word in words])
+
+    masks = rng.random((samples, len(terms))) < rng.random((samples, 1))
+    masks[0] = True
+    variants = [' '.join(np.array(words)[mask[positions]]) for mask in masks]
+    probs = fake_probability(predictor, variants)
+
+    # Exponential kernel on the cosine distance to the full posting, as LIME does
+    kept = masks.sum(axis=1) / len(terms)
+    weights = np.sqrt(np.exp(-((1 - np.sqrt(kept)) ** 2) / 0.25 ** 2))
+    design = np.column_stack([masks.astype(np.float64), np.ones(samples)])
+    ridge = np.eye(design.shape[1])
+    ridge[-1, -1] = 0.0
+    coef = np.linalg.solve((design * weights[:, None] ** 2).T @ design + ridge,
+                           (design * weights[:, None] ** 2).T @ probs)[:-1]
+    return {terms[j] for j in np.argsort(-np.abs(coef))[:top_k]}
+
+
+def top_terms(explanation, top_k):
+    terms = explanation['positive'] + explanation['negative']
+    terms.sort(key=lambda item: -abs(item['contribution']))
+    return {item['term'] for item in terms[:top_k]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model-path', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--postings', type=int, default=100)
+    parser.add_argument('--samples', type=int, default=1000,
+                        help='perturbed samples per posting for the LIME-style explainer')
+    parser.add_argument('--top-k', type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = JobPredictor(model_path=args.model_path)
+    if not predictor.model_available:
+        sys.exit(f"No model in {args.model_path}")
+
+    postings = load_postings(args.postings)
+    n = len(postings)
+    processed = [predictor.preprocess_text(text) for text in postings]
+    rng = np.random.default_rng(42)
+
+    # Warm up, then time the API paths with explain off and on
+    predictor.predict_batch(postings[:5])
+    predictor.explain_batch(postings[:5], args.top_k)
+    _, predict_seconds = timed(lambda: predictor.predict_batch(postings))
+    explained, explain_seconds = timed(lambda: predictor.explain_batch(postings, args.top_k))
+
+    _, score_seconds = timed(lambda: predictor._predict_proba(processed))
+    _, contribution_seconds = timed(lambda: predictor._term_contributions(processed))
+    occluded, occlusion_seconds = timed(
+        lambda: [occlusion(predictor, text, args.top_k) for text in processed])
+    limed, lime_seconds = timed(
+        lambda: [lime(predictor, text, args.top_k, args.samples, rng) for text in processed])
+
+    # Share of the top terms with a contribution that the other explainer also ranks on top
+    exact = [top_terms(explanation, args.top_k) for _, explanation in explained]
+
+    def agree(others):
+        shares = [len(a & b) / len(a) for a, b in zip(exact, others) if a]
+        return f'{np.mean(shares):.0%}' if shares else 'n/a'
+    agreement = {'occlusion': agree(occluded), 'lime': agree(limed)}
+
+    def per_posting(seconds):
+        return seconds / n * 1e6
+
+    print("=" * 78)
+    print(f"{'Explainer (' + str(n) + ' postings)':<40}{'us/posting':>12}{'vs contrib':>12}"
+          f"{'top-' + str(args.top_k) + ' agree':>14}")
+    print("=" * 78)
+    contribution = per_posting(contribution_seconds)
+    print(f"{'term contributions (preprocessed)':<40}{contribution:>12.1f}{'1x':>12}{'':>14}")
+    for name, seconds, key in (('occlusion (leave one term out)', occlusion_seconds, 'occlusion'),
+                               (f'LIME-style ({args.samples} samples)', lime_seconds, 'lime')):
+        cost = per_posting(seconds)
+        print(f"{name:<40}{cost:>12.1f}{cost / contribution:>11.0f}x{agreement[key]:>14}")
+    print("=" * 78)
+    print(f"Scoring preprocessed postings: {per_posting(score_seconds):.1f} us/posting")
+    print(f"predict_batch {per_posting(predict_seconds):.1f} us/posting, explain_batch "
+          f"{per_posting(explain_seconds):.1f} us/posting "
+          f"({explain_seconds / predict_seconds - 1:+.1%}, explain=true)")
+
+
+if __name__ == '__main__':
+    main()
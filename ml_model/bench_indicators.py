@@ -0,0 +1,91 @@
+"""
+Micro-benchmark for JobPredictor.extract_indicators.
+
+Compares the precompiled single-scan indicator engine against the original
+per-pattern re.search loop on short and long postings, and checks that both
+return exactly the same indicators.
+
+Usage: python ml_model/bench_indicators.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_model.predictor import FAKE_JOB_INDICATORS, JobPredictor
+
+SHORT_POSTINGS = {
+    'short / no indicators': 'Backend developer wanted for our Berlin office. Python and SQL.',
+    'short / scam': 'Easy money! No experience required, get paid today. Upfront fee $50.',
+    'short / real': 'Apply now. Degree in computer science and 3 years of experience. Salary range listed.',
+}
+
+PARAGRAPH = (
+    'Our engineering team builds data pipelines and internal tools used by '
+    'analysts across the company. You will design services, review code and '
+    'mentor junior engineers while working closely with product managers. '
+)
+
+LONG_POSTINGS = {
+    'long / no indicators': PARAGRAPH * 60,
+    'long / scam': PARAGRAPH * 60 + 'Work from home, no experience needed. Guaranteed income!',
+    'long / real': PARAGRAPH * 60 + 'Company website and salary range available. Benefits included.',
+}
+
+
+def legacy_extract_indicators(text):
+    """The original per-pattern implementation, kept as a reference."""
+    indicators = []
+    text_lower = text.lower()
+
+    for indicator_type in ('fake', 'real'):
+        for pattern in FAKE_JOB_INDICATORS[indicator_type]:
+            if re.search(pattern, text_lower):
+                match = re.search(pattern, text_lower)
+                if match:
+                    phrase = match.group(0)
+                    indicators.append({
+                        'type': indicator_type,
+                        'text': f'"{phrase}" detected'
+                    })
+
+    seen = set()
+    unique_indicators = []
+    for ind in indicators:
+        key = (ind['type'], ind['text'])
+        if key not in seen:
+            seen.add(key)
+            unique_indicators.append(ind)
+
+    return unique_indicators[:5]
+
+
+def bench(func, text, number):
+    """Return the best per-call time in microseconds."""
+    timings = timeit.repeat(lambda: func(text), number=number, repeat=5)
+    return min(timings) / number * 1e6
+
+
+def main():
+    predictor = JobPredictor()
+
+    print("=" * 70)
+    print(f"{'Posting':<24}{'Chars':>8}{'Legacy (us)':>14}{'Compiled (us)':>15}{'Speedup':>9}")
+    print("=" * 70)
+
+    for postings, number in ((SHORT_POSTINGS, 2000), (LONG_POSTINGS, 200)):
+        for name, text in postings.items():
+            assert predictor.extract_indicators(text) == legacy_extract_indicators(text), name
+
+            legacy = bench(legacy_extract_indicators, text, number)
+            compiled = bench(predictor.extract_indicators, text, number)
+            print(f"{name:<24}{len(text):>8}{legacy:>14.1f}{compiled:>15.1f}{legacy / compiled:>8.1f}x")
+
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
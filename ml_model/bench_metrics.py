@@ -0,0 +1,77 @@
+"""
+Overhead benchmark for the prediction-path instrumentation.
+
+Times JobPredictor.predict and predict_batch on the same postings with
+metrics enabled and disabled, and prints the per-stage breakdown recorded
+while enabled.
+
+Usage: python ml_model/bench_metrics.py [--model-path models/] [--scorer auto|fused|sklearn]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ml_model.metrics import metrics
+from ml_model.predictor import JobPredictor
+
+POSTINGS = [
+    "Senior software engineer, 5 years of experience with Python and AWS. "
+    "Salary range $150k-$200k, benefits, apply at careers.example.com.",
+    "Work from home, no experience required! Get paid today. Easy money, "
+    "just send the upfront fee of $99 to start.",
+    "Customer service representative answering phone and email inquiries. "
+    "High school diploma required. Detailed job description available.",
+]
+
+
+def bench(func, number):
+    """Best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model-path', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--scorer', default='auto', choices=['auto', 'fused', 'sklearn'])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = JobPredictor(model_path=args.model_path, scorer=args.scorer)
+    batch = POSTINGS * 100
+
+    def single():
+        for text in POSTINGS:
+            predictor.predict(text)
+
+    rows = []
+    for name, func, number, items in (('predict', single, 200, len(POSTINGS)),
+                                      ('predict_batch (300)', lambda: predictor.predict_batch(batch), 5, len(batch))):
+        # Alternate the two modes so drift in machine load affects both equally
+        timings = {False: float('inf'), True: float('inf')}
+        for _ in range(args.rounds):
+            for enabled in (False, True):
+                metrics.set_enabled(enabled)
+                timings[enabled] = min(timings[enabled], bench(func, number) / items)
+        rows.append((name, timings[False], timings[True]))
+
+    print("\n" + "=" * 62)
+    print(f"{'Call':<22}{'off (us/item)':>14}{'on (us/item)':>14}{'Overhead':>12}")
+    print("=" * 62)
+    for name, off, on in rows:
+        print(f"{name:<22}{off:>14.1f}{on:>14.1f}{(on - off) / off * 100:>11.1f}%")
+    print("=" * 62)
+
+    print("\nStage means while enabled:")
+    for (name, labels), histogram in sorted(metrics._histograms.items()):
+        if name == 'stage_seconds' and histogram.count:
+            stage = dict(labels)['stage']
+            print(f"  {stage:<20}{histogram.sum / histogram.count * 1e6:>10.1f} us"
+                  f"  ({histogram.count} calls)")
+
+if __name__ == '__main__':
+    main()
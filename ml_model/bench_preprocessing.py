@@ -0,0 +1,65 @@
+"""
+Scaling benchmark for parallel training-time preprocessing.
+
+Replicates the training CSV to the requested number of rows and times
+DataPreprocessor.preprocess_dataframe with 1, 2, 4 and 8 workers, checking
+that every run returns the same rows in the same order.
+
+Usage: python ml_model/bench_preprocessing.py [--rows 50000] [--tokenizer nltk|fast]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from ml_model.trainer import DataPreprocessor
+
+DATA_FILE = os.path.join(ROOT, 'data', 'fake_job_postings.csv')
+TEXT_COLUMNS = ['title', 'description', 'requirements']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_FILE)
+    df = pd.concat([df] * (args.rows // len(df) + 1), ignore_index=True).iloc[:args.rows]
+
+    preprocessor = DataPreprocessor(tokenizer=args.tokenizer)
+    print(f"{len(df)} rows, {os.cpu_count()} CPUs, tokenizer={args.tokenizer}\n")
+
+    baseline = None
+    reference = None
+    rows = []
+    for n_jobs in args.workers:
+        start = time.perf_counter()
+        result = preprocessor.preprocess_dataframe(df, TEXT_COLUMNS, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference = result
+            baseline = elapsed
+        else:
+            assert result[TEXT_COLUMNS].equals(reference[TEXT_COLUMNS]), n_jobs
+
+        rows.append((n_jobs, elapsed, baseline / elapsed))
+
+    print("\n" + "=" * 50)
+    print(f"{'Workers':>8}{'Seconds':>12}{'Rows/s':>14}{'Speedup':>12}")
+    print("=" * 50)
+    for n_jobs, elapsed, speedup in rows:
+        print(f"{n_jobs:>8}{elapsed:>12.2f}{len(df) / elapsed:>14.0f}{speedup:>11.2f}x")
+    print("=" * 50)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Latency benchmark: fused linear scorer vs sklearn vectorizer + predict_proba.
+
+Both paths score the same preprocessed postings from a model directory that
+holds an array artifact. The benchmark checks that the probabilities agree,
+times single-posting and batch scoring, and verifies in a fresh interpreter
+that the fused path never imports sklearn.
+
+Usage: python ml_model/bench_scorer.py [--model-path models/]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from ml_model import artifacts
+from ml_model.scorer import LinearScorer
+
+DATA_FILE = os.path.join(ROOT, 'data', 'fake_job_postings.csv')
+
+SKLEARN_CHECK = '''
+import sys
+sys.path.insert(0, {root!r})
+from ml_model.scorer import LinearScorer
+scorer = LinearScorer.from_artifact({path!r})
+scorer.predict_proba(['software engineer salary benefit'])
+print('sklearn' in sys.modules)
+'''
+
+
+def load_postings():
+    """Lowercased, letters-only postings of increasing length from the training data."""
+    import csv
+    import re
+
+    with open(DATA_FILE, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    texts = [' '.join(row[col] for col in ('title', 'description', 'requirements'))
+             for row in rows]
+    words = re.sub(r'[^a-z\s]', '', ' '.join(texts).lower()).split()
+
+    return {
+        'short (20 words)': ' '.join(words[:20]),
+        'medium (200 words)': ' '.join(words[:200]),
+        'long (2000 words)': ' '.join((words * 10)[:2000]),
+    }
+
+
+def bench(func, number):
+    """Best per-call time in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model-path', default=os.path.join(ROOT, 'models'))
+    args = parser.parse_args()
+
+    model, vectorizer = artifacts.load_artifact(args.model_path)
+    scorer = LinearScorer.from_artifact(args.model_path)
+    postings = load_postings()
+
+    def sklearn_proba(texts):
+        return model.predict_proba(vectorizer.transform(texts))
+
+    print("=" * 70)
+    print(f"{'Posting':<22}{'sklearn (us)':>14}{'fused (us)':>14}{'Speedup':>9}{'Max |diff|':>11}")
+    print("=" * 70)
+
+    for name, text in postings.items():
+        diff = np.abs(sklearn_proba([text]) - scorer.predict_proba([text])).max()
+        reference = bench(lambda: sklearn_proba([text]), 200)
+        fused = bench(lambda: scorer.predict_proba([text]), 200)
+        print(f"{name:<22}{reference:>14.1f}{fused:>14.1f}{reference / fused:>8.1f}x{diff:>11.1e}")
+
+    batch = list(postings.values()) * 100
+    diff = np.abs(sklearn_proba(batch) - scorer.predict_proba(batch)).max()
+    reference = bench(lambda: sklearn_proba(batch), 5) / len(batch)
+    fused = bench(lambda: scorer.predict_proba(batch), 5) / len(batch)
+    print(f"{'batch of 300 (per item)':<22}{reference:>14.1f}{fused:>14.1f}"
+          f"{reference / fused:>8.1f}x{diff:>11.1e}")
+    print("=" * 70)
+
+    code = SKLEARN_CHECK.format(root=ROOT, path=os.path.abspath(args.model_path))
+    imported = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    print(f"sklearn imported by fused scoring path: {imported}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Startup benchmark for the serving path.
+
+Measures, in fresh interpreter processes, how long `import ml_model` takes,
+which heavy libraries it pulls in, and how long `JobPredictor()` construction
+takes afterwards.
+
+Usage: python ml_model/bench_startup.py [--runs N] [--tokenizer nltk|fast]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import ml_model
+imported = time.perf_counter()
+heavy = [name for name in ('nltk', 'pandas', 'sklearn', 'numpy') if name in sys.modules]
+ml_model.JobPredictor(tokenizer={tokenizer!r})
+constructed = time.perf_counter()
+print(json.dumps({{
+    'import': imported - start,
+    'construct': constructed - imported,
+    'heavy_after_import': heavy,
+}}))
+'''
+
+
+def run_probe(tokenizer):
+    """Run one cold start in a new interpreter and return its timings."""
+    code = PROBE.format(root=ROOT, tokenizer=tokenizer)
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    args = parser.parse_args()
+
+    results = [run_probe(args.tokenizer) for _ in range(args.runs)]
+
+    print("=" * 60)
+    print(f"Cold start over {args.runs} runs (tokenizer={args.tokenizer})")
+    print("=" * 60)
+    for key, label in (('import', 'import ml_model'), ('construct', 'JobPredictor()')):
+        timings = [result[key] * 1000 for result in results]
+        print(f"{label:<20} median {statistics.median(timings):8.1f} ms   "
+              f"min {min(timings):8.1f} ms")
+    print(f"Heavy modules loaded by import: {results[0]['heavy_after_import'] or 'none'}")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+"""
+Reproducible performance benchmark suite for JobPredictor and ModelTrainer.
+
+Every case runs in a fresh interpreter so cold-start times and peak RSS are
+not polluted by earlier cases. Inputs are derived deterministically from
+data/fake_job_postings.csv, nothing is downloaded and everything runs on CPU.
+
+Measured:
+  predictor  cold construction time, single-predict p50/p95/p99 latency for
+             short/medium/long postings, batch throughput, peak RSS
+  trainer    train time and peak RSS for each dataset size
+
+Results are written as JSON. With --baseline, every metric is compared to a
+stored result file and the run exits with status 1 if any metric regressed by
+more than --threshold.
+
+Usage:
+  python ml_model/bench_suite.py --output bench.json
+  python ml_model/bench_suite.py --output bench.json --baseline baseline.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA_FILE = os.path.join(ROOT, 'data', 'fake_job_postings.csv')
+TEXT_COLUMNS = ['title', 'description', 'requirements']
+
+POSTING_LENGTHS = {'short': 20, 'medium': 200, 'long': 2000}
+
+# Metric name suffix -> whether larger values are better
+HIGHER_IS_BETTER = ('_per_s',)
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def load_postings():
+    """Raw postings of fixed word counts built from the training data."""
+    import pandas as pd
+
+    df = pd.read_csv(DATA_FILE)
+    words = ' '.join(df[TEXT_COLUMNS].fillna('').agg(' '.join, axis=1)).split()
+    return {name: ' '.join((words * (count // len(words) + 1))[:count])
+            for name, count in POSTING_LENGTHS.items()}
+
+
+def case_predictor(params):
+    """Cold construction, per-length latency percentiles and batch throughput."""
+    start = time.perf_counter()
+    from ml_model.predictor import JobPredictor
+    predictor = JobPredictor(model_path=params['model_path'], tokenizer=params['tokenizer'],
+                             scorer=params['scorer'])
+    results = {
+        'predictor.construct_ms': (time.perf_counter() - start) * 1000,
+        'predictor.model_available': int(predictor.model_available),
+    }
+
+    postings = load_postings()
+    for name, text in postings.items():
+        for _ in range(params['warmup']):
+            predictor.predict(text)
+
+        timings = []
+        for _ in range(params['iterations']):
+            start = time.perf_counter()
+            predictor.predict(text)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+
+        for label, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            results[f'predictor.{name}.{label}_ms'] = percentile(timings, fraction)
+
+    batch = [postings['medium']] * params['batch_size']
+    predictor.predict_batch(batch[:10])
+    start = time.perf_counter()
+    predictor.predict_batch(batch)
+    results['predictor.batch.postings_per_s'] = len(batch) / (time.perf_counter() - start)
+
+    results['predictor.peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def case_trainer(params):
+    """Train time and peak RSS on the first `rows` rows (replicated if needed)."""
+    import pandas as pd
+    from ml_model.trainer import ModelTrainer
+
+    df = pd.read_csv(DATA_FILE)
+    rows = params['rows']
+    df = pd.concat([df] * (rows // len(df) + 1), ignore_index=True).iloc[:rows]
+    baseline_rss = peak_rss_mb()
+
+    trainer = ModelTrainer(tokenizer=params['tokenizer'])
+    start = time.perf_counter()
+    trainer.train(df)
+    elapsed = time.perf_counter() - start
+
+    prefix = f'trainer.rows_{rows}'
+    return {
+        f'{prefix}.train_s': elapsed,
+        f'{prefix}.rows_per_s': rows / elapsed,
+        f'{prefix}.peak_rss_mb': peak_rss_mb(),
+        f'{prefix}.rss_growth_mb': peak_rss_mb() - baseline_rss,
+    }
+
+
+CASES = {'predictor': case_predictor, 'trainer': case_trainer}
+
+
+def run_case(name, params):
+    """Run one case in a new interpreter and return its metrics."""
+    command = [sys.executable, os.path.abspath(__file__), '--run-case', name,
+               '--params', json.dumps(params)]
+    output = subprocess.run(command, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(f"Benchmark case {name} failed:\n{output.stderr}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def environment():
+    """Machine and code details stored next to the results."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison table against a baseline.
+
+    A lower-is-better metric that grows from a baseline of 0 counts as a
+    regression whatever the threshold.
+
+    Returns:
+        Tuple of (regressed metric names, baseline metric names missing from
+        the current results).
+    """
+    regressions = []
+    missing = []
+
+    print("\n" + "=" * 84)
+    print(f"{'Metric':<44}{'Baseline':>12}{'Current':>12}{'Change':>9}  Status")
+    print("=" * 84)
+    for name in sorted(baseline):
+        if name.endswith('model_available'):
+            continue
+
+        old = baseline[name]
+        if name not in results:
+            missing.append(name)
+            print(f"{name:<44}{old:>12.3f}{'-':>12}{'-':>9}  MISSING")
+            continue
+
+        new = results[name]
+        if old:
+            change = (new - old) / old
+        else:
+            # No relative change exists from a zero baseline, so any move away
+            # from it is treated as exceeding the threshold
+            change = float('inf') if new > 0 else float('-inf') if new < 0 else 0.0
+        higher_is_better = name.endswith(HIGHER_IS_BETTER)
+        worse = -change if higher_is_better else change
+
+        status = ''
+        if worse > threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif worse < -threshold:
+            status = 'improved'
+        print(f"{name:<44}{old:>12.3f}{new:>12.3f}{change * 100:>8.1f}%  {status}")
+    print("=" * 84)
+
+    return regressions, missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--baseline', help='compare against a stored results JSON')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative change counted as a regression (default 0.2 = 20%%)')
+    parser.add_argument('--cases', nargs='+', default=list(CASES), choices=list(CASES))
+    parser.add_argument('--model-path', default=os.path.join(ROOT, 'models'))
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--scorer', default='auto', choices=['auto', 'fused', 'sklearn'])
+    parser.add_argument('--iterations', type=int, default=200,
+                        help='timed predictions per posting length')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--train-rows', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--params', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        # Child process: run a single case and print its metrics
+        print(json.dumps(CASES[args.run_case](json.loads(args.params))))
+        return
+
+    results = {}
+    if 'predictor' in args.cases:
+        print("Benchmarking JobPredictor...")
+        results.update(run_case('predictor', {
+            'model_path': args.model_path,
+            'tokenizer': args.tokenizer,
+            'scorer': args.scorer,
+            'iterations': args.iterations,
+            'warmup': 10,
+            'batch_size': args.batch_size,
+        }))
+
+    if 'trainer' in args.cases:
+        for rows in args.train_rows:
+            print(f"Benchmarking ModelTrainer on {rows} rows...")
+            results.update(run_case('trainer', {'rows': rows, 'tokenizer': args.tokenizer}))
+
+    report = {
+        'environment': environment(),
+        'config': {key: value for key, value in vars(args).items()
+                   if key not in ('output', 'baseline', 'run_case', 'params')},
+        'results': results,
+    }
+
+    print("\n" + "=" * 60)
+    for name, value in sorted(results.items()):
+        print(f"{name:<44}{value:>14.3f}")
+    print("=" * 60)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions, missing = compare(results, baseline['results'], args.threshold)
+        if missing:
+            print(f"{len(missing)} baseline metric(s) missing from this run: "
+                  f"{', '.join(missing)}")
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than "
+                  f"{args.threshold * 100:.0f}%: {', '.join(regressions)}")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Low-overhead latency histograms and counters for the prediction path.
+
+JobPredictor reports the time spent in each stage (clean_text, tokenize,
+lemmatize, vectorize, predict_proba, extract_indicators, ...) and counts ML
+predictions, rule-based predictions, fallbacks and errors into the shared
+`metrics` registry. The backend adds request counters and renders everything
+in the Prometheus text format at GET /api/metrics.
+
+Set JOBVISION_METRICS=0 (or call metrics.set_enabled(False)) to turn
+instrumentation off; the clock then returns 0.0 and observations are dropped
+without taking a lock.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds, from 10 microseconds to 1 second
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+)
+
+METRIC_PREFIX = 'jobvision_'
+
+HELP = {
+    'stage_seconds': 'Time spent in each prediction stage',
+    'request_seconds': 'Time spent handling API requests',
+    'predictions_total': 'Predictions by scoring path',
+    'fallbacks_total': 'ML predictions that fell back to rule-based scoring',
+    'errors_total': 'Errors by source',
+    'requests_total': 'API requests by endpoint and status',
+}
+
+def _no_clock():
+    return 0.0
+
+class Histogram:
+    """Fixed-bucket histogram; counts are stored per bucket and summed on render."""
+
+    def __init__(self, registry, buckets=LATENCY_BUCKETS):
+        self._registry = registry
+        self._lock = registry._lock
+        self.buckets = buckets
+        self.clear()
+
+    def clear(self):
+        # The last slot is the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """Record one value, unless the registry is disabled."""
+        if not self._registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self):
+        """Yield (upper bound label, cumulative count) pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield ('+Inf' if bound == float('inf') else repr(bound)), total
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._lock = registry._lock
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Add amount, unless the registry is disabled."""
+        if not self._registry.enabled:
+            return
+        with self._lock:
+            self.value += amount
+
+class Metrics:
+    """Registry of labelled histograms and counters."""
+
+    def __init__(self, enabled=True):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        """Turn instrumentation on or off."""
+        self.enabled = bool(enabled)
+        # Callers time stages with metrics.clock(), which is free when disabled
+        self.clock = time.perf_counter if self.enabled else _no_clock
+
+    def histogram(self, name, **labels):
+        """
+        Return the histogram name{labels}, creating it if needed.
+
+        Hot paths look their histograms up once and call observe() on them
+        directly, which skips the label lookup on every observation.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self)
+            return histogram
+
+    def observe(self, name, seconds, **labels):
+        """Record a duration in the histogram name{labels}."""
+        if self.enabled:
+            self.histogram(name, **labels).observe(seconds)
+
+    def counter(self, name, **labels):
+        """Return the counter name{labels}, creating it if needed."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = Counter(self)
+            return counter
+
+    def inc(self, name, amount=1, **labels):
+        """Increment the counter name{labels}."""
+        if self.enabled:
+            self.counter(name, **labels).inc(amount)
+
+    def reset(self):
+        """Drop all recorded values."""
+        with self._lock:
+            # Histograms are zeroed in place so handles held by callers stay valid
+            for histogram in self._histograms.values():
+                histogram.clear()
+            for counter in self._counters.values():
+                counter.value = 0
+
+    def render_prometheus(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {key: (list(h.cumulative()), h.sum, h.count)
+                          for key, h in self._histograms.items() if h.count}
+            counters = {key: c.value for key, c in self._counters.items()}
+
+        lines = []
+        for name in sorted({name for name, _ in histograms}):
+            full_name = METRIC_PREFIX + name
+            lines.append(f'# HELP {full_name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {full_name} histogram')
+            for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, cumulative in buckets:
+                    lines.append(f'{full_name}_bucket{_labels(labels + (("le", bound),))} {cumulative}')
+                lines.append(f'{full_name}_sum{_labels(labels)} {total!r}')
+                lines.append(f'{full_name}_count{_labels(labels)} {count}')
+
+        for name in sorted({name for name, _ in counters}):
+            full_name = METRIC_PREFIX + name
+            lines.append(f'# HELP {full_name} {HELP.get(name, name)}')
+            lines.append(f'# TYPE {full_name} counter')
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'{full_name}{_labels(labels)} {value}')
+
+        lines.append(f'# HELP {METRIC_PREFIX}metrics_enabled Whether instrumentation is on')
+        lines.append(f'# TYPE {METRIC_PREFIX}metrics_enabled gauge')
+        lines.append(f'{METRIC_PREFIX}metrics_enabled {int(self.enabled)}')
+        return '\n'.join(lines) + '\n'
+
+def _labels(labels):
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+# Registry shared by the predictor and the API
+metrics = Metrics(enabled=os.environ.get('JOBVISION_METRICS', '1') != '0')
@@ -0,0 +1,177 @@
+"""
+K-fold cross-validated grid search over vectorizer and classifier settings.
+
+The texts are preprocessed once. Then, for every vectorizer setting and
+fold, a TfidfVectorizer is fitted on the training part of the fold and both
+parts are vectorized; the sparse matrices are cached on disk. Every
+classifier setting is then fitted on the cached matrices, so a vectorizer is
+never refitted per classifier setting. Both stages run in parallel worker
+processes, one (setting, fold) task at a time.
+
+Used by ModelTrainer.grid_search and `python train_model.py --grid-search`.
+"""
+
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import confusion_matrix
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+
+from .trainer import _metrics_from_confusion
+
+# Defaults around the settings ModelTrainer uses (max_features=5000, max_df=0.8, min_df=2, C=1)
+VECTORIZER_GRID = {
+    'max_features': [5000, 20000],
+    'ngram_range': [(1, 1), (1, 2)],
+    'min_df': [2],
+    'max_df': [0.8],
+}
+CLASSIFIER_GRID = {
+    'C': [0.1, 1.0, 10.0],
+    'class_weight': [None, 'balanced'],
+}
+
+METRIC_NAMES = ['accuracy', 'precision', 'recall', 'f1']
+
+# Per-process copies of the last fold matrices a worker loaded
+_matrix_cache = {}
+
+def _fit_fold(task):
+    """Fit one fold's vectorizer and cache its train/test matrices; runs in a worker."""
+    vectorizer_index, fold, params, texts_path, train_index, cache_dir = task
+    texts = np.load(texts_path, allow_pickle=True)
+
+    start = time.perf_counter()
+    vectorizer = TfidfVectorizer(**params)
+    X_train = vectorizer.fit_transform(texts[train_index])
+    test_mask = np.ones(len(texts), dtype=bool)
+    test_mask[train_index] = False
+    X_test = vectorizer.transform(texts[test_mask])
+
+    prefix = os.path.join(cache_dir, f'v{vectorizer_index}-f{fold}')
+    sparse.save_npz(f'{prefix}-train.npz', X_train, compressed=False)
+    sparse.save_npz(f'{prefix}-test.npz', X_test, compressed=False)
+    return vectorizer_index, fold, prefix, time.perf_counter() - start
+
+def _load_fold(prefix):
+    if prefix not in _matrix_cache:
+        # Tasks arrive grouped by fold, so keeping one fold is enough
+        _matrix_cache.clear()
+        _matrix_cache[prefix] = (sparse.load_npz(f'{prefix}-train.npz').tocsr(),
+                                 sparse.load_npz(f'{prefix}-test.npz').tocsr())
+    return _matrix_cache[prefix]
+
+def _score_fold(task):
+    """Fit one classifier setting on cached fold matrices; runs in a worker."""
+    vectorizer_index, classifier_index, fold, params, prefix, y_train, y_test = task
+    X_train, X_test = _load_fold(prefix)
+
+    start = time.perf_counter()
+    model = LogisticRegression(max_iter=1000, random_state=42, **params)
+    model.fit(X_train, y_train)
+    confusion = confusion_matrix(y_test, model.predict(X_test), labels=[0, 1])
+    return vectorizer_index, classifier_index, fold, confusion, time.perf_counter() - start
+
+def grid_search(texts, y, vectorizer_grid=None, classifier_grid=None, n_folds=5, n_jobs=1,
+                scoring='f1', random_state=42):
+    """
+    Cross-validate every combination of vectorizer and classifier settings.
+
+    Args:
+        texts: preprocessed texts
+        y: 0/1 labels
+        vectorizer_grid: TfidfVectorizer parameter grid (sklearn ParameterGrid format)
+        classifier_grid: LogisticRegression parameter grid
+        n_jobs: worker processes (-1 = all cores)
+        scoring: metric the results are ranked by
+
+    Returns:
+        list: one dict per combination, best first, with 'vectorizer' and
+            'classifier' settings, mean 'metrics' (confusion_matrix summed
+            over folds), per-metric 'std' and the 'fit_seconds' spent
+
+    Raises:
+        ValueError: if scoring is not one of METRIC_NAMES
+    """
+    if scoring not in METRIC_NAMES:
+        raise ValueError(f"Unknown scoring metric: {scoring!r} (expected one of {METRIC_NAMES})")
+
+    vectorizer_settings = list(ParameterGrid(vectorizer_grid or VECTORIZER_GRID))
+    classifier_settings = list(ParameterGrid(classifier_grid or CLASSIFIER_GRID))
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    texts = np.asarray(texts, dtype=object)
+    y = np.asarray(y, dtype=np.int64)
+    folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True,
+                                 random_state=random_state).split(texts, y))
+
+    confusions = {}
+    seconds = {}
+    with tempfile.TemporaryDirectory(prefix='jobvision-cv-') as cache_dir, \
+            ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        # Workers read the texts from disk instead of receiving them once per task
+        texts_path = os.path.join(cache_dir, 'texts.npy')
+        np.save(texts_path, texts, allow_pickle=True)
+
+        start = time.perf_counter()
+        fit_tasks = [(v, fold, params, texts_path, train_index, cache_dir)
+                     for v, params in enumerate(vectorizer_settings)
+                     for fold, (train_index, _) in enumerate(folds)]
+        prefixes = {}
+        for v, fold, prefix, elapsed in executor.map(_fit_fold, fit_tasks):
+            prefixes[v, fold] = prefix
+            seconds[v] = seconds.get(v, 0.0) + elapsed
+        print(f"Fitted {len(fit_tasks)} fold vectorizers in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        score_tasks = [(v, c, fold, params, prefixes[v, fold], y[train_index], y[test_index])
+                       for v in range(len(vectorizer_settings))
+                       for fold, (train_index, test_index) in enumerate(folds)
+                       for c, params in enumerate(classifier_settings)]
+        for v, c, fold, confusion, elapsed in executor.map(_score_fold, score_tasks):
+            confusions.setdefault((v, c), []).append(confusion)
+            seconds[v, c] = seconds.get((v, c), 0.0) + elapsed
+        print(f"Fitted {len(score_tasks)} fold classifiers in {time.perf_counter() - start:.1f}s")
+
+    results = []
+    for (v, c), fold_confusions in confusions.items():
+        per_fold = [_metrics_from_confusion(confusion) for confusion in fold_confusions]
+        metrics = {name: float(np.mean([m[name] for m in per_fold])) for name in METRIC_NAMES}
+        metrics['confusion_matrix'] = np.sum(fold_confusions, axis=0).tolist()
+        results.append({
+            'vectorizer': vectorizer_settings[v],
+            'classifier': classifier_settings[c],
+            'metrics': metrics,
+            'std': {name: float(np.std([m[name] for m in per_fold])) for name in METRIC_NAMES},
+            # The vectorizer time is shared by every classifier setting
+            'fit_seconds': seconds[v] / len(classifier_settings) + seconds[v, c],
+        })
+
+    results.sort(key=lambda result: result['metrics'][scoring], reverse=True)
+    return results
+
+def _format_params(params):
+    return ', '.join(f'{key}={value}' for key, value in sorted(params.items()))
+
+def print_results(results, scoring='f1', top=None):
+    """Print the ranked results as a table."""
+    print("\n" + "=" * 100)
+    print(f"GRID SEARCH RESULTS (ranked by mean {scoring})")
+    print("=" * 100)
+    print(f"{'rank':>4}  {'f1':>13}  {'accuracy':>8}  {'precision':>9}  {'recall':>6}  "
+          f"{'fit s':>6}  settings")
+    print("-" * 100)
+    for rank, result in enumerate(results[:top], start=1):
+        metrics, std = result['metrics'], result['std']
+        print(f"{rank:>4}  {metrics['f1']:.4f}±{std['f1']:.4f}  {metrics['accuracy']:>8.4f}  "
+              f"{metrics['precision']:>9.4f}  {metrics['recall']:>6.4f}  "
+              f"{result['fit_seconds']:>6.1f}  "
+              f"{_format_params(result['vectorizer'])} | {_format_params(result['classifier'])}")
+    print("=" * 100)
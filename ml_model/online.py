@@ -0,0 +1,517 @@
+"""
+Incremental updates of the served model from moderator feedback.
+
+Labeled postings are appended to a JSON-lines feedback log. An
+OnlineUpdater periodically takes the records added since its last run and
+applies them to the active model with a few mini-batch gradient steps on the
+logistic loss. The vectorizer is left untouched, so the updated model still
+fits the served vocabulary, array artifact and fused scorer, and an update
+takes seconds instead of a full retrain.
+
+Each update is a candidate, published only if it passes the holdout check:
+
+- feedback records are split by a hash of their text; the holdout part is
+  never trained on (it is copied to a holdout log next to the feedback log)
+  and the candidate must not score it worse than the current model
+- the candidate may not lose more than max_accuracy_drop accuracy on the
+  rows of a reference CSV (the training data) that the base model was not
+  trained on, as recorded by ModelTrainer.save_model in holdout.json
+
+Published updates are ordinary versions (see ml_model.versions) that record
+their parent version, so rollback() re-activates the model they replaced.
+
+Run one update (or roll back) from the command line:
+
+    python -m ml_model.online --models-root models/ [--rollback]
+"""
+
+import copy
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from . import artifacts
+from .versions import CURRENT_FILE, activate_version, publish_version, resolve_model, version_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: only one process may run the updater
+    fcntl = None
+
+# Written into every version published by the updater
+UPDATE_FILE = 'online_update.json'
+
+LABELS = {'real': 0, 'fake': 1}
+
+class FeedbackLog:
+    """Append-only JSON-lines log of labeled postings, safe to share between processes."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, job_description, label, predicted=None, model_version=None):
+        """
+        Record one labeled posting.
+
+        label is 'fake' or 'real' (or 1 / 0); predicted is what the API said.
+        """
+        if isinstance(label, str):
+            label = LABELS.get(label)
+        if isinstance(label, bool) or label not in (0, 1):
+            raise ValueError("label must be 'fake' or 'real'")
+
+        record = {
+            'job_description': job_description,
+            'label': label,
+            'predicted': predicted,
+            'model_version': model_version,
+            'received_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        self.extend([record])
+
+    def extend(self, records):
+        """Append records as they are, in one write."""
+        data = ''.join(json.dumps(record) + '\n' for record in records).encode('utf-8')
+
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # One write on an O_APPEND descriptor, so lines of concurrent
+            # writers never interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    def read(self, offset=0):
+        """
+        Return (records, next offset) for the complete lines after byte offset.
+
+        A line still being written has no newline yet and is left for the
+        next read.
+        """
+        if not os.path.exists(self.path):
+            return [], offset
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        records = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+        return records, offset + end
+
+def in_holdout(text, holdout_fraction):
+    """Deterministically assign a feedback posting to the holdout set by its text."""
+    digest = hashlib.blake2b(text.strip().lower().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') < holdout_fraction * 2 ** 64
+
+def partial_fit_linear(model, X, y, learning_rate=0.5, epochs=5, batch_size=16, l2=1e-3,
+                       random_state=42):
+    """
+    Return a copy of a fitted binary linear classifier trained further on (X, y).
+
+    Runs mini-batch gradient descent on the logistic loss, starting from the
+    current coefficients. The l2 term pulls the weights towards the starting
+    model, so a small batch of feedback corrects it instead of replacing it.
+    Works for LogisticRegression and SGDClassifier alike; the result keeps
+    the class and parameters of the original.
+    """
+    if list(model.classes_) != [0, 1]:
+        raise ValueError(f"Expected classes [0, 1], got {list(model.classes_)}")
+
+    y = np.asarray(y, dtype=np.float64)
+    start = np.asarray(model.coef_[0], dtype=np.float64)
+    coef = start.copy()
+    intercept = float(model.intercept_[0])
+    rng = np.random.default_rng(random_state)
+
+    for _ in range(epochs):
+        order = rng.permutation(len(y))
+        for first in range(0, len(y), batch_size):
+            rows = order[first:first + batch_size]
+            X_batch = X[rows]
+            scores = np.asarray(X_batch @ coef).ravel() + intercept
+            error = 1.0 / (1.0 + np.exp(-scores)) - y[rows]
+
+            gradient = np.asarray(X_batch.T @ error).ravel() / len(rows) + l2 * (coef - start)
+            coef -= learning_rate * gradient
+            intercept -= learning_rate * error.mean()
+
+    updated = copy.deepcopy(model)
+    updated.coef_ = coef.reshape(1, -1).astype(model.coef_.dtype)
+    updated.intercept_ = np.array([intercept], dtype=model.intercept_.dtype)
+    return updated
+
+def _accuracy(model, X, y):
+    if not len(y):
+        return None
+    return float(np.mean(model.predict(X) == np.asarray(y)))
+
+def load_model(model_path):
+    """Load (model, vectorizer) from the pickles or the array artifact of a directory."""
+    model_file = os.path.join(model_path, 'model.pkl')
+    vectorizer_file = os.path.join(model_path, 'vectorizer.pkl')
+
+    if os.path.exists(model_file) and os.path.exists(vectorizer_file):
+        with open(model_file, 'rb') as f:
+            model = pickle.load(f)
+        with open(vectorizer_file, 'rb') as f:
+            vectorizer = pickle.load(f)
+        return model, vectorizer
+
+    if artifacts.has_artifact(model_path):
+        return artifacts.load_artifact(model_path)
+
+    raise FileNotFoundError(f"Model files not found in {model_path}")
+
+def load_holdout(model_path):
+    """The held-out training rows recorded with a model (see ModelTrainer.holdout), or None."""
+    from .trainer import HOLDOUT_FILE
+
+    holdout_file = os.path.join(model_path, HOLDOUT_FILE)
+    if not os.path.exists(holdout_file):
+        return None
+    with open(holdout_file) as f:
+        return json.load(f)
+
+def rollback(models_root):
+    """
+    Re-activate the version an online update replaced.
+
+    Returns:
+        str: the version that is now active
+    Raises:
+        ValueError: the active version was not published by the updater
+    """
+    version, model_path = resolve_model(models_root)
+    update_file = os.path.join(model_path, UPDATE_FILE)
+    if not os.path.exists(update_file):
+        raise ValueError(f"Active model version {version!r} is not an online update")
+
+    with open(update_file) as f:
+        parent = json.load(f)['parent_version']
+    activate_version(models_root, parent)
+    print(f"Rolled back from {version} to {parent}")
+    return parent
+
+class OnlineUpdater:
+    """Applies new feedback to the active model and publishes candidates that pass the holdout check."""
+
+    def __init__(self, models_root, feedback_path, reference_csv=None, tokenizer=None,
+                 min_records=10, holdout_fraction=0.2, max_accuracy_drop=0.01,
+                 max_reference_rows=2000, on_publish=None):
+        self.models_root = models_root
+        self.feedback = FeedbackLog(feedback_path)
+        self.reference_csv = reference_csv
+        # None preprocesses with the mode the base model was trained with
+        self.tokenizer = tokenizer
+        # New training records needed before an update is attempted
+        self.min_records = min_records
+        self.holdout_fraction = holdout_fraction
+        self.max_accuracy_drop = max_accuracy_drop
+        self.max_reference_rows = max_reference_rows
+        # Called with the new version after publishing, e.g. ModelManager.reload;
+        # if it raises, the update is rolled back
+        self.on_publish = on_publish
+
+        # Byte offsets of the first feedback record not yet applied, and of
+        # the first one not yet checked for the holdout log
+        self.state_path = f'{feedback_path}.state'
+        # Every holdout record, so updates do not re-read the whole feedback log
+        self.holdout_log = FeedbackLog(f'{feedback_path}.holdout')
+        self._lock = threading.Lock()
+        self._stop = None
+        self._trainer = None
+        self._reference = None
+        # Vectorized holdout log, extended with the records added since
+        self._holdout = {'key': None, 'offset': 0, 'X': None, 'y': []}
+        # (state offset, log offset counted up to, training records in between)
+        self._pending = (0, 0, 0)
+        self._pending_lock = threading.Lock()
+        self.last_result = None
+
+    def _read_state(self):
+        if not os.path.exists(self.state_path):
+            return {'offset': 0, 'applied': 0, 'holdout_offset': 0}
+        with open(self.state_path) as f:
+            state = json.load(f)
+        # Written before the holdout log existed: collect it from the start
+        state.setdefault('holdout_offset', 0)
+        return state
+
+    def _write_state(self, state):
+        tmp_path = f'{self.state_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _get_trainer(self, tokenizer='nltk'):
+        # Preprocesses like training, and saves candidates like train_model.py
+        if self._trainer is None or self._trainer.preprocessor.tokenizer != tokenizer:
+            from .trainer import ModelTrainer
+            self._trainer = ModelTrainer(tokenizer=tokenizer)
+        return self._trainer
+
+    def _preprocess(self, texts, tokenizer):
+        preprocessor = self._get_trainer(tokenizer).preprocessor
+        return [preprocessor.preprocess(text) for text in texts]
+
+    def _reference_data(self, vectorizer, holdout, tokenizer='nltk'):
+        """
+        Vectorized rows of the reference CSV the model was not trained on, or
+        None without a reference CSV or a record of those rows.
+        """
+        if not self.reference_csv or not os.path.exists(self.reference_csv) or holdout is None:
+            return None
+
+        # Online updates keep the vectorizer, so the rows are vectorized once per base model
+        key = hashlib.blake2b(pickle.dumps((vectorizer, holdout, tokenizer)),
+                              digest_size=16).hexdigest()
+        if self._reference is None or self._reference[0] != key:
+            import pandas as pd
+            from .trainer import _holdout_mask
+
+            text_columns = ['title', 'description', 'requirements']
+            df = pd.read_csv(self.reference_csv, usecols=text_columns + ['fraudulent'])
+            if 'rows' in holdout:
+                df = df[df.index.isin(holdout['rows'])]
+            else:
+                df = df[_holdout_mask(df.index.to_numpy(), holdout['hash_fraction'])]
+            df = df.head(self.max_reference_rows)
+
+            df = self._get_trainer(tokenizer).prepare_data(df, text_columns, use_cache=False)
+            X = vectorizer.transform(df['combined_text'])
+            self._reference = (key, X, df['fraudulent'].to_numpy(dtype=np.int64))
+        return self._reference[1], self._reference[2]
+
+    def _collect_holdout(self, state):
+        """Copy the holdout records added to the feedback log into the holdout log."""
+        records, end = self.feedback.read(state['holdout_offset'])
+        holdout = [r for r in records if in_holdout(r['job_description'], self.holdout_fraction)]
+        if holdout:
+            self.holdout_log.extend(holdout)
+        state['holdout_offset'] = end
+        return bool(records)
+
+    def _feedback_holdout(self, vectorizer, tokenizer):
+        """
+        (X, y) of every feedback holdout record, or None if there are none yet.
+
+        Only the records appended to the holdout log since the last call are
+        preprocessed and vectorized, unless the vectorizer or tokenizer changed.
+        """
+        key = hashlib.blake2b(pickle.dumps((vectorizer, tokenizer)), digest_size=16).hexdigest()
+        if self._holdout['key'] != key:
+            self._holdout = {'key': key, 'offset': 0, 'X': None, 'y': []}
+
+        holdout = self._holdout
+        records, holdout['offset'] = self.holdout_log.read(holdout['offset'])
+        if records:
+            X = vectorizer.transform(self._preprocess([r['job_description'] for r in records],
+                                                      tokenizer))
+            holdout['X'] = X if holdout['X'] is None else sparse.vstack([holdout['X'], X]).tocsr()
+            holdout['y'].extend(r['label'] for r in records)
+
+        if not holdout['y']:
+            return None
+        return holdout['X'], holdout['y']
+
+    def _count_pending(self, offset):
+        """
+        Training records after byte offset of the feedback log, the records
+        the next update applies. Only the log added since the last count is read.
+        """
+        with self._pending_lock:
+            base, counted_to, count = self._pending
+            if base != offset:
+                base, counted_to, count = offset, offset, 0
+            records, counted_to = self.feedback.read(counted_to)
+            count += sum(not in_holdout(r['job_description'], self.holdout_fraction)
+                         for r in records)
+            self._pending = (base, counted_to, count)
+            return count
+
+    def _base_version(self):
+        """The active (version, path); a flat model is first copied into a version."""
+        version, model_path = resolve_model(self.models_root)
+        if os.path.exists(os.path.join(self.models_root, CURRENT_FILE)):
+            return version, model_path
+
+        # Rollback needs a version to return to
+        def copy_flat(path):
+            for name in os.listdir(self.models_root):
+                source = os.path.join(self.models_root, name)
+                if os.path.isfile(source) and name.endswith(('.pkl', '.npy', '.json', '.txt')):
+                    shutil.copy2(source, os.path.join(path, name))
+
+        version = publish_version(self.models_root, copy_flat, f'{version}-base', activate=True)
+        return version, version_path(self.models_root, version)
+
+    def run_once(self, force=False):
+        """
+        Apply the pending feedback once.
+
+        Returns:
+            dict: 'status' is 'published', 'rejected', 'skipped' or 'busy',
+                with the holdout metrics that decided it
+        """
+        with self._lock:
+            lock_file = self._acquire_process_lock()
+            if lock_file is False:
+                return {'status': 'busy'}
+            try:
+                result = self._run_locked(force)
+            finally:
+                if lock_file is not None:
+                    lock_file.close()
+            self.last_result = result
+            return result
+
+    def _acquire_process_lock(self):
+        """Make sure one process (e.g. of several API workers) updates at a time."""
+        if fcntl is None:
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        lock_file = open(f'{self.feedback.path}.lock', 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        return lock_file
+
+    def _run_locked(self, force):
+        state = self._read_state()
+        if self._collect_holdout(state):
+            self._write_state(state)
+        records, next_offset = self.feedback.read(state['offset'])
+        train = [r for r in records if not in_holdout(r['job_description'], self.holdout_fraction)]
+
+        if not train or (len(train) < self.min_records and not force):
+            return {'status': 'skipped', 'pending': self._count_pending(state['offset'])}
+
+        parent, parent_path = self._base_version()
+        model, vectorizer = load_model(parent_path)
+        # Candidates keep the parent's vectorizer, so they need its preprocessing too
+        tokenizer = artifacts.resolve_tokenizer(parent_path, self.tokenizer)
+
+        X = vectorizer.transform(self._preprocess([r['job_description'] for r in train], tokenizer))
+        candidate = partial_fit_linear(model, X, [r['label'] for r in train])
+
+        # Holdout check: every holdout record so far, plus the reference rows
+        checks = {}
+        holdout = self._feedback_holdout(vectorizer, tokenizer)
+        if holdout is not None:
+            checks['feedback'] = (_accuracy(model, *holdout), _accuracy(candidate, *holdout), 0.0)
+        holdout_rows = load_holdout(parent_path)
+        reference = self._reference_data(vectorizer, holdout_rows, tokenizer)
+        if reference is not None:
+            checks['reference'] = (_accuracy(model, *reference), _accuracy(candidate, *reference),
+                                   self.max_accuracy_drop)
+
+        result = {
+            'parent_version': parent,
+            'records': len(train),
+            'holdout': {name: {'current_accuracy': current, 'candidate_accuracy': new}
+                        for name, (current, new, _) in checks.items()},
+        }
+
+        if not checks:
+            reason = 'no holdout data to check the update against'
+        else:
+            failed = [name for name, (current, new, allowed) in checks.items()
+                      if new < current - allowed]
+            reason = f"candidate is less accurate on the {' and '.join(failed)} holdout" if failed else None
+
+        # Either way these records are done; they stay in the log for full retrains
+        state = {'offset': next_offset, 'applied': state['applied'] + len(records),
+                 'holdout_offset': state['holdout_offset']}
+
+        if reason:
+            self._write_state(state)
+            print(f"Online update rejected: {reason}")
+            return {'status': 'rejected', 'reason': reason, **result}
+
+        def save(path):
+            trainer = self._get_trainer(tokenizer)
+            trainer.model, trainer.vectorizer = candidate, vectorizer
+            # Feedback never trains on the reference rows, so they stay held out
+            trainer.holdout = holdout_rows
+            trainer.save_model(path)
+            with open(os.path.join(path, UPDATE_FILE), 'w') as f:
+                json.dump(result, f, indent=2)
+
+        version = publish_version(self.models_root, save)
+        self._write_state(state)
+        print(f"Online update published as {version} ({len(train)} records, parent {parent})")
+
+        if self.on_publish is not None:
+            try:
+                self.on_publish(version)
+            except Exception as e:
+                activate_version(self.models_root, parent)
+                print(f"Online update {version} failed to load, rolled back to {parent}: {e}")
+                return {'status': 'rejected', 'reason': f'failed to load: {e}',
+                        'version': version, **result}
+
+        return {'status': 'published', 'version': version, **result}
+
+    def start(self, interval):
+        """Run an update every `interval` seconds in a background thread."""
+        if self._stop is not None or interval <= 0:
+            return
+
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Online update failed: {e}")
+                    self.last_result = {'status': 'error', 'reason': str(e)}
+
+        self._stop = stop
+        threading.Thread(target=run, name='online-updater', daemon=True).start()
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def status(self):
+        """Feedback counters and the outcome of the last update, for the API."""
+        state = self._read_state()
+        return {
+            'applied_records': state['applied'],
+            'pending_records': self._count_pending(state['offset']),
+            'last_update': self.last_result,
+        }
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Apply moderator feedback to the active model.')
+    parser.add_argument('--models-root', default='models/')
+    parser.add_argument('--feedback', default='data/feedback/feedback.jsonl')
+    parser.add_argument('--reference-csv', default='data/fake_job_postings.csv')
+    parser.add_argument('--tokenizer', choices=['nltk', 'fast'],
+                        help='default: the mode the active model was trained with')
+    parser.add_argument('--rollback', action='store_true',
+                        help='re-activate the version the last online update replaced')
+    args = parser.parse_args()
+
+    if args.rollback:
+        rollback(args.models_root)
+    else:
+        updater = OnlineUpdater(args.models_root, args.feedback, args.reference_csv, args.tokenizer)
+        print(json.dumps(updater.run_once(force=True), indent=2))
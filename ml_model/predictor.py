@@ -1,26 +1,12 @@
+import math
 import pickle
 import os
 import re
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-import nltk
 
-# Download NLTK data if needed
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+from .metrics import metrics
+from .resources import ensure_resources
+from .tokenizers import get_tokenizer
+from .versions import resolve_model
 
 # Suspicious keywords and phrases
 FAKE_JOB_INDICATORS = {
@@ -55,21 +41,93 @@ FAKE_JOB_INDICATORS = {
     ]
 }
 
+def _literal_first(pattern):
+    r"""
+    Rewrite a leading r'\bword' as r'word(?<=\bword)'.
+    
+    A pattern that starts with \b cannot use the regex engine's literal-prefix
+    scan, so every position of the text is tried. Moving the word boundary into
+    a lookbehind keeps the same matches while letting the scan jump straight
+    to candidate words.
+    """
+    match = re.match(r'\\b([a-z]+)', pattern)
+    if not match:
+        return pattern
+    
+    literal = match.group(1)
+    rest = pattern[match.end():]
+    # A quantifier after the word applies to its last letter only
+    if rest[:1] in ('?', '*', '+', '{'):
+        rest = literal[-1] + rest
+        literal = literal[:-1]
+    if not literal:
+        return pattern
+    
+    return f'{literal}(?<=\\b{literal}){rest}'
+
+# Indicator patterns compiled once, in the order they are reported
+COMPILED_INDICATORS = [
+    (indicator_type, re.compile(_literal_first(pattern)))
+    for indicator_type in ('fake', 'real')
+    for pattern in FAKE_JOB_INDICATORS[indicator_type]
+]
+
+# Combined matcher that finds where the first indicator of any kind starts
+ANY_INDICATOR = re.compile('|'.join(
+    f'(?:{_literal_first(pattern)})'
+    for indicator_type in ('fake', 'real')
+    for pattern in FAKE_JOB_INDICATORS[indicator_type]
+))
+
+MAX_INDICATORS = 5
+
+SCORER_MODES = ('auto', 'fused', 'sklearn')
+
+# Latency histogram of each prediction stage, see ml_model.metrics
+STAGE_SECONDS = {
+    stage: metrics.histogram('stage_seconds', stage=stage)
+    for stage in ('clean_text', 'tokenize', 'lemmatize', 'extract_indicators',
+                  'vectorize', 'predict_proba', 'fused_score', 'predict', 'predict_batch',
+                  'explain')
+}
+ML_PREDICTIONS = metrics.counter('predictions_total', path='ml')
+RULE_BASED_PREDICTIONS = metrics.counter('predictions_total', path='rule_based')
+
 class JobPredictor:
     """Predicts if a job posting is fake or real using trained ML model."""
     
-    def __init__(self, model_path=None):
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
+    def __init__(self, model_path=None, tokenizer=None, scorer='auto'):
+        # NLTK is imported here rather than at module level to keep imports fast
+        from nltk.corpus import stopwords
+        from nltk.stem import WordNetLemmatizer
+        from .artifacts import resolve_tokenizer
         
-        # Try to load model
         if model_path is None:
             model_path = os.path.join(os.path.dirname(__file__), '..', 'models')
         
+        # A versioned models root resolves to the directory of its active version
+        self.model_version, model_path = resolve_model(model_path)
         self.model_path = model_path
+        
+        # Preprocess like the model's training text unless told otherwise
+        self.tokenizer = resolve_tokenizer(model_path, tokenizer)
+        ensure_resources(self.tokenizer)
+        self.stop_words = set(stopwords.words('english'))
+        self.lemmatizer = WordNetLemmatizer()
+        self.tokenize = get_tokenizer(self.tokenizer)
+        
         self.model = None
         self.vectorizer = None
         
+        # 'auto' uses the fused scorer when the model has an array artifact,
+        # 'fused' requires it and 'sklearn' always uses the sklearn objects
+        if scorer not in SCORER_MODES:
+            raise ValueError(f"Unknown scorer mode: {scorer!r} (expected one of {SCORER_MODES})")
+        self.scorer_mode = scorer
+        self.scorer = None
+        # Vocabulary terms of the sklearn vectorizer by column, built by the first explanation
+        self._feature_names = None
+        
         try:
             self.load_model()
             self.model_available = True
@@ -101,55 +159,59 @@ class JobPredictor:
     
     def preprocess_text(self, text):
         """Preprocess text for model input."""
+        clock = metrics.clock
+        t0 = clock()
+        
         # Clean text
         text = self.clean_text(text)
+        t1 = clock()
         
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self.tokenize(text)
+        t2 = clock()
         
         # Remove stopwords and lemmatize
         tokens = [self.lemmatizer.lemmatize(word) for word in tokens 
                  if word not in self.stop_words and len(word) > 2]
+        t3 = clock()
+        
+        if metrics.enabled:
+            STAGE_SECONDS['clean_text'].observe(t1 - t0)
+            STAGE_SECONDS['tokenize'].observe(t2 - t1)
+            STAGE_SECONDS['lemmatize'].observe(t3 - t2)
         
         return ' '.join(tokens)
     
     def extract_indicators(self, text):
         """Extract suspicious and positive indicators from text."""
-        indicators = []
         text_lower = text.lower()
         
-        # Check for fake indicators
-        for pattern in FAKE_JOB_INDICATORS['fake']:
-            if re.search(pattern, text_lower):
-                match = re.search(pattern, text_lower)
-                if match:
-                    phrase = match.group(0)
-                    indicators.append({
-                        'type': 'fake',
-                        'text': f'"{phrase}" detected'
-                    })
+        # One scan of the text rules out postings with no indicators at all,
+        # and no pattern can match before the first indicator found here
+        first = ANY_INDICATOR.search(text_lower)
+        if not first:
+            return []
+        start = first.start()
         
-        # Check for real indicators
-        for pattern in FAKE_JOB_INDICATORS['real']:
-            if re.search(pattern, text_lower):
-                match = re.search(pattern, text_lower)
-                if match:
-                    phrase = match.group(0)
+        # Patterns are checked in order, so stopping at the top 5 unique
+        # indicators gives the same result as collecting all of them
+        seen = set()
+        indicators = []
+        for indicator_type, pattern in COMPILED_INDICATORS:
+            match = pattern.search(text_lower, start)
+            if match:
+                phrase = match.group(0)
+                key = (indicator_type, f'"{phrase}" detected')
+                if key not in seen:
+                    seen.add(key)
                     indicators.append({
-                        'type': 'real',
+                        'type': indicator_type,
                         'text': f'"{phrase}" detected'
                     })
+                    if len(indicators) == MAX_INDICATORS:
+                        break
         
-        # Remove duplicates
-        seen = set()
-        unique_indicators = []
-        for ind in indicators:
-            key = (ind['type'], ind['text'])
-            if key not in seen:
-                seen.add(key)
-                unique_indicators.append(ind)
-        
-        return unique_indicators[:5]  # Return top 5 indicators
+        return indicators  # Return top 5 indicators
     
     def predict(self, job_description):
         """
@@ -164,14 +226,103 @@ class JobPredictor:
         if not job_description or not isinstance(job_description, str):
             return 'real', 0.5, []
         
+        clock = metrics.clock
+        start = clock()
         indicators = self.extract_indicators(job_description)
+        STAGE_SECONDS['extract_indicators'].observe(clock() - start)
         
         if self.model_available:
             result = self._ml_predict(job_description, indicators)
         else:
+            RULE_BASED_PREDICTIONS.inc()
             result = self._rule_based_predict(job_description, indicators)
         
-        # Ensure all return values are valid
+        STAGE_SECONDS['predict'].observe(clock() - start)
+        return self._validate_result(result)
+    
+    def predict_batch(self, job_descriptions):
+        """
+        Predict a list of job postings with a single vectorizer/model call.
+        
+        Returns:
+            list: one (prediction, confidence, indicators) tuple per input,
+                in input order, with the same fallbacks as predict()
+        """
+        results = [('real', 0.5, []) for _ in job_descriptions]
+        
+        valid = [i for i, text in enumerate(job_descriptions)
+                 if text and isinstance(text, str)]
+        if not valid:
+            return results
+        
+        clock = metrics.clock
+        start = clock()
+        texts = [job_descriptions[i] for i in valid]
+        indicators = [self.extract_indicators(text) for text in texts]
+        STAGE_SECONDS['extract_indicators'].observe(clock() - start)
+        
+        if self.model_available:
+            batch = self._ml_predict_batch(texts, indicators)
+        else:
+            RULE_BASED_PREDICTIONS.inc(len(texts))
+            batch = [self._rule_based_predict(text, ind)
+                     for text, ind in zip(texts, indicators)]
+        
+        STAGE_SECONDS['predict_batch'].observe(clock() - start)
+        
+        for i, result in zip(valid, batch):
+            results[i] = self._validate_result(result)
+        
+        return results
+    
+    def explain_batch(self, job_descriptions, top_k=5):
+        """
+        Predict a list of postings and explain each ML prediction by its terms.
+        
+        The decision value of the model is the sum, over the terms of a
+        posting, of its normalized tf-idf weight times the term's coefficient,
+        plus the intercept. Those per-term contributions (in log-odds) are read
+        off the same row that is scored, so an explanation costs little more
+        than the prediction itself.
+        
+        Returns:
+            list: one (result, explanation) pair per input, in input order.
+                result is the (prediction, confidence, indicators) tuple of
+                predict_batch(); explanation is a dict with the top_k
+                'positive' (towards fake) and 'negative' (towards real)
+                terms as {'term', 'contribution'} dicts, largest first, and
+                the 'intercept', or None when the posting was not scored by
+                the model
+        """
+        results = [(('real', 0.5, []), None) for _ in job_descriptions]
+        
+        valid = [i for i, text in enumerate(job_descriptions)
+                 if text and isinstance(text, str)]
+        if not valid:
+            return results
+        
+        clock = metrics.clock
+        start = clock()
+        texts = [job_descriptions[i] for i in valid]
+        indicators = [self.extract_indicators(text) for text in texts]
+        STAGE_SECONDS['extract_indicators'].observe(clock() - start)
+        
+        if self.model_available:
+            batch = self._ml_explain_batch(texts, indicators, top_k)
+        else:
+            RULE_BASED_PREDICTIONS.inc(len(texts))
+            batch = [(self._rule_based_predict(text, ind), None)
+                     for text, ind in zip(texts, indicators)]
+        
+        STAGE_SECONDS['predict_batch'].observe(clock() - start)
+        
+        for i, (result, explanation) in zip(valid, batch):
+            results[i] = self._validate_result(result), explanation
+        
+        return results
+    
+    def _validate_result(self, result):
+        """Ensure all return values are valid."""
         prediction, confidence, indicators = result
         if prediction is None:
             prediction = 'real'
@@ -188,11 +339,8 @@ class JobPredictor:
             # Preprocess
             processed_text = self.preprocess_text(job_description)
             
-            # Vectorize
-            X = self.vectorizer.transform([processed_text])
-            
-            # Predict
-            prediction_prob = self.model.predict_proba(X)[0]
+            # Vectorize and predict
+            prediction_prob = self._predict_proba([processed_text])[0]
             
             # Model outputs: [probability of real, probability of fake]
             confidence_fake = prediction_prob[1]
@@ -201,11 +349,119 @@ class JobPredictor:
             prediction = 'fake' if confidence_fake > 0.5 else 'real'
             confidence = max(confidence_fake, confidence_real)
             
+            ML_PREDICTIONS.inc()
             return prediction, confidence, indicators
         except Exception as e:
             print(f"ML prediction error: {e}")
+            metrics.inc('errors_total', source='ml_predict')
+            metrics.inc('fallbacks_total', reason='ml_error')
+            RULE_BASED_PREDICTIONS.inc()
             return self._rule_based_predict(job_description, indicators)
     
+    def _ml_predict_batch(self, job_descriptions, indicators_list):
+        """ML-based prediction for a batch of postings."""
+        try:
+            # Preprocess
+            processed_texts = [self.preprocess_text(text) for text in job_descriptions]
+            
+            # Vectorize and predict all postings in one call
+            prediction_probs = self._predict_proba(processed_texts)
+            
+            results = []
+            for prob, indicators in zip(prediction_probs, indicators_list):
+                confidence_real, confidence_fake = prob[0], prob[1]
+                prediction = 'fake' if confidence_fake > 0.5 else 'real'
+                confidence = max(confidence_fake, confidence_real)
+                results.append((prediction, confidence, indicators))
+            
+            ML_PREDICTIONS.inc(len(results))
+            return results
+        except Exception as e:
+            # Retry item by item so one bad posting only falls back on its own
+            print(f"ML batch prediction error: {e}")
+            metrics.inc('errors_total', source='ml_predict_batch')
+            return [self._ml_predict(text, indicators)
+                    for text, indicators in zip(job_descriptions, indicators_list)]
+    
+    def _ml_explain_batch(self, job_descriptions, indicators_list, top_k):
+        """ML-based prediction with term contributions for a batch of postings."""
+        import numpy as np
+        
+        try:
+            processed_texts = [self.preprocess_text(text) for text in job_descriptions]
+            
+            start = metrics.clock()
+            rows, names, intercept = self._term_contributions(processed_texts)
+            
+            results = []
+            for (columns, contributions), indicators in zip(rows, indicators_list):
+                # Same probability as predict_proba: sigmoid of the decision value
+                score = float(contributions.sum()) + intercept
+                confidence_fake = 1.0 / (1.0 + math.exp(-score)) if score > -700 else 0.0
+                prediction = 'fake' if confidence_fake > 0.5 else 'real'
+                confidence = max(confidence_fake, 1.0 - confidence_fake)
+                
+                order = np.argsort(contributions)
+                explanation = {
+                    'positive': [{'term': names[columns[j]], 'contribution': float(contributions[j])}
+                                 for j in order[::-1][:top_k] if contributions[j] > 0],
+                    'negative': [{'term': names[columns[j]], 'contribution': float(contributions[j])}
+                                 for j in order[:top_k] if contributions[j] < 0],
+                    'intercept': intercept,
+                }
+                results.append(((prediction, confidence, indicators), explanation))
+            
+            STAGE_SECONDS['explain'].observe(metrics.clock() - start)
+            ML_PREDICTIONS.inc(len(results))
+            return results
+        except Exception as e:
+            # A model without per-term weights still gets its predictions
+            print(f"ML explanation error: {e}")
+            metrics.inc('errors_total', source='ml_explain_batch')
+            return [(result, None) for result in
+                    self._ml_predict_batch(job_descriptions, indicators_list)]
+    
+    def _term_contributions(self, processed_texts):
+        """
+        Return ([(columns, contributions) per text], feature names, intercept)
+        of the decision values of preprocessed texts.
+        """
+        import numpy as np
+        
+        if self.scorer is not None:
+            rows = [self.scorer.contributions(text) for text in processed_texts]
+            return rows, self.scorer.feature_names, self.scorer.intercept
+        
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        
+        X = self.vectorizer.transform(processed_texts).tocsr()
+        coef = np.asarray(self.model.coef_[0], dtype=np.float64)
+        rows = []
+        for start, end in zip(X.indptr[:-1], X.indptr[1:]):
+            columns = X.indices[start:end]
+            rows.append((columns, X.data[start:end] * coef[columns]))
+        return rows, self._feature_names, float(self.model.intercept_[0])
+    
+    def _predict_proba(self, processed_texts):
+        """Return [probability of real, probability of fake] rows for preprocessed texts."""
+        clock = metrics.clock
+        start = clock()
+        
+        if self.scorer is not None:
+            probs = self.scorer.predict_proba(processed_texts)
+            STAGE_SECONDS['fused_score'].observe(clock() - start)
+            return probs
+        
+        X = self.vectorizer.transform(processed_texts)
+        vectorized = clock()
+        probs = self.model.predict_proba(X)
+        
+        if metrics.enabled:
+            STAGE_SECONDS['vectorize'].observe(vectorized - start)
+            STAGE_SECONDS['predict_proba'].observe(clock() - vectorized)
+        return probs
+    
     def _rule_based_predict(self, job_description, indicators):
         """Rule-based fallback prediction."""
         fake_count = sum(1 for ind in indicators if ind['type'] == 'fake')
@@ -221,11 +477,44 @@ class JobPredictor:
         return prediction, confidence, indicators
     
     def load_model(self):
-        """Load trained model and vectorizer from disk."""
+        """
+        Load trained model and vectorizer from disk.
+        
+        The memory-mapped array artifact (see ml_model.artifacts) is preferred,
+        scored with the fused scorer unless scorer='sklearn'; model.pkl /
+        vectorizer.pkl are used when no artifact is present.
+        """
+        from . import artifacts
+        from .scorer import LinearScorer
+        
+        self._feature_names = None
         model_file = os.path.join(self.model_path, 'model.pkl')
         vectorizer_file = os.path.join(self.model_path, 'vectorizer.pkl')
         
-        if os.path.exists(model_file) and os.path.exists(vectorizer_file):
+        if artifacts.has_artifact(self.model_path):
+            scorer = None
+            if self.scorer_mode != 'sklearn':
+                try:
+                    scorer = LinearScorer.from_artifact(self.model_path)
+                except artifacts.ArtifactError:
+                    if self.scorer_mode == 'fused':
+                        raise
+            
+            if scorer is not None:
+                # The fused scorer does not need sklearn at all
+                self.scorer = scorer
+                self.model, self.vectorizer = None, None
+            else:
+                self.scorer = None
+                self.model, self.vectorizer = artifacts.load_artifact(self.model_path)
+            
+            self.model_available = True
+            print("Model loaded successfully!")
+        elif self.scorer_mode == 'fused':
+            raise FileNotFoundError(f"Fused scorer needs an array artifact in {self.model_path}")
+        elif os.path.exists(model_file) and os.path.exists(vectorizer_file):
+            self.scorer = None
+            
             with open(model_file, 'rb') as f:
                 self.model = pickle.load(f)
             
@@ -0,0 +1,188 @@
+"""
+Disk-backed cache of preprocessed training text.
+
+Each raw text value is keyed by a BLAKE2 hash of its content, so rows that
+did not change since the last run are not cleaned, tokenized and lemmatized
+again. The cache file name contains a fingerprint of the preprocessing
+configuration; changing the configuration (tokenizer, stopwords, cleaning
+patterns, NLTK version or PREPROCESS_VERSION) makes the old file unreachable
+and it is removed on the next save.
+
+Each entry records the day it was last looked up. Entries unused for
+max_age_days are dropped on save, and the least recently used ones beyond
+max_entries, so the file does not keep every text ever trained on.
+
+Entries are stored as a three-column DataFrame (key, text, used) in a
+pickle, which pandas reads back in one bulk call.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+# Bump when the preprocessing code changes in a way the fingerprint cannot see
+PREPROCESS_VERSION = 1
+
+CACHE_PREFIX = 'preprocessed-'
+CACHE_SUFFIX = '.pkl'
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+def today():
+    """Days since the epoch, the resolution of last-use times."""
+    return int(time.time() // SECONDS_PER_DAY)
+
+def content_key(text):
+    """Hash one raw text value."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def config_fingerprint(preprocessor):
+    """Fingerprint everything that affects DataPreprocessor output."""
+    import nltk
+    from . import trainer
+
+    config = {
+        'version': PREPROCESS_VERSION,
+        'nltk': nltk.__version__,
+        'tokenizer': preprocessor.tokenizer,
+        'stop_words': sorted(preprocessor.stop_words),
+        'patterns': [
+            trainer.URL_PATTERN.pattern,
+            trainer.EMAIL_PATTERN.pattern,
+            trainer.NON_LETTER_PATTERN.pattern,
+            trainer.WHITESPACE_PATTERN.pattern,
+        ],
+    }
+    encoded = json.dumps(config, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+class PreprocessCache:
+    """Maps raw text content hashes to preprocessed text for one configuration."""
+
+    def __init__(self, cache_dir, fingerprint, max_entries=200000, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.path = os.path.join(cache_dir, f'{CACHE_PREFIX}{fingerprint}{CACHE_SUFFIX}')
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.entries = {}
+        # key -> day the entry was last looked up (see today())
+        self.last_used = {}
+        # Total preprocessing cost so far, used to estimate the time hits save
+        self.preprocess_seconds = 0.0
+        self.preprocessed_texts = 0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        """Read the cache file for this configuration, if it exists."""
+        if not os.path.exists(self.path):
+            return
+
+        stored = pd.read_pickle(self.path)
+        self.entries = dict(zip(stored['key'], stored['text']))
+        if 'used' in stored:
+            self.last_used = dict(zip(stored['key'], stored['used'].tolist()))
+        else:
+            # Written before last-use times were kept
+            self.last_used = dict.fromkeys(self.entries, today())
+        self.preprocess_seconds = stored.attrs.get('preprocess_seconds', 0.0)
+        self.preprocessed_texts = stored.attrs.get('preprocessed_texts', 0)
+
+    def prune(self):
+        """
+        Drop entries unused for max_age_days, then the least recently used
+        ones beyond max_entries.
+
+        Returns:
+            int: number of entries dropped
+        """
+        cutoff = today() - self.max_age_days
+        stale = [key for key, day in self.last_used.items() if day < cutoff]
+        excess = len(self.entries) - len(stale) - self.max_entries
+        if excess > 0:
+            fresh = sorted((day, key) for key, day in self.last_used.items() if day >= cutoff)
+            stale.extend(key for _, key in fresh[:excess])
+
+        for key in stale:
+            del self.entries[key]
+            del self.last_used[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def save(self):
+        """Prune, write the cache atomically and drop files of other configurations."""
+        self.prune()
+        if not self._dirty:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        keys = list(self.entries)
+        stored = pd.DataFrame({'key': keys, 'text': [self.entries[key] for key in keys],
+                               'used': [self.last_used[key] for key in keys]})
+        stored.attrs['preprocess_seconds'] = self.preprocess_seconds
+        stored.attrs['preprocessed_texts'] = self.preprocessed_texts
+
+        tmp_path = f'{self.path}.tmp'
+        stored.to_pickle(tmp_path)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+        pattern = os.path.join(self.cache_dir, f'{CACHE_PREFIX}*{CACHE_SUFFIX}')
+        for path in glob.glob(pattern):
+            if path != self.path:
+                os.remove(path)
+
+    def preprocess_columns(self, df, text_columns, preprocess_texts):
+        """
+        Replace df[text_columns] with preprocessed text, computing only cache misses.
+
+        preprocess_texts takes a list of raw texts and returns their
+        preprocessed versions in the same order.
+        """
+        keys = {}
+        missing = {}
+        for col in text_columns:
+            texts = [value if isinstance(value, str) else '' for value in df[col]]
+            keys[col] = [content_key(text) for text in texts]
+            for key, text in zip(keys[col], texts):
+                if key not in self.entries:
+                    missing[key] = text
+
+        lookups = sum(len(column_keys) for column_keys in keys.values())
+        hits = sum(key not in missing for column_keys in keys.values() for key in column_keys)
+
+        if missing:
+            start = time.perf_counter()
+            processed = preprocess_texts(list(missing.values()))
+            elapsed = time.perf_counter() - start
+
+            self.entries.update(zip(missing.keys(), processed))
+            self.preprocess_seconds += elapsed
+            self.preprocessed_texts += len(missing)
+            self._dirty = True
+
+        day = today()
+        for column_keys in keys.values():
+            for key in column_keys:
+                # Only a new day is worth rewriting the file for
+                if self.last_used.get(key) != day:
+                    self.last_used[key] = day
+                    self._dirty = True
+
+        for col in text_columns:
+            df[col] = [self.entries[key] for key in keys[col]]
+
+        saved = 0.0
+        if self.preprocessed_texts:
+            saved = hits * self.preprocess_seconds / self.preprocessed_texts
+        print(f"Preprocess cache: {hits}/{lookups} hits "
+              f"({hits / lookups * 100 if lookups else 0.0:.1f}%), "
+              f"{len(missing)} texts preprocessed, ~{saved:.1f}s saved")
+
+        return df
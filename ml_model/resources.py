@@ -0,0 +1,62 @@
+"""
+NLTK data required by the preprocessing pipeline.
+
+Nothing is downloaded at import time. Run the prepare step once per machine
+(or image build):
+
+    python -m ml_model.resources
+"""
+
+# NLTK resource path -> download package name
+NLTK_RESOURCES = {
+    'tokenizers/punkt': 'punkt',
+    'corpora/stopwords': 'stopwords',
+    'corpora/wordnet': 'wordnet',
+}
+
+class MissingResourceError(LookupError):
+    """Raised when NLTK data needed for preprocessing is not installed."""
+
+def required_resources(tokenizer='nltk'):
+    """Return the NLTK resources needed for a tokenizer mode."""
+    resources = ['corpora/stopwords', 'corpora/wordnet']
+    if tokenizer == 'nltk':
+        resources.insert(0, 'tokenizers/punkt')
+    return resources
+
+def missing_resources(tokenizer='nltk'):
+    """Return the NLTK resources that are not installed locally."""
+    import nltk
+
+    missing = []
+    for resource in required_resources(tokenizer):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            missing.append(resource)
+    return missing
+
+def ensure_resources(tokenizer='nltk'):
+    """Raise MissingResourceError if any required NLTK data is missing."""
+    missing = missing_resources(tokenizer)
+    if missing:
+        packages = ', '.join(NLTK_RESOURCES[resource] for resource in missing)
+        raise MissingResourceError(
+            f"Missing NLTK data: {packages}. "
+            f"Run `python -m ml_model.resources` (or ml_model.prepare()) to download it."
+        )
+
+def prepare(tokenizer='nltk', quiet=False):
+    """Download any missing NLTK data. Returns True if everything is installed."""
+    import nltk
+
+    for resource in missing_resources(tokenizer):
+        nltk.download(NLTK_RESOURCES[resource], quiet=quiet)
+
+    return not missing_resources(tokenizer)
+
+if __name__ == '__main__':
+    if prepare():
+        print("NLTK data is installed.")
+    else:
+        raise SystemExit("Could not download all NLTK data. Check network access.")
@@ -0,0 +1,157 @@
+"""
+Fused TF-IDF + logistic regression scorer.
+
+For a TfidfVectorizer followed by a binary LogisticRegression, the fake
+probability of a document is
+
+    sigmoid(sum_t tf_t * idf_t * coef_t / norm(tf * idf) + intercept)
+
+over the vocabulary terms present in the document. LinearScorer evaluates
+this directly from token counts using the arrays of an array artifact (see
+ml_model.artifacts), without building a sparse matrix or importing sklearn.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+from .artifacts import ArtifactError, load_arrays
+
+# Vectorizer settings the fused scorer reproduces
+SUPPORTED_VECTORIZER_PARAMS = {
+    'analyzer': ('word',),
+    'ngram_range': ([1, 1],),
+    'stop_words': (None,),
+    'strip_accents': (None,),
+    'preprocessor': (None,),
+    'tokenizer': (None,),
+    'input': ('content',),
+    'use_idf': (True,),
+    'norm': ('l2', 'l1', None),
+}
+
+def check_supported(manifest):
+    """Raise ArtifactError if the artifact cannot be scored by LinearScorer."""
+    if manifest['model_class'] != 'LogisticRegression':
+        raise ArtifactError(f"Unsupported model class: {manifest['model_class']!r}")
+    if len(manifest['classes']) != 2:
+        raise ArtifactError("Only binary classifiers can be scored")
+
+    params = manifest['vectorizer_params']
+    for key, allowed in SUPPORTED_VECTORIZER_PARAMS.items():
+        if params.get(key) not in allowed:
+            raise ArtifactError(f"Vectorizer {key}={params.get(key)!r} is not supported by the fused scorer")
+
+class LinearScorer:
+    """Computes predict_proba of a TF-IDF + LogisticRegression model from token counts."""
+
+    def __init__(self, vocabulary, idf, term_weights, intercept, vectorizer_params,
+                 term_weights_scale=1.0):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        # idf_t * coef_t, precomputed by the export step; int8 for quantized
+        # artifacts, where the real weight is term_weights_scale times as large
+        self.term_weights = term_weights
+        self.term_weights_scale = float(term_weights_scale)
+        self.intercept = float(intercept)
+
+        self.lowercase = vectorizer_params['lowercase']
+        self.binary = vectorizer_params['binary']
+        self.sublinear_tf = vectorizer_params['sublinear_tf']
+        self.norm = vectorizer_params['norm']
+        self.find_tokens = re.compile(vectorizer_params['token_pattern']).findall
+        self._feature_names = None
+
+    @classmethod
+    def from_artifact(cls, model_path):
+        """Build a scorer from an array artifact directory."""
+        arrays = load_arrays(model_path)
+        check_supported(arrays['manifest'])
+
+        if arrays['term_weights'] is None:
+            raise ArtifactError("Artifact has no precomputed term weights")
+
+        return cls(
+            vocabulary=arrays['vocabulary'],
+            idf=arrays['idf'],
+            term_weights=arrays['term_weights'],
+            intercept=arrays['intercept'][0],
+            vectorizer_params=arrays['manifest']['vectorizer_params'],
+            term_weights_scale=arrays['term_weights_scale'],
+        )
+
+    def count_terms(self, text):
+        """Return (columns, term frequencies) of the vocabulary terms in text."""
+        if self.lowercase:
+            text = text.lower()
+
+        # Count distinct tokens first, then look up each one once
+        counts = {}
+        vocabulary = self.vocabulary
+        for token, count in Counter(self.find_tokens(text)).items():
+            column = vocabulary.get(token)
+            if column is not None:
+                counts[column] = count
+
+        columns = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+
+        if self.binary:
+            tf[:] = 1.0
+        elif self.sublinear_tf:
+            tf = np.log(tf) + 1.0
+
+        return columns, tf
+
+    def _norm(self, columns, tf):
+        """Norm of the tf-idf row the vectorizer would divide by."""
+        if self.norm == 'l2':
+            weights = tf * self.idf[columns]
+            norm = math.sqrt(float(weights @ weights))
+        elif self.norm == 'l1':
+            norm = float(np.abs(tf * self.idf[columns]).sum())
+        else:
+            norm = 1.0
+        return norm if norm > 0 else 1.0
+
+    def decision_function(self, text):
+        """Return the logistic regression decision value for one text."""
+        columns, tf = self.count_terms(text)
+        if not len(columns):
+            return self.intercept
+
+        score = float(tf @ self.term_weights[columns]) * self.term_weights_scale
+        return score / self._norm(columns, tf) + self.intercept
+
+    def contributions(self, text):
+        """
+        Return (columns, contributions) of the vocabulary terms in text.
+
+        A term's contribution is its share of the decision value (normalized
+        tf-idf times coefficient), so the contributions plus the intercept add
+        up to decision_function(text).
+        """
+        columns, tf = self.count_terms(text)
+        if not len(columns):
+            return columns, tf
+
+        contributions = tf * self.term_weights[columns] * self.term_weights_scale
+        return columns, contributions / self._norm(columns, tf)
+
+    @property
+    def feature_names(self):
+        """Array of vocabulary terms indexed by column, built on first use."""
+        if self._feature_names is None:
+            names = np.empty(len(self.vocabulary), dtype=object)
+            for term, column in self.vocabulary.items():
+                names[column] = term
+            self._feature_names = names
+        return self._feature_names
+
+    def predict_proba(self, texts):
+        """Return an (n, 2) array of [probability of real, probability of fake]."""
+        scores = np.array([self.decision_function(text) for text in texts], dtype=np.float64)
+        fake = 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - fake, fake])
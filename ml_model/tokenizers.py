@@ -0,0 +1,41 @@
+"""Word tokenizers shared by training and prediction."""
+
+TOKENIZER_MODES = ('nltk', 'fast')
+
+# Contractions the NLTK Treebank tokenizer splits even in letters-only text
+TREEBANK_SPLITS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+}
+
+def fast_word_tokenize(text):
+    """
+    Tokenize text already normalized by clean_text.
+
+    Cleaned text only contains lowercase letters and single spaces, so
+    splitting on whitespace (plus the few Treebank contraction splits) gives
+    the same tokens as word_tokenize without running punkt.
+    """
+    tokens = []
+    for word in text.split():
+        split = TREEBANK_SPLITS.get(word)
+        if split:
+            tokens.extend(split)
+        else:
+            tokens.append(word)
+
+    return tokens
+
+def get_tokenizer(mode='nltk'):
+    """Return the tokenizer function for a tokenizer mode."""
+    if mode == 'nltk':
+        from nltk.tokenize import word_tokenize
+        return word_tokenize
+    if mode == 'fast':
+        return fast_word_tokenize
+
+    raise ValueError(f"Unknown tokenizer mode: {mode!r} (expected one of {TOKENIZER_MODES})")
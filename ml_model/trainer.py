@@ -1,39 +1,49 @@
 import pandas as pd
 import numpy as np
+from scipy.sparse import csr_matrix
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
+import copy
+import json
 import pickle
 import os
 import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
-import nltk
 
-# Download NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from .artifacts import ArtifactError, load_artifact, quantize, remove_artifact, save_artifact
+from .preprocess_cache import PreprocessCache, config_fingerprint
+from .resources import ensure_resources
+from .tokenizers import get_tokenizer
+from .versions import publish_version
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Cleaning steps shared by the per-row and the column-wise paths
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+NON_LETTER_PATTERN = re.compile(r'[^a-zA-Z\s]')
+NON_LETTER_RUNS_PATTERN = re.compile(r'[^a-zA-Z\s]+')
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+# Written next to a saved model: which rows of the training CSV it did not train on
+HOLDOUT_FILE = 'holdout.json'
 
 class DataPreprocessor:
     """Preprocesses job posting text data."""
     
-    def __init__(self):
+    def __init__(self, tokenizer='nltk'):
+        ensure_resources(tokenizer)
         self.stop_words = set(stopwords.words('english'))
         self.lemmatizer = WordNetLemmatizer()
+        self.tokenizer = tokenizer
+        self.tokenize = get_tokenizer(tokenizer)
+        # (chunk index, rows, seconds) of the last parallel preprocess_dataframe call
+        self.chunk_timings = []
     
     def clean_text(self, text):
         """Clean and normalize text."""
@@ -44,26 +54,50 @@ class DataPreprocessor:
         text = text.lower()
         
         # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        text = URL_PATTERN.sub('', text)
         
         # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        text = EMAIL_PATTERN.sub('', text)
         
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = NON_LETTER_PATTERN.sub('', text)
         
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
         
         return text
     
+    def clean_series(self, series):
+        """Column-wise equivalent of clean_text for a pandas Series."""
+        # Non-string values become NaN under .str, clean_text maps them to ""
+        series = series.fillna('').str.lower().fillna('')
+        
+        # URL and email patterns are costly, so only rows that can match run them
+        has_url = (series.str.contains('http', regex=False) |
+                   series.str.contains('www', regex=False))
+        if has_url.any():
+            series[has_url] = series[has_url].str.replace(URL_PATTERN, '', regex=True)
+        
+        has_email = series.str.contains('@', regex=False)
+        if has_email.any():
+            series[has_email] = series[has_email].str.replace(EMAIL_PATTERN, '', regex=True)
+        
+        series = series.str.replace(NON_LETTER_RUNS_PATTERN, '', regex=True)
+        
+        # Splitting on whitespace and rejoining collapses runs and strips the ends
+        return series.str.split().str.join(' ')
+    
     def preprocess(self, text):
         """Full preprocessing pipeline."""
         # Clean text
         text = self.clean_text(text)
         
+        return self.preprocess_cleaned(text)
+    
+    def preprocess_cleaned(self, text):
+        """Tokenize, remove stopwords and lemmatize text already cleaned by clean_text."""
         # Tokenize
-        tokens = word_tokenize(text)
+        tokens = self.tokenize(text)
         
         # Remove stopwords and lemmatize
         tokens = [self.lemmatizer.lemmatize(word) for word in tokens 
@@ -71,34 +105,195 @@ class DataPreprocessor:
         
         return ' '.join(tokens)
     
-    def preprocess_dataframe(self, df, text_columns):
-        """Preprocess DataFrame text columns."""
-        df_copy = df.copy()
+    def preprocess_dataframe(self, df, text_columns, inplace=False, n_jobs=1, chunk_size=None):
+        """
+        Preprocess DataFrame text columns.
+        
+        Cleaning runs column-wise; only tokenization and lemmatization run
+        per row. With inplace=True the columns of df are overwritten instead
+        of working on a copy.
+        
+        With n_jobs > 1 (or -1 for all cores) the rows are split into chunks
+        of chunk_size rows (default: 4 chunks per worker) and preprocessed in
+        a process pool. Results keep the original row order.
+        """
+        if not inplace:
+            df = df.copy()
+        
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        
+        if n_jobs > 1 and len(df) > 1:
+            processed = self._preprocess_parallel(df[text_columns], text_columns, n_jobs, chunk_size)
+            for col in text_columns:
+                df[col] = processed[col]
+            return df
         
         for col in text_columns:
-            df_copy[col] = df_copy[col].fillna('')
-            df_copy[col] = df_copy[col].apply(self.preprocess)
+            cleaned = self.clean_series(df[col])
+            df[col] = cleaned.map(self.preprocess_cleaned)
         
-        return df_copy
+        return df
+    
+    def _preprocess_parallel(self, df, text_columns, n_jobs, chunk_size):
+        """Preprocess row chunks in worker processes and reassemble them in order."""
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(df) // (n_jobs * 4)))
+        
+        chunks = [
+            (index, df.iloc[start:start + chunk_size], text_columns)
+            for index, start in enumerate(range(0, len(df), chunk_size))
+        ]
+        
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_chunk_worker,
+                                 initargs=(self.tokenizer,)) as executor:
+            results = list(executor.map(_preprocess_chunk, chunks))
+        elapsed = time.perf_counter() - start
+        
+        self.chunk_timings = [(index, len(chunk), seconds) for index, chunk, seconds in results]
+        chunk_seconds = [seconds for _, _, seconds in self.chunk_timings]
+        print(f"Preprocessed {len(df)} rows in {len(chunks)} chunks on {n_jobs} workers "
+              f"in {elapsed:.2f}s (chunk min/avg/max: {min(chunk_seconds):.2f}/"
+              f"{sum(chunk_seconds) / len(chunk_seconds):.2f}/{max(chunk_seconds):.2f}s)")
+        
+        # executor.map yields results in submission order
+        return pd.concat([chunk for _, chunk, _ in results])
+
+# Per-process preprocessor, created once by the pool initializer
+_chunk_preprocessor = None
+
+def _init_chunk_worker(tokenizer):
+    """Build the worker's stopword set and lemmatizer once."""
+    global _chunk_preprocessor
+    _chunk_preprocessor = DataPreprocessor(tokenizer=tokenizer)
+
+def _preprocess_chunk(task):
+    """Preprocess one chunk of rows in a worker process."""
+    index, chunk, text_columns = task
+    start = time.perf_counter()
+    chunk = _chunk_preprocessor.preprocess_dataframe(chunk, text_columns, inplace=True)
+    return index, chunk, time.perf_counter() - start
+
+def _holdout_mask(row_numbers, holdout_fraction):
+    """Deterministically assign rows to the evaluation stream by their row number."""
+    hashed = (row_numbers.astype(np.uint64) * np.uint64(2654435761)) % np.uint64(2 ** 32)
+    return hashed < np.uint64(holdout_fraction * 2 ** 32)
+
+def _spill_chunk(path, X, y):
+    """Write a hashed CSR chunk and its labels to an uncompressed .npz file."""
+    np.savez(path, data=X.data, indices=X.indices, indptr=X.indptr,
+             shape=np.array(X.shape), y=y)
+
+def _load_spilled_chunk(path):
+    """Read back (X, y) written by _spill_chunk."""
+    with np.load(path) as stored:
+        X = csr_matrix((stored['data'], stored['indices'], stored['indptr']),
+                       shape=tuple(stored['shape']))
+        return X, stored['y']
+
+def _metrics_from_confusion(confusion):
+    """Build the train() metrics dict from a 2x2 confusion matrix."""
+    (tn, fp), (fn, tp) = confusion.tolist()
+    total = tn + fp + fn + tp
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    
+    return {
+        'accuracy': (tp + tn) / total if total else 0.0,
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'confusion_matrix': [[tn, fp], [fn, tp]]
+    }
+
+def _directory_bytes(path, names=None):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)
+               if names is None or name in names)
+
+def _measure_model_dir(path, texts, y, repeats=5):
+    """Load time, per-posting latency and held-out metrics of a saved model, as served."""
+    from .scorer import LinearScorer
+    
+    load_seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            scorer = LinearScorer.from_artifact(path)
+        except ArtifactError:
+            # Not supported by the fused scorer; served through sklearn
+            scorer = None
+            model, vectorizer = load_artifact(path, mmap=True)
+        load_seconds.append(time.perf_counter() - start)
+    
+    if scorer is not None:
+        score = lambda text: scorer.predict_proba([text])[0, 1]
+    else:
+        score = lambda text: model.predict_proba(vectorizer.transform([text]))[0, 1]
+    
+    latencies = []
+    for _ in range(3):
+        start = time.perf_counter()
+        fake = np.array([score(text) for text in texts])
+        latencies.append((time.perf_counter() - start) / max(len(texts), 1))
+    latency = min(latencies)
+    
+    y_pred = (fake >= 0.5).astype(np.int64)
+    return {
+        'load_seconds': min(load_seconds),
+        'latency_us': latency * 1e6,
+        'accuracy': accuracy_score(y, y_pred),
+        'f1': f1_score(y, y_pred, zero_division=0),
+    }
 
 class ModelTrainer:
     """Trains and evaluates the fake job detection model."""
     
-    def __init__(self):
+    def __init__(self, tokenizer='nltk', n_jobs=1, cache_dir=None):
         self.vectorizer = TfidfVectorizer(max_features=5000, max_df=0.8, min_df=2)
         self.model = LogisticRegression(max_iter=1000, random_state=42)
-        self.preprocessor = DataPreprocessor()
+        # Storage type of the exported weights; compress() can lower it
+        self.weights_dtype = 'float64'
+        # (X_train, X_test, y_train, y_test) of the last train() call
+        self.split = None
+        # Rows of the training data the model was not fitted on, saved as
+        # HOLDOUT_FILE: {'rows': [row labels]} after train(), {'hash_fraction':
+        # f} after train_streaming() (see _holdout_mask), None if all were used
+        self.holdout = None
+        self.preprocessor = DataPreprocessor(tokenizer=tokenizer)
+        # Worker processes used for text preprocessing (-1 = all cores)
+        self.n_jobs = n_jobs
+        # Directory of the persistent preprocessed-text cache (None = disabled)
+        self.cache_dir = cache_dir
+        self.cache = None
         
-    def prepare_data(self, df, text_columns=['title', 'description', 'requirements']):
+    def prepare_data(self, df, text_columns=['title', 'description', 'requirements'], inplace=False,
+                     use_cache=True):
         """Prepare data for training."""
-        # Preprocess text columns
-        df = self.preprocessor.preprocess_dataframe(df, text_columns)
+        # Preprocess text columns, reusing cached results for unchanged text
+        if self.cache_dir and use_cache:
+            if not inplace:
+                df = df.copy()
+            if self.cache is None:
+                self.cache = PreprocessCache(self.cache_dir, config_fingerprint(self.preprocessor))
+            df = self.cache.preprocess_columns(df, text_columns, self._preprocess_texts)
+            self.cache.save()
+        else:
+            df = self.preprocessor.preprocess_dataframe(df, text_columns, inplace=inplace,
+                                                        n_jobs=self.n_jobs)
         
         # Combine text columns
         df['combined_text'] = df[text_columns].fillna('').agg(' '.join, axis=1)
         
         return df
     
+    def _preprocess_texts(self, texts):
+        """Preprocess a list of raw texts, in order."""
+        frame = pd.DataFrame({'text': texts})
+        frame = self.preprocessor.preprocess_dataframe(frame, ['text'], inplace=True,
+                                                       n_jobs=self.n_jobs)
+        return frame['text'].tolist()
+    
     def train(self, df, label_column='fraudulent', text_columns=None):
         """Train the model."""
         if text_columns is None:
@@ -115,6 +310,8 @@ class ModelTrainer:
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=0.2, random_state=42, stratify=y
         )
+        self.split = (X_train, X_test, y_train, y_test)
+        self.holdout = {'rows': sorted(int(row) for row in X_test.index)}
         
         # Vectorize text
         X_train_vec = self.vectorizer.fit_transform(X_train)
@@ -137,17 +334,251 @@ class ModelTrainer:
         
         return metrics
     
+    def grid_search(self, df, label_column='fraudulent', text_columns=None, vectorizer_grid=None,
+                    classifier_grid=None, n_folds=5, scoring='f1'):
+        """
+        Select the vectorizer and classifier settings by k-fold cross-validation.
+        
+        Runs ml_model.model_selection.grid_search with self.n_jobs worker
+        processes, then refits the best combination on all rows as
+        self.vectorizer / self.model, ready for save_model.
+        
+        Returns the ranked results; the first entry's 'metrics' are the
+        cross-validated metrics of the selected model.
+        """
+        from .model_selection import grid_search
+        
+        if text_columns is None:
+            text_columns = ['title', 'description', 'requirements']
+        
+        df = self.prepare_data(df, text_columns)
+        X = df['combined_text']
+        y = df[label_column]
+        
+        results = grid_search(X.tolist(), y.to_numpy(), vectorizer_grid, classifier_grid,
+                              n_folds=n_folds, n_jobs=self.n_jobs, scoring=scoring)
+        
+        best = results[0]
+        self.vectorizer = TfidfVectorizer(**best['vectorizer'])
+        self.model = LogisticRegression(max_iter=1000, random_state=42, **best['classifier'])
+        self.model.fit(self.vectorizer.fit_transform(X), y)
+        self.holdout = None
+        
+        return results
+    
+    def compress(self, prune=None, threshold=0.01, l1_C=1.0, weights_dtype='float32'):
+        """
+        Shrink the model trained by train() and report what it costs.
+        
+        prune='threshold' drops the terms whose weight |idf * coef| is below
+        threshold; prune='l1' keeps the terms an L1-penalized logistic
+        regression (strength 1 / l1_C) selects. The kept terms form a smaller
+        vocabulary and the classifier is refitted on them, since dropping
+        terms also changes the TF-IDF normalization. The weights are then
+        stored as weights_dtype ('float64', 'float32' or 'int8'). Afterwards
+        self.model / self.vectorizer are the compressed model; if measuring
+        either model fails, the trainer keeps the original one.
+        
+        Returns a report of terms, artifact and pickle bytes, load seconds,
+        per-posting latency, accuracy and F1 on the held-out split, each as
+        {'original': ..., 'compressed': ...}.
+        """
+        if self.split is None:
+            raise ValueError("compress() needs a model trained with train() in this session")
+        if not isinstance(self.vectorizer, TfidfVectorizer):
+            raise ValueError("Only TF-IDF models can be compressed")
+        
+        X_train, X_test, y_train, y_test = self.split
+        # Work on copies, so the original can still be measured and kept
+        model, vectorizer = copy.deepcopy(self.model), copy.deepcopy(self.vectorizer)
+        
+        if prune == 'threshold':
+            keep = np.flatnonzero(np.abs(vectorizer.idf_ * model.coef_[0]) >= threshold)
+        elif prune == 'l1':
+            selector = LogisticRegression(penalty='l1', solver='liblinear', C=l1_C, random_state=42)
+            selector.fit(vectorizer.transform(X_train), y_train)
+            keep = np.flatnonzero(selector.coef_[0])
+        elif prune is None:
+            keep = np.arange(len(vectorizer.vocabulary_))
+        else:
+            raise ValueError(f"Unknown pruning method: {prune!r}")
+        
+        if not len(keep):
+            raise ValueError("Pruning would drop every term; use a lower threshold or larger l1_C")
+        
+        if len(keep) < len(vectorizer.vocabulary_):
+            terms = np.empty(len(vectorizer.vocabulary_), dtype=object)
+            for term, column in vectorizer.vocabulary_.items():
+                terms[column] = term
+            
+            vectorizer = clone(self.vectorizer)
+            vectorizer.vocabulary_ = {term: column for column, term in enumerate(terms[keep])}
+            vectorizer.idf_ = self.vectorizer.idf_[keep]
+            model = clone(self.model).fit(vectorizer.transform(X_train), y_train)
+        
+        # Terms cut by min_df/max_df/max_features, kept only for introspection
+        if hasattr(vectorizer, 'stop_words_'):
+            del vectorizer.stop_words_
+        
+        if weights_dtype == 'float32':
+            model.coef_ = model.coef_.astype(np.float32)
+            vectorizer.idf_ = vectorizer.idf_.astype(np.float32)
+        elif weights_dtype == 'int8':
+            # The pickles stay float, but score exactly like the int8 artifact
+            q, scale = quantize(model.coef_)
+            model.coef_ = q.astype(np.float32) * np.float32(scale)
+        
+        artifact_files = {'artifact.json', 'coef.npy', 'intercept.npy', 'idf.npy',
+                          'term_weights.npy', 'vocabulary.txt'}
+        report = {'terms': {'original': len(self.vectorizer.vocabulary_),
+                            'compressed': len(vectorizer.vocabulary_)}}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            measured = {}
+            for name, state in (('original', (self.model, self.vectorizer, self.weights_dtype)),
+                                ('compressed', (model, vectorizer, weights_dtype))):
+                path = os.path.join(tmp, name)
+                self._write_model(path, *state)
+                measured[name] = {
+                    'artifact_bytes': _directory_bytes(path, artifact_files),
+                    'pickle_bytes': _directory_bytes(path, {'model.pkl', 'vectorizer.pkl'}),
+                    **_measure_model_dir(path, X_test.tolist(), y_test.to_numpy()),
+                }
+        
+        self.model, self.vectorizer, self.weights_dtype = model, vectorizer, weights_dtype
+        for key in measured['original']:
+            report[key] = {name: measured[name][key] for name in ('original', 'compressed')}
+        return report
+    
+    def train_streaming(self, csv_path, label_column='fraudulent', text_columns=None,
+                        chunk_size=10000, holdout_fraction=0.2, epochs=5, n_features=2 ** 20,
+                        spill_dir=None):
+        """
+        Train out of core on a CSV that does not fit in memory.
+        
+        The CSV is read in chunks of chunk_size rows. Rows are assigned to the
+        evaluation stream by a hash of their row number, so the split does not
+        depend on the chunk size. A stateless HashingVectorizer replaces the
+        TF-IDF vocabulary and an SGD logistic regression is fitted with
+        partial_fit, one chunk at a time, for the given number of epochs.
+        
+        The CSV is read and preprocessed once: the first epoch spills each
+        chunk's hashed sparse matrix and labels to a temporary directory
+        (under spill_dir, default the system temp directory), and the later
+        epochs and the final scoring of the evaluation stream read them back.
+        Only one chunk and the confusion matrix counts are held in memory at
+        any time.
+        
+        Returns the same metrics dict as train().
+        """
+        if text_columns is None:
+            text_columns = ['title', 'description', 'requirements']
+        
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, norm='l2')
+        self.model = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=42)
+        classes = np.array([0, 1])
+        self.holdout = {'hash_fraction': holdout_fraction}
+        
+        with tempfile.TemporaryDirectory(prefix='streaming-', dir=spill_dir) as tmp:
+            spilled = {False: [], True: []}
+            rows = 0
+            for in_holdout, X, y in self._stream_chunks(csv_path, label_column, text_columns,
+                                                        chunk_size, holdout_fraction):
+                path = os.path.join(tmp, f"{'holdout' if in_holdout else 'train'}-"
+                                         f"{len(spilled[in_holdout])}.npz")
+                _spill_chunk(path, X, y)
+                spilled[in_holdout].append(path)
+                if not in_holdout and epochs:
+                    self.model.partial_fit(X, y, classes=classes)
+                    rows += len(y)
+            if epochs:
+                print(f"Epoch 1/{epochs}: trained on {rows} rows")
+            
+            for epoch in range(1, epochs):
+                rows = 0
+                for path in spilled[False]:
+                    X, y = _load_spilled_chunk(path)
+                    self.model.partial_fit(X, y, classes=classes)
+                    rows += len(y)
+                print(f"Epoch {epoch + 1}/{epochs}: trained on {rows} rows")
+            
+            confusion = np.zeros((2, 2), dtype=np.int64)
+            for path in spilled[True]:
+                X, y = _load_spilled_chunk(path)
+                y_pred = self.model.predict(X)
+                np.add.at(confusion, (y, y_pred), 1)
+        
+        return _metrics_from_confusion(confusion)
+    
+    def _stream_chunks(self, csv_path, label_column, text_columns, chunk_size,
+                       holdout_fraction):
+        """Yield (in holdout, X, y) for the training and evaluation rows of each CSV chunk."""
+        reader = pd.read_csv(csv_path, chunksize=chunk_size,
+                             usecols=list(text_columns) + [label_column])
+        
+        for chunk in reader:
+            # The corpus cache is not used here: it would grow with the dataset
+            chunk = self.prepare_data(chunk, text_columns, inplace=True, use_cache=False)
+            in_holdout = _holdout_mask(chunk.index.to_numpy(), holdout_fraction)
+            for part, mask in ((False, ~in_holdout), (True, in_holdout)):
+                rows = chunk[mask]
+                if rows.empty:
+                    continue
+                X = self.vectorizer.transform(rows['combined_text'])
+                y = rows[label_column].to_numpy(dtype=np.int64)
+                yield part, X, y
+    
     def save_model(self, model_path='../models/'):
-        """Save trained model and vectorizer."""
+        """Save trained model and vectorizer as pickles and as an array artifact."""
+        self._write_model(model_path, self.model, self.vectorizer, self.weights_dtype)
+        print(f"Model saved to {model_path}")
+    
+    def _write_model(self, model_path, model, vectorizer, weights_dtype):
+        """Write the files of save_model for the given model, vectorizer and weights dtype."""
         os.makedirs(model_path, exist_ok=True)
         
         with open(os.path.join(model_path, 'model.pkl'), 'wb') as f:
-            pickle.dump(self.model, f)
+            pickle.dump(model, f)
         
         with open(os.path.join(model_path, 'vectorizer.pkl'), 'wb') as f:
-            pickle.dump(self.vectorizer, f)
+            pickle.dump(vectorizer, f)
         
-        print(f"Model saved to {model_path}")
+        if isinstance(vectorizer, TfidfVectorizer):
+            save_artifact(model, vectorizer, model_path, weights_dtype,
+                          tokenizer=self.preprocessor.tokenizer)
+        else:
+            # Hashing models have no vocabulary/idf to export; make sure a stale
+            # artifact from an earlier model is not loaded instead of the pickles
+            remove_artifact(model_path)
+        
+        holdout_file = os.path.join(model_path, HOLDOUT_FILE)
+        if self.holdout is not None:
+            with open(holdout_file, 'w') as f:
+                json.dump(self.holdout, f)
+        elif os.path.exists(holdout_file):
+            os.remove(holdout_file)
+    
+    def publish_model(self, models_root='../models/', version=None, activate=True):
+        """
+        Save the model as a new version under models_root (see ml_model.versions).
+        
+        The version directory is written completely before CURRENT is switched
+        to it, so a running API can reload it without seeing partial files.
+        """
+        version = publish_version(models_root, self.save_model, version, activate)
+        print(f"Published model version {version}" + (" (active)" if activate else ""))
+        return version
+    
+    def export_artifact(self, model_path='../models/'):
+        """
+        Export the model as an array artifact (see ml_model.artifacts).
+        
+        Besides the raw coefficients and idf weights this precomputes the
+        per-term idf * coef weights that the fused scorer in
+        ml_model.scorer uses at serving time.
+        """
+        save_artifact(self.model, self.vectorizer, model_path, self.weights_dtype,
+                      tokenizer=self.preprocessor.tokenizer)
     
     def load_model(self, model_path='../models/'):
         """Load trained model and vectorizer."""
@@ -0,0 +1,125 @@
+"""
+Versioned model directories.
+
+A models root can hold several complete model directories side by side:
+
+    models/
+        CURRENT                 name of the active version
+        versions/
+            20250101-120000/    model.pkl, vectorizer.pkl, artifact files
+            20250102-093000/
+
+Publishing writes a new version directory completely before pointing CURRENT
+at it, and CURRENT is replaced atomically, so a reader never sees a half
+written model. A root without CURRENT is the original flat layout; its
+version is derived from the modification time, size and inode of the model
+files.
+"""
+
+import datetime
+import hashlib
+import os
+
+CURRENT_FILE = 'CURRENT'
+VERSIONS_DIR = 'versions'
+
+# Files whose modification time identifies a flat (unversioned) model directory
+MODEL_FILES = ('artifact.json', 'model.pkl', 'vectorizer.pkl')
+
+def new_version_id():
+    """A sortable version name based on the current UTC time."""
+    return datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%d-%H%M%S-%f')
+
+def check_version_name(version):
+    """
+    Raise ValueError unless version is a plain directory name.
+
+    Version names come from API requests and the CURRENT file; a path
+    separator, '..' or a leading '.' could point outside versions/ (or at a
+    staging directory), and the model found there would be unpickled.
+    """
+    if (not isinstance(version, str) or not version or version.startswith('.')
+            or '/' in version or '\\' in version):
+        raise ValueError(f"Invalid model version name: {version!r}")
+
+def version_path(models_root, version):
+    return os.path.join(models_root, VERSIONS_DIR, version)
+
+def list_versions(models_root):
+    """Return the published version names, oldest first."""
+    versions_dir = os.path.join(models_root, VERSIONS_DIR)
+    if not os.path.isdir(versions_dir):
+        return []
+    return sorted(name for name in os.listdir(versions_dir)
+                  if not name.startswith('.') and os.path.isdir(os.path.join(versions_dir, name)))
+
+def resolve_model(models_root):
+    """
+    Return (version, model directory) of the active model under models_root.
+
+    For the flat layout the directory is models_root itself and the version
+    is 'unversioned-<newest mtime>-<hash of the files' mtime, size and inode>',
+    so it changes when the files are replaced, even within the same second.
+    """
+    current_file = os.path.join(models_root, CURRENT_FILE)
+    if os.path.exists(current_file):
+        with open(current_file) as f:
+            version = f.read().strip()
+        check_version_name(version)
+        return version, version_path(models_root, version)
+
+    stats = [(name, os.stat(os.path.join(models_root, name)))
+             for name in MODEL_FILES if os.path.exists(os.path.join(models_root, name))]
+    if not stats:
+        return 'unversioned', models_root
+    newest = max(stat.st_mtime_ns for _, stat in stats)
+    stamp = datetime.datetime.fromtimestamp(newest / 1e9, datetime.timezone.utc)
+    # Size and inode tell apart files replaced within the file system's mtime resolution
+    identity = [(name, stat.st_mtime_ns, stat.st_size, stat.st_ino) for name, stat in stats]
+    digest = hashlib.blake2b(repr(identity).encode('utf-8'), digest_size=4).hexdigest()
+    return f"unversioned-{stamp.strftime('%Y%m%d-%H%M%S-%f')}-{digest}", models_root
+
+def activate_version(models_root, version):
+    """
+    Point CURRENT at an existing version, atomically.
+
+    Raises:
+        ValueError: if version is not a name listed by list_versions()
+        FileNotFoundError: if no such version was published
+    """
+    check_version_name(version)
+    if version not in list_versions(models_root):
+        raise FileNotFoundError(f"Model version {version!r} not found in {models_root}")
+
+    current_file = os.path.join(models_root, CURRENT_FILE)
+    tmp_file = f'{current_file}.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(version + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, current_file)
+
+def publish_version(models_root, save, version=None, activate=True):
+    """
+    Create a new version directory with save(path) and optionally activate it.
+
+    save writes a complete model into the directory it is given. It runs in
+    a hidden staging directory that is renamed into place only when done.
+
+    Returns:
+        str: the new version name
+    """
+    version = version or new_version_id()
+    check_version_name(version)
+    final_path = version_path(models_root, version)
+    if os.path.exists(final_path):
+        raise FileExistsError(f"Model version {version!r} already exists")
+
+    staging_path = version_path(models_root, f'.staging-{version}')
+    os.makedirs(staging_path)
+    save(staging_path)
+    os.rename(staging_path, final_path)
+
+    if activate:
+        activate_version(models_root, version)
+    return version
@@ -0,0 +1,185 @@
+"""
+Bulk scoring of job postings stored in a CSV file.
+
+The input is read in chunks, the text columns of each row are combined the
+same way ModelTrainer.prepare_data combines them, and chunks are scored in
+parallel worker processes that each load the model once. Results are appended
+to the output CSV as chunks finish, in input order, and a checkpoint file
+records how far the output is complete so an interrupted run can continue
+with --resume.
+
+Usage: python score_csv.py input.csv output.csv [--n-jobs 4] [--chunk-size 2000] [--resume]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+TEXT_COLUMNS = ['title', 'description', 'requirements']
+OUTPUT_COLUMNS = ['row', 'prediction', 'confidence', 'indicators']
+
+# Predictor loaded once per worker process
+_predictor = None
+
+def _init_worker(model_path, tokenizer):
+    global _predictor
+    from ml_model.predictor import JobPredictor
+
+    _predictor = JobPredictor(model_path=model_path, tokenizer=tokenizer)
+
+def _score_chunk(task):
+    """Score one chunk; returns output rows in input order."""
+    first_row, ids, texts = task
+    results = _predictor.predict_batch(texts)
+
+    rows = []
+    for offset, (row_id, (prediction, confidence, indicators)) in enumerate(zip(ids, results)):
+        rows.append([
+            first_row + offset if row_id is None else row_id,
+            prediction,
+            f'{float(confidence):.6f}',
+            json.dumps([indicator['text'] for indicator in indicators]),
+        ])
+    return rows
+
+def combine_text(chunk, text_columns):
+    """Join the text columns of each row like ModelTrainer.prepare_data."""
+    return chunk[text_columns].fillna('').astype(str).agg(' '.join, axis=1).tolist()
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def write_checkpoint(path, state):
+    """Replace the checkpoint atomically so it is never half written."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+def score_csv(input_path, output_path, text_columns=TEXT_COLUMNS, id_column=None,
+              chunk_size=2000, n_jobs=1, model_path=None, tokenizer=None, resume=False):
+    """
+    Score every row of input_path into output_path.
+
+    Returns:
+        int: rows scored in this run
+
+    Raises:
+        FileNotFoundError: resume is set but there is no checkpoint, so the
+            output is not overwritten (a finished run removes its checkpoint)
+        ValueError: the checkpoint belongs to another input file
+    """
+    checkpoint_path = f'{output_path}.checkpoint'
+    state = read_checkpoint(checkpoint_path) if resume else None
+    if resume and state is None:
+        raise FileNotFoundError(f"No checkpoint {checkpoint_path} to resume from; "
+                                f"run without --resume to score {input_path} from the start")
+
+    if state is not None:
+        if state['input'] != os.path.abspath(input_path):
+            raise ValueError(f"Checkpoint {checkpoint_path} belongs to {state['input']}")
+        # Drop anything written after the last checkpoint
+        with open(output_path, 'r+b') as f:
+            f.truncate(state['output_bytes'])
+        print(f"Resuming after {state['rows_done']} rows")
+    else:
+        state = {'input': os.path.abspath(input_path), 'rows_done': 0, 'output_bytes': 0}
+        with open(output_path, 'w', newline='') as f:
+            csv.writer(f).writerow(OUTPUT_COLUMNS)
+            state['output_bytes'] = f.tell()
+        write_checkpoint(checkpoint_path, state)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    usecols = text_columns + ([id_column] if id_column else [])
+    reader = pd.read_csv(input_path, usecols=usecols, chunksize=chunk_size,
+                         skiprows=range(1, state['rows_done'] + 1))
+
+    def tasks():
+        first_row = state['rows_done']
+        for chunk in reader:
+            ids = chunk[id_column].tolist() if id_column else [None] * len(chunk)
+            yield first_row, ids, combine_text(chunk, text_columns)
+            first_row += len(chunk)
+
+    start = time.perf_counter()
+    scored = 0
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(model_path, tokenizer)) as executor, \
+            open(output_path, 'a', newline='') as out:
+        writer = csv.writer(out)
+
+        # Keep a bounded number of chunks in flight and write them in order
+        pending = []
+        task_iter = tasks()
+        for task in task_iter:
+            pending.append((len(task[1]), executor.submit(_score_chunk, task)))
+            if len(pending) < n_jobs * 2:
+                continue
+
+            scored += _write_next(pending, writer, out, state, checkpoint_path)
+            _report(scored, start)
+
+        while pending:
+            scored += _write_next(pending, writer, out, state, checkpoint_path)
+            _report(scored, start)
+
+    elapsed = time.perf_counter() - start
+    print(f"\nScored {scored} rows in {elapsed:.1f}s "
+          f"({scored / elapsed if elapsed else 0.0:.0f} rows/s) -> {output_path}")
+
+    os.remove(checkpoint_path)
+    return scored
+
+def _write_next(pending, writer, out, state, checkpoint_path):
+    """Wait for the oldest chunk, append it to the output and checkpoint."""
+    count, future = pending.pop(0)
+    writer.writerows(future.result())
+    out.flush()
+    os.fsync(out.fileno())
+
+    state['rows_done'] += count
+    state['output_bytes'] = out.tell()
+    write_checkpoint(checkpoint_path, state)
+    return count
+
+def _report(scored, start):
+    elapsed = time.perf_counter() - start
+    print(f"\r{scored} rows scored, {scored / elapsed if elapsed else 0.0:.0f} rows/s",
+          end='', flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a CSV of job postings in bulk.')
+    parser.add_argument('input', help='CSV with title, description and requirements columns')
+    parser.add_argument('output', help='CSV to write predictions to')
+    parser.add_argument('--text-columns', nargs='+', default=TEXT_COLUMNS)
+    parser.add_argument('--id-column', help='input column to copy into the row column of the output')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='rows per chunk')
+    parser.add_argument('--n-jobs', type=int, default=1, help='worker processes (-1 = all cores)')
+    parser.add_argument('--model-path', help='model directory (default: models/)')
+    parser.add_argument('--tokenizer', choices=['nltk', 'fast'],
+                        help='tokenizer mode (default: the mode the model was trained with)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted run from its checkpoint')
+    args = parser.parse_args()
+
+    try:
+        score_csv(args.input, args.output, args.text_columns, args.id_column, args.chunk_size,
+                  args.n_jobs, args.model_path, args.tokenizer, args.resume)
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+
+if __name__ == '__main__':
+    main()
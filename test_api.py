@@ -0,0 +1,248 @@
+"""
+Flask test-client checks for backend/app.py, against a model trained for the test.
+"""
+
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pytest
+
+REMOTE = {'REMOTE_ADDR': '203.0.113.7'}
+
+@pytest.fixture(scope='module')
+def api(model_dir, tmp_path_factory):
+    """backend.app configured with the fixture model and no background threads."""
+    data_dir = tmp_path_factory.mktemp('api-data')
+    settings = {
+        'JOBVISION_MODELS_DIR': model_dir,
+        'JOBVISION_FEEDBACK_PATH': str(data_dir / 'feedback.jsonl'),
+        'JOBVISION_NEAR_DUP_PATH': str(data_dir / 'near_duplicates.npz'),
+        'JOBVISION_MODEL_POLL_SECONDS': '0',
+        'JOBVISION_FEEDBACK_UPDATE_SECONDS': '0',
+        'JOBVISION_NEAR_DUP_SAVE_SECONDS': '0',
+        'JOBVISION_BATCH_WINDOW_MS': '0',
+    }
+    # backend.app reads its settings at import; later test modules get the environment back
+    with pytest.MonkeyPatch.context() as patch:
+        for name, value in settings.items():
+            patch.setenv(name, value)
+        patch.delenv('JOBVISION_ADMIN_TOKEN', raising=False)
+        from backend import app as api
+        assert api.model_manager.active.predictor.model_available
+        yield api
+
+def test_admin_routes_fail_closed(api, monkeypatch):
+    """Without a token, admin and feedback routes only answer loopback callers."""
+    client = api.app.test_client()
+    feedback = {'job_description': 'Pay a fee to start, paid via telegram.', 'label': 'fake'}
+    
+    for path, body in (('/api/feedback', feedback), ('/api/admin/reload', {}),
+                       ('/api/admin/rollback', {})):
+        response = client.post(path, json=body, environ_base=REMOTE)
+        assert response.status_code == 403, path
+    assert api.feedback_updater.feedback.read()[0] == []
+    
+    assert client.post('/api/feedback', json=feedback).status_code == 201
+    assert client.post('/api/feedback', json=[feedback]).status_code == 400
+    
+    monkeypatch.setattr(api, 'ADMIN_TOKEN', 's3cret')
+    assert client.post('/api/feedback', json=feedback).status_code == 403
+    response = client.post('/api/feedback', json=feedback, environ_base=REMOTE,
+                           headers={'X-Admin-Token': 's3cret'})
+    assert response.status_code == 201
+    assert len(api.feedback_updater.feedback.read()[0]) == 2
+
+def test_reload_rejects_paths(api):
+    """Only published version names can be activated."""
+    client = api.app.test_client()
+    for version in ('/tmp', '../models', '.staging-x'):
+        response = client.post('/api/admin/reload', json={'version': version})
+        assert response.status_code == 400, version
+    assert not os.path.exists(os.path.join(api.MODELS_DIR, 'CURRENT'))
+
+def test_async_server_rejects_malformed_requests(api):
+    """Malformed requests get a 400/413 response instead of a dropped connection."""
+    import asyncio
+    import socket
+    from backend.async_server import MAX_BODY_SIZE, AsyncPredictionServer
+    
+    def post(body, length=None):
+        length = len(body) if length is None else length
+        return (f'POST /api/predict HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n'
+                .encode('latin-1') + body)
+    
+    cases = [
+        (b'GARBAGE\r\n\r\n', 400),
+        (b'POST /api/predict HTTP/1.1\r\nContent-Length: ten\r\n\r\n', 400),
+        (post(b'[1, 2]'), 400),
+        (post(b'42'), 400),
+        (post(b'', length=MAX_BODY_SIZE + 1), 413),
+        (post(b'{"job_description": "Senior engineer, salary and benefits."}'), 200),
+    ]
+    
+    async def run():
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        server = AsyncPredictionServer(workers=1, max_queue=1)
+        task = asyncio.ensure_future(server.serve('127.0.0.1', port, sock=sock))
+        await asyncio.sleep(0.1)
+        
+        statuses = []
+        for request, _ in cases:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), 10)
+            statuses.append(int(status_line.split()[1]))
+            writer.close()
+        task.cancel()
+        return statuses
+    
+    assert asyncio.run(run()) == [status for _, status in cases]
+
+def test_near_duplicates_only_reuse_fake_verdicts(api, monkeypatch):
+    """A repost inherits a fake verdict, unless it adds indicators; real verdicts are never reused."""
+    from backend.near_duplicates import NearDuplicateIndex
+    index = NearDuplicateIndex()
+    monkeypatch.setattr(api, 'near_duplicate_index', index)
+    active = api.model_manager.active
+    client = api.app.test_client()
+    
+    words = ('we are hiring assistants for our growing office team to handle mail '
+             'sort parcels answer calls update records and support the regional '
+             'managers with weekly reports travel plans and customer follow ups').split()
+    scam = ' '.join(words)
+    legit = ' '.join(reversed(words))
+    for text, prediction in ((scam, 'fake'), (legit, 'real')):
+        signature = index.signature(active.predictor.clean_text(text))
+        index.add(signature, active.version, (prediction, 0.99, []))
+    
+    repost = scam + ' today'
+    body = client.post('/api/predict', json={'job_description': repost}).get_json()
+    assert body['near_duplicate'] is not None
+    assert (body['prediction'], body['confidence']) == ('fake', 0.99)
+    
+    # An added scam phrase, or a copy of a posting scored real, goes to the model
+    for text in (scam + ' easy money', legit + ' today'):
+        body = client.post('/api/predict', json={'job_description': text}).get_json()
+        assert body['near_duplicate'] is None, text
+        assert body['confidence'] != 0.99
+    assert index.stats()['rejections'] == 2
+    
+    body = client.post('/api/predict/batch',
+                       json={'job_descriptions': [scam + ' now', legit + ' now']}).get_json()
+    assert [item['near_duplicate'] is not None for item in body['results']] == [True, False]
+    
+    lines = client.post('/api/predict/stream', data=f'"{scam} soon"\n"{legit} soon"\n')
+    results = [json.loads(line) for line in lines.get_data(as_text=True).splitlines()]
+    assert [item['near_duplicate'] is not None for item in results[:2]] == [True, False]
+
+def test_stream_chunks_and_errors(api, monkeypatch):
+    """Bad lines get their own error, chunks are bounded by count and bytes, a failing chunk is isolated."""
+    monkeypatch.setattr(api, 'near_duplicate_index', None)
+    monkeypatch.setattr(api, 'MAX_STREAM_LINE_BYTES', 200)
+    monkeypatch.setattr(api, 'STREAM_CHUNK_SIZE', 3)
+    monkeypatch.setattr(api, 'STREAM_CHUNK_BYTES', 150)
+    client = api.app.test_client()
+    
+    chunks = []
+    score_stream_chunk = api.score_stream_chunk
+    def record_chunk(active, chunk):
+        chunks.append([line_number for line_number, *_ in chunk])
+        return score_stream_chunk(active, chunk)
+    monkeypatch.setattr(api, 'score_stream_chunk', record_chunk)
+    
+    predictor = api.model_manager.active.predictor
+    predict_batch = predictor.predict_batch
+    calls = []
+    def fail_first_batch(texts):
+        calls.append(len(texts))
+        if len(calls) == 1:
+            raise RuntimeError('scorer down')
+        return predict_batch(texts)
+    monkeypatch.setattr(predictor, 'predict_batch', fail_first_batch)
+    
+    lines = [
+        json.dumps({'id': 'a', 'job_description': 'Stream test clerk, office hours.'}),
+        '{not json',
+        json.dumps('Stream test driver, weekly pay.'),
+        '',
+        json.dumps('x' * 300),
+        json.dumps('Stream test nurse ' + 'shift ' * 25),
+        json.dumps('Stream test cook, kitchen.'),
+        json.dumps({'id': 'b', 'job_description': '  '}),
+    ]
+    response = client.post('/api/predict/stream', data='\n'.join(lines) + '\n')
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    *items, summary = results
+    
+    # Three lines per chunk, or fewer once 150 bytes of postings are pending
+    assert chunks == [[1, 2, 3], [5, 6], [7, 8]]
+    assert [item['line'] for item in items] == [1, 2, 3, 5, 6, 7, 8]
+    assert items[0]['id'] == 'a' and items[0]['error'].startswith('Prediction failed')
+    assert items[1]['error'].startswith('Invalid JSON')
+    assert items[2]['error'].startswith('Prediction failed')
+    assert items[3]['error'] == 'Line exceeds 200 bytes'
+    assert items[4]['prediction'] in ('fake', 'real') and items[5]['prediction'] in ('fake', 'real')
+    assert items[6] == {'line': 8, 'id': 'b', 'error': 'Job description cannot be empty'}
+    assert calls == [2, 1, 1]
+    assert summary['done'] is True
+    assert (summary['lines'], summary['scored'], summary['errors']) == (7, 2, 5)
+    assert summary['model_version'] == api.model_manager.active.version
+
+def test_micro_batcher_never_leaves_callers_waiting(api, monkeypatch):
+    """Short or failing batches fail their callers, and a stuck batch times out with a 503."""
+    import threading
+    from backend.micro_batcher import MicroBatcher
+    
+    batcher = MicroBatcher(lambda texts: [], window_ms=0)
+    with pytest.raises(IndexError):
+        batcher.predict('Office clerk wanted.', timeout=5)
+    assert batcher.stats()['errors'] == 1
+    batcher.close()
+    
+    release = threading.Event()
+    def stuck(texts):
+        release.wait(10)
+        return [('real', 0.5, [])] * len(texts)
+    batcher = MicroBatcher(stuck, window_ms=0)
+    active = api.model_manager.active
+    monkeypatch.setattr(api.model_manager, 'active', active._replace(batcher=batcher))
+    monkeypatch.setattr(api, 'near_duplicate_index', None)
+    monkeypatch.setattr(api, 'BATCH_TIMEOUT_SECONDS', 0.1)
+    
+    client = api.app.test_client()
+    response = client.post('/api/predict', json={'job_description': 'Timeout test: office clerk.'})
+    assert response.status_code == 503
+    release.set()
+    batcher.close()
+
+def test_near_duplicate_index_survives_bad_files(api, tmp_path, monkeypatch):
+    """A failed save keeps the index dirty; an unreadable file raises for the caller to handle."""
+    from backend import near_duplicates
+    from backend.near_duplicates import NearDuplicateIndex
+    index = NearDuplicateIndex()
+    signature = index.signature('paid training fee required before start date')
+    index.add(signature, 'v1', ('fake', 0.9, []))
+    path = str(tmp_path / 'index.npz')
+    
+    def fail(*args):
+        raise OSError('disk full')
+    with monkeypatch.context() as patch:
+        patch.setattr(near_duplicates.os, 'replace', fail)
+        with pytest.raises(OSError):
+            index.save(path)
+    assert index.dirty and not os.listdir(str(tmp_path))
+    
+    index.save(path)
+    assert not index.dirty
+    assert NearDuplicateIndex().load(path) == 1
+    
+    with open(path, 'wb') as f:
+        f.write(b'not an npz file')
+    with pytest.raises(Exception):
+        NearDuplicateIndex().load(path)
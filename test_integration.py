@@ -3,13 +3,110 @@ Integration Testing Script
 Test the complete JobVision application (frontend + backend)
 """
 
+import argparse
+import csv
+import itertools
+import os
+import sys
+import threading
+import time
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Sample postings used by the functional tests and the synthetic load workload
+REAL_JOB = """
+    Senior Full Stack Engineer
+    San Francisco, CA
+    
+    We are seeking a talented Senior Full Stack Engineer to join our growing engineering team.
+    
+    About the role:
+    - Design and develop scalable web applications
+    - Work with React, Node.js, PostgreSQL, and AWS
+    - Mentor junior engineers
+    - Participate in code reviews and architecture discussions
+    
+    Requirements:
+    - 5+ years of professional software development experience
+    - Strong experience with JavaScript/TypeScript and React
+    - Backend experience with Node.js or similar
+    - Experience with relational databases
+    - BS in Computer Science or equivalent
+    
+    Benefits:
+    - Competitive salary: $150,000 - $200,000
+    - Health, dental, vision insurance
+    - 401(k) matching
+    - 20 days PTO
+    - Flexible work arrangements
+    - Professional development budget
+    
+    Apply: careers.company.com/jobs/12345
+    Contact: jobs@company.com
+    """
+
+FAKE_JOB = """
+    WORK FROM HOME - NO EXPERIENCE NEEDED!!!
+    
+    Make $5,000 to $10,000 PER WEEK with NO EXPERIENCE!!!
+    
+    We are HIRING IMMEDIATELY! 
+    - Guaranteed income! Risk-free opportunity!
+    - Work from home whenever you want
+    - No experience required - we train everyone
+    - Start earning TODAY!
+    - Get paid IMMEDIATELY - same day payouts!
+    - No interviews! No phone calls! Email only!
+    
+    Requirements: NONE! 
+    - Anyone can apply
+    - No qualifications needed
+    - No degree required
+    
+    To get started, please send a $99 upfront registration fee
+    to secure your position immediately!
+    
+    Unlimited earning potential!
+    Work whenever you want!
+    Easy money!
+    """
+
+MODERATE_JOB = """
+    Customer Service Representative - Remote
+    
+    Position: Customer Service Representative
+    Location: Remote (Work from Home)
+    
+    Join our growing customer support team!
+    
+    Responsibilities:
+    - Answer customer inquiries via email, phone, and chat
+    - Resolve customer issues professionally
+    - Maintain detailed records of interactions
+    - Follow company policies and procedures
+    
+    Requirements:
+    - High school diploma or equivalent
+    - 1+ years of customer service experience
+    - Excellent communication skills
+    - Able to work flexible hours including evenings and weekends
+    - Reliable internet connection
+    
+    We offer:
+    - Competitive hourly rate
+    - Health benefits after 90 days
+    - Training provided
+    - Remote work flexibility
+    
+    Apply at: jobs.company.com
+    """
+
 class JobVisionTester:
     def __init__(self, api_url='http://localhost:5000/api/predict'):
         self.api_url = api_url
+        self.health_url = api_url.rsplit('/', 1)[0] + '/health'
         self.results = []
     
     def test_api_connection(self):
@@ -18,7 +115,7 @@ class JobVisionTester:
         print("TEST 1: API Connection")
         print("="*70)
         try:
-            response = requests.get('http://localhost:5000/api/health', timeout=5)
+            response = requests.get(self.health_url, timeout=5)
             if response.status_code == 200:
                 print("✅ API is healthy and responding")
                 return True
@@ -35,38 +132,7 @@ class JobVisionTester:
         print("TEST 2: Real Job Posting")
         print("="*70)
         
-        real_job = """
-        Senior Full Stack Engineer
-        San Francisco, CA
-        
-        We are seeking a talented Senior Full Stack Engineer to join our growing engineering team.
-        
-        About the role:
-        - Design and develop scalable web applications
-        - Work with React, Node.js, PostgreSQL, and AWS
-        - Mentor junior engineers
-        - Participate in code reviews and architecture discussions
-        
-        Requirements:
-        - 5+ years of professional software development experience
-        - Strong experience with JavaScript/TypeScript and React
-        - Backend experience with Node.js or similar
-        - Experience with relational databases
-        - BS in Computer Science or equivalent
-        
-        Benefits:
-        - Competitive salary: $150,000 - $200,000
-        - Health, dental, vision insurance
-        - 401(k) matching
-        - 20 days PTO
-        - Flexible work arrangements
-        - Professional development budget
-        
-        Apply: careers.company.com/jobs/12345
-        Contact: jobs@company.com
-        """
-        
-        return self._make_prediction(real_job, "REAL")
+        return self._make_prediction(REAL_JOB, "REAL")
     
     def test_fake_job(self):
         """Test prediction on a fake job posting."""
@@ -74,33 +140,7 @@ class JobVisionTester:
         print("TEST 3: Fake Job Posting")
         print("="*70)
         
-        fake_job = """
-        WORK FROM HOME - NO EXPERIENCE NEEDED!!!
-        
-        Make $5,000 to $10,000 PER WEEK with NO EXPERIENCE!!!
-        
-        We are HIRING IMMEDIATELY! 
-        - Guaranteed income! Risk-free opportunity!
-        - Work from home whenever you want
-        - No experience required - we train everyone
-        - Start earning TODAY!
-        - Get paid IMMEDIATELY - same day payouts!
-        - No interviews! No phone calls! Email only!
-        
-        Requirements: NONE! 
-        - Anyone can apply
-        - No qualifications needed
-        - No degree required
-        
-        To get started, please send a $99 upfront registration fee
-        to secure your position immediately!
-        
-        Unlimited earning potential!
-        Work whenever you want!
-        Easy money!
-        """
-        
-        return self._make_prediction(fake_job, "FAKE")
+        return self._make_prediction(FAKE_JOB, "FAKE")
     
     def test_moderate_job(self):
         """Test prediction on a moderate/ambiguous job posting."""
@@ -108,37 +148,7 @@ class JobVisionTester:
         print("TEST 4: Moderate Job Posting")
         print("="*70)
         
-        moderate_job = """
-        Customer Service Representative - Remote
-        
-        Position: Customer Service Representative
-        Location: Remote (Work from Home)
-        
-        Join our growing customer support team!
-        
-        Responsibilities:
-        - Answer customer inquiries via email, phone, and chat
-        - Resolve customer issues professionally
-        - Maintain detailed records of interactions
-        - Follow company policies and procedures
-        
-        Requirements:
-        - High school diploma or equivalent
-        - 1+ years of customer service experience
-        - Excellent communication skills
-        - Able to work flexible hours including evenings and weekends
-        - Reliable internet connection
-        
-        We offer:
-        - Competitive hourly rate
-        - Health benefits after 90 days
-        - Training provided
-        - Remote work flexibility
-        
-        Apply at: jobs.company.com
-        """
-        
-        return self._make_prediction(moderate_job, "UNKNOWN")
+        return self._make_prediction(MODERATE_JOB, "UNKNOWN")
     
     def test_empty_input(self):
         """Test API with empty input."""
@@ -250,6 +260,235 @@ class JobVisionTester:
         else:
             print(f"⚠️  {total-passed} test(s) failed. Check the errors above.")
 
+def load_workload(path=None):
+    """
+    Postings to replay in a load test.
+    
+    path may be a CSV with title/description/requirements columns (combined
+    the same way as training), a JSON-lines file of {"job_description": ...}
+    records, or a text file with one posting per line. Without a path the
+    sample postings above are used.
+    """
+    if path is None:
+        return [REAL_JOB, FAKE_JOB, MODERATE_JOB]
+    
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            columns = ['title', 'description', 'requirements']
+            postings = [' '.join(row.get(col) or '' for col in columns) for row in csv.DictReader(f)]
+        elif path.endswith('.jsonl'):
+            postings = [json.loads(line)['job_description'] for line in f if line.strip()]
+        else:
+            postings = [line.strip() for line in f]
+    
+    return [text for text in postings if text.strip()]
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+class LoadTester(JobVisionTester):
+    """Replays a workload against /api/predict with pooled keep-alive connections."""
+    
+    def __init__(self, api_url='http://localhost:5000/api/predict', timeout=10):
+        super().__init__(api_url)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (start offset in seconds, latency in seconds, outcome) per request
+        self.records = []
+    
+    def _session(self):
+        # requests.Session is not thread-safe, so each client thread keeps its own
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+    
+    def _send(self, job_description, scheduled, t0):
+        """Send one request; latency is measured from its scheduled start."""
+        try:
+            response = self._session().post(self.api_url,
+                                            json={"job_description": job_description},
+                                            timeout=self.timeout)
+            if response.status_code == 200:
+                outcome = 'ok'
+            elif response.status_code == 503:
+                outcome = 'rejected'
+            else:
+                outcome = f'http_{response.status_code}'
+        except requests.exceptions.Timeout:
+            outcome = 'timeout'
+        except requests.exceptions.RequestException:
+            outcome = 'error'
+        
+        finished = time.perf_counter()
+        with self._lock:
+            self.records.append((scheduled - t0, finished - scheduled, outcome))
+    
+    def run_load_test(self, workload, concurrency=8, rate=None, duration=30,
+                      max_requests=None, unique=False):
+        """
+        Drive the API and return a summary dict.
+        
+        Without rate, `concurrency` clients send back to back (closed loop).
+        With rate, requests are started at that many per second on a schedule
+        (open loop) by up to `concurrency` threads; if the server falls behind,
+        the queueing delay is included in the latency.
+        """
+        self.records = []
+        postings = itertools.cycle(workload)
+        counter = itertools.count()
+        next_lock = threading.Lock()
+        
+        def next_posting():
+            with next_lock:
+                n = next(counter)
+                if max_requests is not None and n >= max_requests:
+                    return None
+                text = next(postings)
+            # A unique suffix keeps the server's prediction cache out of the measurement
+            return f"{text} #{n}" if unique else text
+        
+        t0 = time.perf_counter()
+        deadline = t0 + duration
+        
+        if rate is None:
+            def client():
+                while time.perf_counter() < deadline:
+                    text = next_posting()
+                    if text is None:
+                        break
+                    self._send(text, time.perf_counter(), t0)
+            
+            threads = [threading.Thread(target=client) for _ in range(concurrency)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                for i in itertools.count():
+                    scheduled = t0 + i / rate
+                    if scheduled >= deadline:
+                        break
+                    text = next_posting()
+                    if text is None:
+                        break
+                    delay = scheduled - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    executor.submit(self._send, text, scheduled, t0)
+        
+        return self.summarize(time.perf_counter() - t0)
+    
+    def summarize(self, elapsed):
+        """Overall throughput, latency percentiles and outcome counts."""
+        latencies = sorted(latency for _, latency, outcome in self.records if outcome == 'ok')
+        outcomes = {}
+        for _, _, outcome in self.records:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        
+        total = len(self.records)
+        return {
+            'requests': total,
+            'elapsed_s': elapsed,
+            'throughput_rps': outcomes.get('ok', 0) / elapsed if elapsed else 0.0,
+            'error_rate': (total - outcomes.get('ok', 0)) / total if total else 0.0,
+            'timeouts': outcomes.get('timeout', 0),
+            'outcomes': outcomes,
+            'latency_ms': {
+                label: _percentile(latencies, fraction) * 1000
+                for label, fraction in (('p50', 0.5), ('p90', 0.9), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+            },
+        }
+    
+    def timeline(self, interval=1.0):
+        """Per-interval rows of (start s, ok, errors, timeouts, ok/s, p50 ms, p99 ms)."""
+        buckets = {}
+        for start, latency, outcome in self.records:
+            buckets.setdefault(int(start // interval), []).append((latency, outcome))
+        
+        rows = []
+        for index in sorted(buckets):
+            entries = buckets[index]
+            ok = sorted(latency for latency, outcome in entries if outcome == 'ok')
+            timeouts = sum(1 for _, outcome in entries if outcome == 'timeout')
+            rows.append((index * interval, len(ok), len(entries) - len(ok) - timeouts, timeouts,
+                         len(ok) / interval, _percentile(ok, 0.5) * 1000, _percentile(ok, 0.99) * 1000))
+        return rows
+    
+    def print_report(self, summary, interval=1.0):
+        print("\n" + "="*70)
+        print(f"{'Time (s)':>9}{'OK':>8}{'Errors':>8}{'Timeouts':>10}{'OK/s':>10}{'p50 ms':>11}{'p99 ms':>11}")
+        print("="*70)
+        for start, ok, errors, timeouts, rps, p50, p99 in self.timeline(interval):
+            print(f"{start:>9.1f}{ok:>8}{errors:>8}{timeouts:>10}{rps:>10.1f}{p50:>11.1f}{p99:>11.1f}")
+        print("="*70)
+        
+        latency = summary['latency_ms']
+        print(f"Requests: {summary['requests']} in {summary['elapsed_s']:.1f}s  "
+              f"throughput: {summary['throughput_rps']:.1f} req/s")
+        print(f"Latency (ms): p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  "
+              f"p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}  max {latency['max']:.1f}")
+        print(f"Error rate: {summary['error_rate']*100:.2f}%  timeouts: {summary['timeouts']}  "
+              f"outcomes: {summary['outcomes']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='JobVision integration tests and load generator.')
+    parser.add_argument('--url', default='http://localhost:5000/api/predict')
+    parser.add_argument('--load', action='store_true', help='run a load test instead of the functional tests')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads / connections')
+    parser.add_argument('--rate', type=float, help='target requests per second (open loop)')
+    parser.add_argument('--duration', type=float, default=30, help='seconds to run')
+    parser.add_argument('--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--timeout', type=float, default=10, help='per-request timeout in seconds')
+    parser.add_argument('--workload', help='CSV, JSON-lines or text file of postings to replay')
+    parser.add_argument('--unique', action='store_true', help='make every posting unique to bypass the cache')
+    parser.add_argument('--interval', type=float, default=1.0, help='seconds per timeline row')
+    parser.add_argument('--start-server', choices=['flask', 'async'],
+                        help='start a local server on a free port and test against it')
+    parser.add_argument('--output', help='write the summary and timeline as JSON')
+    args = parser.parse_args()
+    
+    if not args.load:
+        tester = JobVisionTester(args.url)
+        tester.run_all_tests()
+        return
+    
+    server = None
+    if args.start_server:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from backend.bench_servers import free_port, start_server
+        
+        port = free_port()
+        print(f"Starting local {args.start_server} server on port {port}...")
+        server = start_server(args.start_server, port)
+        args.url = f'http://127.0.0.1:{port}/api/predict'
+    
+    try:
+        tester = LoadTester(args.url, timeout=args.timeout)
+        workload = load_workload(args.workload)
+        mode = f"{args.rate:g} req/s" if args.rate else "closed loop"
+        print(f"Load test: {len(workload)} postings, {args.concurrency} connections, {mode}, "
+              f"{args.duration:g}s against {args.url}")
+        
+        summary = tester.run_load_test(workload, args.concurrency, args.rate, args.duration,
+                                       args.requests, args.unique)
+        tester.print_report(summary, args.interval)
+        
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'summary': summary, 'timeline': tester.timeline(args.interval)}, f, indent=2)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
 if __name__ == '__main__':
-    tester = JobVisionTester()
-    tester.run_all_tests()
+    main()
@@ -106,5 +106,259 @@ def test_predictions():
     print("\n" + "="*60)
     print("Test completed!")
 
+def test_batch_predictions():
+    """Batch predictions should match one-at-a-time predictions."""
+    
+    print("Initializing predictor...")
+    predictor = JobPredictor()
+    # Parity checks only mean something on the ML path, not the rule-based fallback
+    assert predictor.model_available
+    
+    jobs = [
+        'Senior Software Engineer with 5+ years of experience. Salary range and benefits.',
+        '',
+        'Work from home, no experience required! Get paid today, upfront fee of $99.',
+    ]
+    
+    results = predictor.predict_batch(jobs)
+    assert len(results) == len(jobs)
+    
+    for job, (prediction, confidence, indicators) in zip(jobs, results):
+        expected = predictor.predict(job)
+        assert prediction == expected[0]
+        assert abs(confidence - expected[1]) < 1e-9
+        assert indicators == expected[2]
+        print(f"{prediction.upper():<5} {confidence*100:5.1f}%  {job[:50]!r}")
+    
+    print("Batch test completed!")
+
+def test_micro_batching():
+    """Coalesced concurrent predictions should match direct ones, with errors isolated."""
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.micro_batcher import MicroBatcher
+    
+    predictor = JobPredictor()
+    
+    def predict_batch(texts):
+        if 'BAD' in texts:
+            raise ValueError('bad posting')
+        return predictor.predict_batch(texts)
+    
+    batcher = MicroBatcher(predict_batch, window_ms=20, max_batch_size=8)
+    jobs = [f'Software engineer, {n} years of experience. Salary range and benefits.'
+            for n in range(15)] + ['BAD', 'Easy money, no experience required!']
+    
+    def submit(job):
+        try:
+            return batcher.predict(job, timeout=10)
+        except ValueError as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        results = list(pool.map(submit, jobs))
+    
+    for job, result in zip(jobs, results):
+        if job == 'BAD':
+            assert isinstance(result, ValueError)
+        else:
+            assert result == predictor.predict(job)
+    
+    stats = batcher.stats()
+    print(f"{stats['requests']} requests in {stats['batches']} batches, "
+          f"{stats['errors']} error(s)")
+    assert stats['requests'] == len(jobs)
+    assert stats['batches'] < len(jobs)
+    assert stats['largest_batch'] <= 8
+    assert stats['errors'] == 1
+    
+    print("Micro-batching test completed!")
+
+def test_stage_metrics():
+    """Predictions should feed the stage histograms, and nothing while disabled."""
+    from ml_model.metrics import metrics
+    
+    predictor = JobPredictor()
+    metrics.reset()
+    
+    predictor.predict('Easy money, no experience required! Salary range on request.')
+    text = metrics.render_prometheus()
+    assert 'jobvision_stage_seconds_count{stage="extract_indicators"} 1' in text
+    assert 'jobvision_stage_seconds_bucket{stage="predict",le="+Inf"} 1' in text
+    assert 'jobvision_predictions_total{path=' in text
+    
+    metrics.set_enabled(False)
+    try:
+        predictor.predict('Easy money, no experience required!')
+    finally:
+        metrics.set_enabled(True)
+    assert 'jobvision_stage_seconds_count{stage="extract_indicators"} 1' in metrics.render_prometheus()
+    
+    print("Metrics test completed!")
+
+def test_online_update(tmp_path):
+    """Feedback should move the model towards its labels, checked on rows it was not trained on."""
+    from conftest import DATA_FILE, train_fixture_model
+    from ml_model.online import (FeedbackLog, OnlineUpdater, in_holdout, load_holdout, load_model,
+                                 partial_fit_linear)
+    
+    model_path = os.path.join(str(tmp_path), 'model')
+    trainer = train_fixture_model(model_path)
+    predictor = JobPredictor(model_path)
+    assert predictor.model_available
+    
+    model, vectorizer = load_model(model_path)
+    text = 'Telegram interview, salary paid in bitcoin to your crypto wallet.'
+    X = vectorizer.transform([predictor.preprocess_text(text)] * 8)
+    
+    updated = partial_fit_linear(model, X, [1] * 8)
+    assert updated.predict_proba(X[:1])[0, 1] > model.predict_proba(X[:1])[0, 1]
+    assert updated.coef_.shape == model.coef_.shape
+    
+    # The reference check uses exactly the test split of train()
+    holdout = load_holdout(model_path)
+    test_rows = sorted(trainer.split[1].index)
+    assert holdout == {'rows': test_rows}
+    updater = OnlineUpdater(str(tmp_path), os.path.join(str(tmp_path), 'feedback.jsonl'), DATA_FILE)
+    X_reference, y_reference = updater._reference_data(vectorizer, holdout)
+    assert X_reference.shape[0] == len(test_rows)
+    assert list(y_reference) == list(trainer.split[3].sort_index())
+    
+    log = FeedbackLog(os.path.join(str(tmp_path), 'feedback.jsonl'))
+    log.append(text, 'fake', predicted='real')
+    log.append('Registered nurse, hospital, full benefits.', 0)
+    records, offset = log.read()
+    assert [r['label'] for r in records] == [1, 0]
+    assert log.read(offset) == ([], offset)
+    
+    # Holdout records are copied to the holdout log once, pending counts training records only
+    feedback_path = os.path.join(str(tmp_path), 'pending.jsonl')
+    updater = OnlineUpdater(str(tmp_path), feedback_path, min_records=100, holdout_fraction=0.5)
+    texts = [f'Posting number {i}, office work.' for i in range(20)]
+    for i, job in enumerate(texts):
+        updater.feedback.append(job, i % 2)
+    held_out = [job for job in texts if in_holdout(job, 0.5)]
+    assert 0 < len(held_out) < len(texts)
+    
+    for _ in range(2):
+        result = updater.run_once()
+        assert result == {'status': 'skipped', 'pending': len(texts) - len(held_out)}
+        assert updater.status()['pending_records'] == result['pending']
+        assert [r['job_description'] for r in updater.holdout_log.read()[0]] == held_out
+    
+    X_holdout, y_holdout = updater._feedback_holdout(vectorizer, 'nltk')
+    assert X_holdout.shape[0] == len(y_holdout) == len(held_out)
+    extra = next(job for job in (f'Extra posting {i}.' for i in range(100)) if in_holdout(job, 0.5))
+    updater.feedback.append(extra, 1)
+    updater.run_once()
+    X_holdout, y_holdout = updater._feedback_holdout(vectorizer, 'nltk')
+    assert X_holdout.shape[0] == len(held_out) + 1 and y_holdout[-1] == 1
+    
+    print("Online update test completed!")
+
+def test_explanations(model_dir):
+    """Contributions plus intercept must be the decision value, for both scorers."""
+    jobs = [
+        'Senior Software Engineer with 5+ years of experience. Salary range and benefits.',
+        None,
+        'Work from home, no experience required! Get paid today, upfront fee of $99.',
+    ]
+    
+    for scorer in ('fused', 'sklearn'):
+        predictor = JobPredictor(model_dir, scorer=scorer)
+        assert predictor.model_available
+        assert (predictor.scorer is not None) == (scorer == 'fused')
+        
+        explained = predictor.explain_batch(jobs, top_k=3)
+        for job, expected, (result, explanation) in zip(jobs, predictor.predict_batch(jobs), explained):
+            assert result[0] == expected[0]
+            assert abs(result[1] - expected[1]) < 1e-9
+            if job is None:
+                assert explanation is None
+                continue
+            
+            assert len(explanation['positive']) <= 3 and len(explanation['negative']) <= 3
+            assert all(term['contribution'] > 0 for term in explanation['positive'])
+            assert all(term['contribution'] < 0 for term in explanation['negative'])
+            print(f"{scorer:<8}{result[0].upper():<5} +{[t['term'] for t in explanation['positive']]} "
+                  f"-{[t['term'] for t in explanation['negative']]}")
+        
+        # With every term listed, the contributions add up to the decision value
+        for job, (_, explanation) in zip(jobs, predictor.explain_batch(jobs, top_k=10000)):
+            if job is None:
+                continue
+            processed = predictor.preprocess_text(job)
+            if scorer == 'fused':
+                expected = predictor.scorer.decision_function(processed)
+            else:
+                expected = predictor.model.decision_function(predictor.vectorizer.transform([processed]))[0]
+            terms = explanation['positive'] + explanation['negative']
+            assert terms
+            score = explanation['intercept'] + sum(term['contribution'] for term in terms)
+            assert abs(score - expected) < 1e-9
+    
+    print("Explanation test completed!")
+
+def test_recorded_tokenizer(model_dir, tmp_path):
+    """Predictors preprocess with the tokenizer mode recorded in artifact.json by default."""
+    import json
+    import shutil
+    from ml_model.artifacts import MANIFEST_FILE
+    
+    with open(os.path.join(model_dir, MANIFEST_FILE)) as f:
+        assert json.load(f)['tokenizer'] == 'nltk'
+    assert JobPredictor(model_dir).tokenizer == 'nltk'
+    
+    model_path = os.path.join(str(tmp_path), 'fast-model')
+    shutil.copytree(model_dir, model_path)
+    with open(os.path.join(model_path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    manifest['tokenizer'] = 'fast'
+    with open(os.path.join(model_path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+    
+    assert JobPredictor(model_path).tokenizer == 'fast'
+    # An explicit mode still wins, with a warning
+    assert JobPredictor(model_path, tokenizer='nltk').tokenizer == 'nltk'
+    
+    print("Recorded tokenizer test completed!")
+
+def test_flat_model_reload(model_dir, tmp_path):
+    """A flat models/ directory rewritten within the same second is still reloaded."""
+    import shutil
+    from backend.model_manager import ModelManager
+    from ml_model.versions import resolve_model
+    
+    model_path = os.path.join(str(tmp_path), 'flat')
+    shutil.copytree(model_dir, model_path)
+    manager = ModelManager(model_path)
+    assert manager.active.version.startswith('unversioned-')
+    assert not manager.reload()
+    
+    # Same whole-second mtime, rewritten with other contents
+    manifest = os.path.join(model_path, 'artifact.json')
+    stat = os.stat(manifest)
+    with open(manifest, 'a') as f:
+        f.write('\n')
+    os.utime(manifest, ns=(stat.st_atime_ns, stat.st_mtime_ns // 10 ** 9 * 10 ** 9))
+    assert resolve_model(model_path)[0] != manager.active.version
+    assert manager.reload()
+    
+    print("Flat model reload test completed!")
+
 if __name__ == '__main__':
+    import tempfile
+    
     test_predictions()
+    test_batch_predictions()
+    test_micro_batching()
+    test_stage_metrics()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_online_update(tmp)
+    with tempfile.TemporaryDirectory() as tmp:
+        from conftest import train_fixture_model
+        train_fixture_model(tmp)
+        test_explanations(tmp)
+        with tempfile.TemporaryDirectory() as other:
+            test_recorded_tokenizer(tmp, other)
+        with tempfile.TemporaryDirectory() as other:
+            test_flat_model_reload(tmp, other)
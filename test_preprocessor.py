@@ -0,0 +1,111 @@
+"""
+Checks for the training-time text preprocessing.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(__file__))
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ml_model import preprocess_cache
+from ml_model.preprocess_cache import PreprocessCache
+from ml_model.trainer import DataPreprocessor
+from ml_model.tokenizers import TREEBANK_SPLITS, fast_word_tokenize
+from nltk.tokenize import word_tokenize
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'fake_job_postings.csv')
+TEXT_COLUMNS = ['title', 'description', 'requirements']
+
+def test_vectorized_cleaning_parity():
+    """The column-wise path must match the per-row path exactly."""
+
+    preprocessor = DataPreprocessor()
+    df = pd.read_csv(DATA_FILE)
+
+    # Edge cases the dataset does not cover
+    extra = pd.DataFrame({
+        'title': [np.nan, '', 'URL http://x.io/a?b=1 and www.site.com'],
+        'description': ['Mail me: jobs@corp.com!!', '   \t\n  ', 'Tabs\tand\nnewlines  $5,000'],
+        'requirements': ['MiXeD CaSe 123 ünïcode', np.nan, 'https://a.b c@d e'],
+        'fraudulent': [0, 1, 0],
+    })
+    df = pd.concat([df, extra], ignore_index=True)
+
+    vectorized = preprocessor.preprocess_dataframe(df, TEXT_COLUMNS)
+
+    for col in TEXT_COLUMNS:
+        expected = df[col].fillna('').apply(preprocessor.preprocess)
+        assert vectorized[col].tolist() == expected.tolist(), col
+
+        cleaned = preprocessor.clean_series(df[col])
+        assert cleaned.tolist() == df[col].fillna('').apply(preprocessor.clean_text).tolist(), col
+
+    print(f"Parity check passed on {len(df)} rows")
+
+def test_preprocess_dataframe_inplace():
+    """inplace=True must update the caller's DataFrame without copying."""
+
+    preprocessor = DataPreprocessor()
+    df = pd.read_csv(DATA_FILE)
+    original = df.copy()
+
+    copied = preprocessor.preprocess_dataframe(df, TEXT_COLUMNS)
+    assert copied is not df
+    assert df.equals(original)
+
+    result = preprocessor.preprocess_dataframe(df, TEXT_COLUMNS, inplace=True)
+    assert result is df
+    assert df[TEXT_COLUMNS].equals(copied[TEXT_COLUMNS])
+
+    print("In-place check passed")
+
+def test_fast_tokenizer_equivalence():
+    """The fast tokenizer must match word_tokenize on cleaned text."""
+
+    preprocessor = DataPreprocessor()
+    fast_preprocessor = DataPreprocessor(tokenizer='fast')
+    df = pd.read_csv(DATA_FILE)
+
+    texts = [text for col in TEXT_COLUMNS for text in df[col].fillna('')]
+    texts.append(' '.join(TREEBANK_SPLITS) + ' wanna cannotx gonnas')
+
+    for text in texts:
+        cleaned = preprocessor.clean_text(text)
+        assert fast_word_tokenize(cleaned) == word_tokenize(cleaned), cleaned
+        assert fast_preprocessor.preprocess(text) == preprocessor.preprocess(text), text
+
+    print(f"Tokenizer equivalence passed on {len(texts)} texts")
+
+def test_preprocess_cache_pruning():
+    """The cache drops entries unused for max_age_days and keeps at most max_entries."""
+
+    def upper(texts):
+        return [text.upper() for text in texts]
+
+    day = preprocess_cache.today()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = PreprocessCache(cache_dir, 'test', max_entries=2, max_age_days=30)
+        cache.preprocess_columns(pd.DataFrame({'text': ['a', 'b', 'c', 'd']}), ['text'], upper)
+        cache.last_used.update({key: day - 31 for key in list(cache.last_used)[:1]})
+        cache.last_used.update({key: day - 5 for key in list(cache.last_used)[1:2]})
+        cache.save()
+
+        # 'a' is too old, then 'b' is the least recently used of the other three
+        reloaded = PreprocessCache(cache_dir, 'test', max_entries=2, max_age_days=30)
+        assert sorted(reloaded.entries.values()) == ['C', 'D']
+        assert set(reloaded.last_used.values()) == {day}
+
+        df = reloaded.preprocess_columns(pd.DataFrame({'text': ['d', 'e']}), ['text'], upper)
+        assert df['text'].tolist() == ['D', 'E']
+
+    print("Preprocess cache pruning passed")
+
+if __name__ == '__main__':
+    test_vectorized_cleaning_parity()
+    test_preprocess_dataframe_inplace()
+    test_fast_tokenizer_equivalence()
+    test_preprocess_cache_pruning()
@@ -3,35 +3,140 @@ Training script to train the fake job detection model.
 Run this after generating or preparing your dataset.
 """
 
+import argparse
+import json
 import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 import pandas as pd
+from ml_model.model_selection import print_results
 from ml_model.trainer import ModelTrainer
+from ml_model.versions import CURRENT_FILE
+
+def print_compression_report(report):
+    """Print ModelTrainer.compress results side by side."""
+    rows = [
+        ('Terms', 'terms', '{:,.0f}'),
+        ('Artifact size (KiB)', 'artifact_bytes', lambda v: f'{v / 1024:,.1f}'),
+        ('Pickle size (KiB)', 'pickle_bytes', lambda v: f'{v / 1024:,.1f}'),
+        ('Load time (ms)', 'load_seconds', lambda v: f'{v * 1000:.2f}'),
+        ('Latency (µs/posting)', 'latency_us', '{:.1f}'),
+        ('Held-out accuracy', 'accuracy', '{:.4f}'),
+        ('Held-out F1', 'f1', '{:.4f}'),
+    ]
+    print("\n" + "="*62)
+    print("MODEL COMPRESSION")
+    print("="*62)
+    print(f"{'':<22} {'original':>12} {'compressed':>12} {'change':>12}")
+    for label, key, fmt in rows:
+        fmt = fmt.format if isinstance(fmt, str) else fmt
+        before, after = report[key]['original'], report[key]['compressed']
+        if key in ('accuracy', 'f1'):
+            change = f'{after - before:+.4f}'
+        else:
+            change = f'{(after - before) / before * 100:+.1f}%' if before else 'n/a'
+        print(f"{label:<22} {fmt(before):>12} {fmt(after):>12} {change:>12}")
+    print("="*62)
 
 def main():
-    # Load data
-    print("Loading dataset...")
-    try:
-        df = pd.read_csv('data/fake_job_postings.csv')
-    except FileNotFoundError:
+    parser = argparse.ArgumentParser(description='Train the fake job detection model.')
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help='worker processes for text preprocessing (-1 = all cores)')
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'],
+                        help='tokenizer mode; recorded in artifact.json so the API serves with the same '
+                             'mode (--streaming models have no artifact: pass it when serving)')
+    parser.add_argument('--streaming', action='store_true',
+                        help='train out of core: read the CSV in chunks with a hashing vectorizer')
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='rows per chunk in streaming mode')
+    parser.add_argument('--epochs', type=int, default=5,
+                        help='passes over the training rows in streaming mode')
+    parser.add_argument('--grid-search', action='store_true',
+                        help='pick vectorizer/classifier settings by k-fold cross-validation '
+                             '(--n-jobs also sets the worker processes of the search)')
+    parser.add_argument('--folds', type=int, default=5,
+                        help='cross-validation folds for --grid-search')
+    parser.add_argument('--grid', help='JSON file with "vectorizer" and "classifier" parameter '
+                                       'grids for --grid-search (default: ml_model.model_selection)')
+    parser.add_argument('--compress', action='store_true',
+                        help='shrink the trained model (see --prune, --weights-dtype) and report '
+                             'size, load time, latency and held-out accuracy before and after')
+    parser.add_argument('--prune', choices=['threshold', 'l1'],
+                        help='with --compress: drop terms with |idf * coef| below --prune-threshold, '
+                             'or keep the terms an L1 model selects')
+    parser.add_argument('--prune-threshold', type=float, default=0.01)
+    parser.add_argument('--l1-c', type=float, default=1.0,
+                        help='inverse L1 strength for --prune l1 (smaller keeps fewer terms)')
+    parser.add_argument('--weights-dtype', default='float32', choices=['float64', 'float32', 'int8'],
+                        help='with --compress: storage type of the exported weights')
+    parser.add_argument('--no-preprocess-cache', action='store_true',
+                        help='do not reuse preprocessed text cached in data/preprocess_cache/')
+    parser.add_argument('--publish', action='store_true',
+                        help='save as a new version in models/versions/ and make it active; '
+                             'a running API picks it up without a restart')
+    args = parser.parse_args()
+    if args.compress and (args.streaming or args.grid_search):
+        parser.error('--compress needs the held-out split of the default training mode')
+    
+    data_file = 'data/fake_job_postings.csv'
+    if not os.path.exists(data_file):
         print("Dataset not found. Please run: python data/generate_sample_data.py")
         return
     
-    print(f"Dataset loaded: {len(df)} samples")
-    print(f"Fraud rate: {df['fraudulent'].sum() / len(df) * 100:.1f}%")
-    
     # Initialize trainer
-    trainer = ModelTrainer()
+    cache_dir = None if args.no_preprocess_cache else 'data/preprocess_cache'
+    trainer = ModelTrainer(tokenizer=args.tokenizer, n_jobs=args.n_jobs, cache_dir=cache_dir)
     
-    # Train model
-    print("\nTraining model...")
-    metrics = trainer.train(
-        df, 
-        label_column='fraudulent',
-        text_columns=['title', 'description', 'requirements']
-    )
+    if args.streaming:
+        # Train model chunk by chunk without loading the whole CSV
+        print(f"\nTraining model (streaming, {args.chunk_size} rows per chunk)...")
+        metrics = trainer.train_streaming(
+            data_file,
+            label_column='fraudulent',
+            text_columns=['title', 'description', 'requirements'],
+            chunk_size=args.chunk_size,
+            epochs=args.epochs
+        )
+    else:
+        # Load data
+        print("Loading dataset...")
+        df = pd.read_csv(data_file)
+        
+        print(f"Dataset loaded: {len(df)} samples")
+        print(f"Fraud rate: {df['fraudulent'].sum() / len(df) * 100:.1f}%")
+        
+        if args.grid_search:
+            vectorizer_grid = classifier_grid = None
+            if args.grid:
+                with open(args.grid) as f:
+                    grid = json.load(f)
+                vectorizer_grid = grid.get('vectorizer')
+                classifier_grid = grid.get('classifier')
+                # JSON has no tuples
+                if vectorizer_grid and 'ngram_range' in vectorizer_grid:
+                    vectorizer_grid['ngram_range'] = [tuple(r) for r in vectorizer_grid['ngram_range']]
+            
+            print(f"\nSelecting model settings ({args.folds}-fold cross-validation)...")
+            results = trainer.grid_search(
+                df,
+                label_column='fraudulent',
+                text_columns=['title', 'description', 'requirements'],
+                vectorizer_grid=vectorizer_grid,
+                classifier_grid=classifier_grid,
+                n_folds=args.folds
+            )
+            print_results(results)
+            metrics = results[0]['metrics']
+            print("\nBest settings refitted on all rows; metrics below are cross-validated.")
+        else:
+            # Train model
+            print("\nTraining model...")
+            metrics = trainer.train(
+                df, 
+                label_column='fraudulent',
+                text_columns=['title', 'description', 'requirements']
+            )
     
     # Print metrics
     print("\n" + "="*50)
@@ -48,9 +153,20 @@ def main():
     print(f"True Positives:  {metrics['confusion_matrix'][1][1]}")
     print("="*50)
     
+    if args.compress:
+        print("\nCompressing model...")
+        print_compression_report(trainer.compress(args.prune, args.prune_threshold, args.l1_c,
+                                                  args.weights_dtype))
+    
     # Save model
     print("\nSaving model...")
-    trainer.save_model('models/')
+    if args.publish:
+        trainer.publish_model('models/')
+    else:
+        trainer.save_model('models/')
+        if os.path.exists(os.path.join('models', CURRENT_FILE)):
+            print("⚠️  models/ has published versions; the API keeps serving the active "
+                  "version. Use --publish to deploy this model.")
     print("Model saved successfully!")
     print("\nYou can now run the Flask app: python backend/app.py")
 